@@ -1,4 +1,5 @@
 import os
+import sys
 from dataclasses import dataclass, field
 from collections import deque
 import threading
@@ -17,6 +18,16 @@ load_dotenv()
 PLANT_NAME = os.getenv("PLANT_NAME", "상추")
 MODEL_NAME = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 
+# =========================
+# 센서 임계값 엔진 (GUI/웹 서버와 같은 규칙 파일 공유)
+# =========================
+GUI_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "GUI_AnyGrow2_Python"))
+sys.path.insert(0, GUI_DIR)
+from core.alarm import AlarmEngine, load_threshold_rules, LEVEL_NORMAL, LEVEL_RANK
+
+_alarm_engine = AlarmEngine(load_threshold_rules())
+_alarm_states = {}  # 채널별 마지막 상태 이벤트 (상태가 바뀔 때만 갱신)
+
 # =========================
 # STT (Push-to-talk) 연결
 # =========================
@@ -93,17 +104,15 @@ class ConversationState:
 # 센서 → 상태 판단 (GPT 금지 영역)
 # =========================
 def analyze(state: SensorState) -> FarmStatus:
-    reasons: list[str] = []
-    level = "NORMAL"
-
-    # 예시 기준 (원하면 GUI 설정값으로 바꿔도 됨)
-    if state.co2 > 2500:
-        level = "CRITICAL"
-        reasons.append(f"CO₂ 높음 ({state.co2:.0f} ppm)")
-
-    if state.temp > 30 and level != "CRITICAL":
-        level = "WARNING"
-        reasons.append(f"온도 높음 ({state.temp:.1f} ℃)")
+    # 판단 기준은 공유 임계값 엔진이 담당하며, 상태가 바뀐 채널만 이벤트로 돌려줍니다.
+    reading = {"temp": state.temp, "hum": state.humidity, "co2": state.co2}
+    for event in _alarm_engine.evaluate(reading):
+        _alarm_states[event.channel] = event
+
+    level = _alarm_engine.worst_level()
+    abnormal = [e for e in _alarm_states.values() if e.level != LEVEL_NORMAL]
+    abnormal.sort(key=lambda e: LEVEL_RANK[e.level], reverse=True)
+    reasons: list[str] = [e.describe() for e in abnormal]
 
     if level == "CRITICAL":
         action = "즉시 환기하고 팬을 가동하세요"
@@ -1,47 +1,112 @@
 # app.py
+from core.startup import StartupTimeline  # 시작 시간 기준점이므로 가장 먼저 불러옵니다.
+import os
 import sys
 from datetime import datetime
-from PyQt5 import QtWidgets, QtCore 
+from PyQt5 import QtWidgets, QtCore
 from ui.main_window import AnyGrowMainWindow
 from core.app_state import AppState
 from core.main_controller import MainController
 from drivers.hardware import HardwareManager
+from drivers.broker_hardware import BrokerHardwareManager
+from core.broker_protocol import parse_address
 from core.scheduler import Scheduler
+from core.history import SensorHistory
+from core.automation import AutomationEngine, load_automation_rules
+from core.photoperiod import PhotoperiodRunner
+from core.watchdog import StallWatchdog
+from core.constants import STARTUP_REPORT_TIMEOUT
+
+# 센서 응답이 없을 때도 BMS 시간 동기화를 보내는 대기 시간 (하드웨어 스레드 시작 기준, ms)
+BMS_SYNC_FALLBACK_MS = 5000
 
 def main():
     print("--- app.py main called ---")
+    timeline = StartupTimeline()
+    timeline.mark("모듈 로딩 완료")
+
+    # 기본은 빠른 시작 모드입니다. --eager 를 주면 모든 위젯을 시작할 때 만듭니다.
+    lazy = "--eager" not in sys.argv
     app = QtWidgets.QApplication(sys.argv)
-    
+    timeline.mark("QApplication 생성")
+
     app_state = AppState()
-    
+
     # HardwareManager와 QThread 생성 및 연결
     hw_thread = QtCore.QThread()
-    hardware_manager = HardwareManager()
+    # 센서 반응형 자동화 규칙은 하드웨어 스레드에서 직접 평가됩니다.
+    # --broker (또는 ANYGROW_BROKER) 를 주면 포트를 직접 열지 않고 로컬 브로커(broker.py)를 통해
+    # 웹 서버 등과 포트를 함께 사용합니다.
+    automation = AutomationEngine(load_automation_rules())
+    if "--broker" in sys.argv or os.getenv("ANYGROW_BROKER"):
+        hardware_manager = BrokerHardwareManager(parse_address(os.getenv("ANYGROW_BROKER")), automation=automation)
+    else:
+        hardware_manager = HardwareManager(automation=automation)
     hardware_manager.moveToThread(hw_thread)
 
-    # Scheduler 생성
-    scheduler = Scheduler()
-    
+    # GUI 스레드와 하드웨어 스레드의 이벤트 루프 정지 감시
+    watchdog = StallWatchdog()
+    watchdog.watch_current_thread("GUI")
+    watchdog.watch_qthread("HARDWARE", hw_thread)
+    watchdog.add_histogram("automation_latency_ms", "Sensor reading to automation command write latency.",
+                           hardware_manager.automation_latency_stats)
+    watchdog.start()
+
+    # Scheduler 생성 (빠른 시작 모드에서는 예약 파일을 백그라운드에서 읽음)
+    scheduler = Scheduler(load_async=lazy)
+    scheduler.schedules_loaded.connect(lambda _s: timeline.mark("예약 로딩 완료"))
+    if scheduler.is_loaded():
+        timeline.mark("예약 로딩 완료")
+
+    # 센서 이력 저장소 생성
+    history = SensorHistory()
+
+    # 광주기(일출/일몰) LED 램프 실행기 생성 (photoperiod.json이 없으면 동작하지 않음)
+    photoperiod = PhotoperiodRunner()
+
     # MainController에 hardware_manager, hw_thread, scheduler 등을 함께 전달
-    main_controller = MainController(hardware_manager, hw_thread, app_state, scheduler)
-    
-    # HardwareManager 스레드 시작
-    hw_thread.start()
-    
-    win = AnyGrowMainWindow(app_state, main_controller, hardware_manager, scheduler)
-    win.show()
-    
-    # 애플리케이션 시작 시 BMS 시간 자동 동기화 (2초 지연)
+    main_controller = MainController(hardware_manager, hw_thread, app_state, scheduler, history, photoperiod)
+    timeline.mark("코어 객체 생성")
+
+    win = AnyGrowMainWindow(app_state, main_controller, hardware_manager, scheduler, lazy=lazy)
+    win.set_watchdog(watchdog)
+    timeline.mark("메인 윈도우 생성")
+
+    # 애플리케이션 시작 시 BMS 시간 자동 동기화.
+    # 고정 지연 대신 장치가 응답하는 것(첫 센서 수신)을 확인한 직후 보냅니다.
     def initial_bms_sync():
+        if timeline.has("BMS 시간 동기화"):
+            return
+        timeline.mark("BMS 시간 동기화")
         print("[App Startup] Performing initial BMS time synchronization.")
         now = datetime.now()
         win.sync_bms_time(now)
-        
-    QtCore.QTimer.singleShot(2000, initial_bms_sync)
+
+    def on_first_reading(_data):
+        if timeline.has("첫 센서 수신"):
+            return
+        timeline.mark("첫 센서 수신")
+        initial_bms_sync()
+        timeline.report("첫 센서 수신")
+
+    # 하드웨어 스레드는 첫 화면을 그린 뒤에 시작하여 창 표시를 늦추지 않습니다.
+    def on_first_frame():
+        timeline.mark("첫 화면 표시")
+        hw_thread.start()
+        timeline.mark("하드웨어 스레드 시작")
+        QtCore.QTimer.singleShot(BMS_SYNC_FALLBACK_MS, initial_bms_sync)
+        QtCore.QTimer.singleShot(int(STARTUP_REPORT_TIMEOUT * 1000), lambda: timeline.report("첫 센서 수신 없음"))
+
+    app_state.data_updated.connect(on_first_reading)
+    win.first_frame_shown.connect(on_first_frame)
+    win.show()
 
     # 애플리케이션 종료 시 스레드 정리
-    app.aboutToQuit.connect(main_controller.stop_hardware) 
-    
+    app.aboutToQuit.connect(main_controller.stop_hardware)
+    app.aboutToQuit.connect(history.close)
+    app.aboutToQuit.connect(scheduler.close)
+    app.aboutToQuit.connect(watchdog.stop)
+
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
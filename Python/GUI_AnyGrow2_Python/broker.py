@@ -0,0 +1,252 @@
+# broker.py
+# AnyGrow2 로컬 브로커
+# 시리얼 포트는 이 프로세스만 열고, GUI / 웹 서버 / 음성 비서는 로컬 소켓으로 접속해 함께 사용합니다.
+#
+#   python broker.py [--port COM5] [--address unix:/tmp/anygrow2_broker.sock]
+#   python app.py --broker                              (GUI)
+#   ANYGROW_BROKER=1 python app.py                      (웹 서버, Web_AnyGrow2_Python)
+#
+# - 센서 프레임은 브로커에서 한 번만 파싱하고, 토픽 메시지도 한 번만 인코딩해 모든 구독자에게 같은 바이트를 보냅니다.
+# - 구독자는 필요한 토픽(sensor, raw, status, request)만 받습니다. 원시 바이트는 구독자가 있을 때만 만듭니다.
+# - 모든 명령(센서 요청 포함)은 하나의 CommandQueue 를 거쳐 순서와 최소 간격(COMMAND_INTERVAL)을 지키며 전송됩니다.
+# - 메시지 형식(길이 머리말 + 토픽 + JSON)은 core/broker_protocol.py 를 참고하세요.
+
+import argparse
+import asyncio
+import os
+import socket
+
+from core.broker_protocol import (
+    KIND_PUBLISH, KIND_SUBSCRIBE, KIND_COMMAND, KIND_ACK,
+    TOPIC_SENSOR, TOPIC_RAW, TOPIC_STATUS, TOPIC_REQUEST, ALL_TOPICS,
+    MessageReader, encode, matches, parse_address,
+)
+from core.command_queue import STATUS_FAILED, STATUS_SENT
+from core.constants import (
+    BROKER_CLIENT_BUFFER_LIMIT, BROKER_POLL_INTERVAL, BROKER_READ_INTERVAL, BROKER_RECONNECT_INTERVAL,
+    PRIORITY_HIGH, PRIORITY_NORMAL,
+)
+from core.device_link import DeviceLink
+from drivers.serial_communicator import SerialCommunicator
+
+SOCKET_MODE = 0o660     # 유닉스 도메인 소켓 권한 (소유자와 같은 그룹의 프로세스만 접속)
+
+
+# ============================================================
+# Subscriber Class
+# ============================================================
+class Subscriber:
+    """브로커에 접속한 클라이언트 하나와 구독 토픽"""
+    def __init__(self, writer):
+        self.writer = writer
+        self.topics = set()
+        self.skipped = 0    # 송신 버퍼가 밀려 건너뛴 메시지 수
+
+    def wants(self, topic: str) -> bool:
+        return matches(topic, self.topics)
+
+    def send(self, data: bytes, droppable=False):
+        """
+        인코딩된 메시지를 보냅니다. droppable 메시지(센서값, 원시 바이트)는 송신 버퍼가
+        BROKER_CLIENT_BUFFER_LIMIT 를 넘은 느린 구독자에게는 건너뜁니다. (다음 값이 곧 옵니다)
+        """
+        transport = self.writer.transport
+        if transport.is_closing():
+            return
+        if droppable and transport.get_write_buffer_size() > BROKER_CLIENT_BUFFER_LIMIT:
+            self.skipped += 1
+            return
+        self.writer.write(data)
+
+
+# ============================================================
+# Broker Class
+# ============================================================
+class Broker:
+    """
+    시리얼 포트 하나를 소유하고 구독자에게 센서값/장치 이벤트를 나눠주는 asyncio 서버.
+    포트가 닫히거나 오류가 나면 BROKER_RECONNECT_INTERVAL 마다 다시 엽니다.
+    센서 요청 주기, 명령 전송, 프레임 파싱은 웹 서버와 같은 core.device_link.DeviceLink 가 담당합니다.
+    """
+    def __init__(self, port="COM5", baud_rate=38400, poll_interval=BROKER_POLL_INTERVAL):
+        self.communicator = SerialCommunicator(port, baud_rate)
+        self.device = DeviceLink(self.communicator.write, poll_interval,
+                                 on_write_error=self._write_failed, log_prefix="[Broker]")
+        self.subscribers = set()
+        self.status = {"open": False, "message": "시리얼 포트 연결 전"}
+        self.last_reading = None
+        self._wakeup = None             # 명령 큐에 새 명령이 들어왔음을 command_loop 에 알림 (serve 에서 생성)
+
+    # --------------------------------------------------------
+    # 구독자에게 발행
+    # --------------------------------------------------------
+    def publish(self, topic: str, body, droppable=False):
+        """토픽을 구독한 클라이언트가 있으면 메시지를 한 번만 인코딩해 모두에게 보냅니다."""
+        targets = [sub for sub in self.subscribers if sub.wants(topic)]
+        if not targets:
+            return
+        data = encode(KIND_PUBLISH, topic, body)
+        for sub in targets:
+            sub.send(data, droppable)
+
+    def _set_status(self, is_open: bool, message: str):
+        print(f"[Broker] {message}")
+        self.status = {"open": is_open, "message": message}
+        self.publish(TOPIC_STATUS, self.status)
+
+    # --------------------------------------------------------
+    # 클라이언트 연결
+    # --------------------------------------------------------
+    async def handle_client(self, reader, writer):
+        sub = Subscriber(writer)
+        self.subscribers.add(sub)
+        print(f"[Broker] Client connected ({len(self.subscribers)})")
+        messages = MessageReader()
+        try:
+            while True:
+                data = await reader.read(4096)
+                if not data:
+                    break
+                for kind, _topic, body in messages.feed(data):
+                    self._handle_message(sub, kind, body if isinstance(body, dict) else {})
+        except (ConnectionError, ValueError) as e:
+            print(f"[Broker] Client error: {e}")
+        finally:
+            self.subscribers.discard(sub)
+            writer.close()
+            print(f"[Broker] Client disconnected ({len(self.subscribers)}, skipped {sub.skipped})")
+
+    def _handle_message(self, sub, kind, body):
+        if kind == KIND_SUBSCRIBE:
+            sub.topics = set(body.get("topics") or [ALL_TOPICS])
+            # 새 구독자에 현재 포트 상태와 마지막 센서값을 바로 전달
+            if sub.wants(TOPIC_STATUS):
+                sub.send(encode(KIND_PUBLISH, TOPIC_STATUS, self.status))
+            if self.last_reading is not None and sub.wants(TOPIC_SENSOR):
+                sub.send(encode(KIND_PUBLISH, TOPIC_SENSOR, self.last_reading))
+        elif kind == KIND_COMMAND:
+            cmd = str(body.get("cmd"))
+            args = body.get("args") if isinstance(body.get("args"), dict) else {}
+            priority = PRIORITY_HIGH if body.get("priority") == PRIORITY_HIGH else PRIORITY_NORMAL
+            # 센서 요청 주기는 브로커가 직접 관리하고, 포트가 닫혀 있으면 큐에 쌓아두지 않고 바로 실패로 알립니다.
+            if cmd == "sensor_req":
+                reject = "sensor_req is sent by the broker and cannot be requested by clients"
+            elif not self.communicator.is_open():
+                reject = "serial port is not open"
+            else:
+                reject = None
+            command = self.device.commands.submit(cmd, args, client=sub, command_id=body.get("id"), priority=priority,
+                                           reject=reject)
+            if command.status == STATUS_FAILED:
+                sub.send(encode(KIND_ACK, "", command.to_ack()))
+            else:
+                self._wakeup.set()
+
+    # --------------------------------------------------------
+    # 장치 루프
+    # --------------------------------------------------------
+    async def serial_loop(self):
+        """포트를 열고(실패하면 재시도) 수신 바이트를 프레임으로 조립해 한 번만 파싱합니다."""
+        while True:
+            if not self.communicator.is_open():
+                success, message = self.communicator.connect()
+                self._set_status(success, message)
+                if not success:
+                    await asyncio.sleep(BROKER_RECONNECT_INTERVAL)
+                    continue
+                self.device.reset()
+            try:
+                data = self.communicator.read()
+            except Exception as e:
+                self._serial_error(f"[오류] 시리얼 읽기 오류: {e}")
+                continue
+            if data:
+                self._handle_bytes(data)
+            await asyncio.sleep(BROKER_READ_INTERVAL)
+
+    def _handle_bytes(self, data: bytes):
+        if any(sub.wants(TOPIC_RAW) for sub in self.subscribers):
+            self.publish(TOPIC_RAW, {"hex": data.hex(",")}, droppable=True)
+
+        for reading in self.device.feed(data):
+            self.last_reading = reading
+            self.publish(TOPIC_SENSOR, reading, droppable=True)
+
+    def _serial_error(self, message: str):
+        try:
+            self.communicator.disconnect()
+        except Exception:
+            self.communicator.ser = None
+        self._set_status(False, message)
+
+    def _write_failed(self, error):
+        # 포트가 닫혀 있어서 실패한 경우는 serial_loop 가 이미 재연결 중이므로 상태를 다시 알리지 않습니다.
+        if self.communicator.is_open():
+            self._serial_error(f"[오류] 시리얼 쓰기 오류: {error}")
+
+    def _command_done(self, command):
+        """전송한 명령의 결과를 요청한 클라이언트에 알리고, 센서 요청이면 request 토픽으로 알립니다."""
+        if command.cmd == "sensor_req" and command.status == STATUS_SENT:
+            self.publish(TOPIC_REQUEST, {"sent_at": command.sent_at})
+        if command.client in self.subscribers:
+            command.client.send(encode(KIND_ACK, "", command.to_ack()))
+
+    # --------------------------------------------------------
+    # 실행
+    # --------------------------------------------------------
+    async def serve(self, address):
+        self._wakeup = asyncio.Event()
+        kind, addr = address
+        if kind == "unix":
+            if _socket_in_use(addr):
+                raise SystemExit(f"[Broker] 이미 실행 중인 브로커가 있습니다: {addr}")
+            if os.path.exists(addr):
+                os.unlink(addr)     # 이전 실행이 남긴 소켓 파일
+            server = await asyncio.start_unix_server(self.handle_client, path=addr)
+            os.chmod(addr, SOCKET_MODE)
+        else:
+            server = await asyncio.start_server(self.handle_client, *addr)
+        print(f"[Broker] Listening on {kind}:{addr} (serial {self.communicator.port})")
+
+        tasks = [asyncio.create_task(self.serial_loop()),
+                 asyncio.create_task(self.device.poll_loop(self.communicator.is_open, self._wakeup)),
+                 asyncio.create_task(self.device.command_loop(self._wakeup, self._command_done))]
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for task in tasks:
+                task.cancel()
+            self.communicator.disconnect()
+            if kind == "unix" and os.path.exists(addr):
+                os.unlink(addr)
+
+
+def _socket_in_use(path: str) -> bool:
+    """유닉스 도메인 소켓에 접속되는 프로세스(실행 중인 브로커)가 있는지 확인합니다."""
+    if not os.path.exists(path):
+        return False
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AnyGrow2 로컬 브로커 (시리얼 포트 공유)")
+    parser.add_argument("--port", default=os.getenv("ANYGROW_SERIAL_PORT", "COM5"), help="시리얼 포트")
+    parser.add_argument("--baud", type=int, default=38400)
+    parser.add_argument("--address", default=os.getenv("ANYGROW_BROKER"),
+                        help="unix:/path/to.sock 또는 tcp:host:port (기본: 임시 폴더의 유닉스 소켓, Windows 는 TCP)")
+    parser.add_argument("--interval", type=float, default=BROKER_POLL_INTERVAL, help="센서 요청 주기 (초)")
+    args = parser.parse_args()
+
+    broker = Broker(args.port, args.baud, args.interval)
+    try:
+        asyncio.run(broker.serve(parse_address(args.address)))
+    except KeyboardInterrupt:
+        pass
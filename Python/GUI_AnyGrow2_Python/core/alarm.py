@@ -0,0 +1,305 @@
+# core/alarm.py
+import bisect
+import json
+import os
+import time
+from dataclasses import dataclass
+
+from core.constants import THRESHOLD_FILE
+
+# ============================================================
+# Helper Functions & Constants
+# ============================================================
+LEVEL_NORMAL = "NORMAL"
+LEVEL_WARNING = "WARNING"
+LEVEL_CRITICAL = "CRITICAL"
+LEVEL_RANK = {LEVEL_NORMAL: 0, LEVEL_WARNING: 1, LEVEL_CRITICAL: 2}
+
+CHANNEL_LABELS = {"temp": "온도", "hum": "습도", "co2": "CO₂", "illum": "조도"}
+CHANNEL_UNITS = {"temp": "℃", "hum": "%", "co2": "ppm", "illum": "lx"}
+
+# 임계값 규칙 파일 경로. 실행 위치(CWD)와 관계없이 GUI, 웹 서버, 음성 비서가 같은 파일을 사용하도록
+# GUI_AnyGrow2_Python 폴더 기준으로 고정합니다.
+DEFAULT_THRESHOLD_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), THRESHOLD_FILE)
+
+# 채널별 임계값 규칙.
+#   *_low / *_high : 밴드 경계 (경계값은 바깥쪽 밴드에 속합니다. 예: 온도 18은 주의, 30은 위험)
+#   hysteresis     : 현재 밴드를 벗어나려면 경계를 이만큼 더 넘어야 합니다.
+#   dwell          : 새 밴드가 이 시간(초) 이상 유지되어야 상태가 바뀝니다.
+DEFAULT_THRESHOLD_RULES = {
+    "temp": {"critical_low": 15, "warning_low": 18, "warning_high": 27, "critical_high": 30,
+             "hysteresis": 0.3, "dwell": 3.0},
+    "hum": {"critical_low": 30, "warning_low": 40, "warning_high": 70, "critical_high": 80,
+            "hysteresis": 1.0, "dwell": 3.0},
+    "co2": {"warning_high": 1000, "critical_high": 1500, "hysteresis": 50, "dwell": 5.0},
+    "illum": {"critical_low": 200, "warning_low": 800, "hysteresis": 20, "dwell": 5.0},
+}
+
+_LOW_BOUNDS = (("critical_low", LEVEL_CRITICAL), ("warning_low", LEVEL_WARNING))
+_HIGH_BOUNDS = (("warning_high", LEVEL_WARNING), ("critical_high", LEVEL_CRITICAL))
+
+
+def _read_threshold_rules(path) -> dict:
+    """기본 규칙 위에 파일의 규칙을 채널 단위로 덮어쓴 결과를 반환합니다. 읽기/해석 오류는 그대로 발생합니다."""
+    rules = {channel: dict(rule) for channel, rule in DEFAULT_THRESHOLD_RULES.items()}
+    if not os.path.exists(path):
+        return rules
+    with open(path, 'r', encoding='utf-8') as f:
+        loaded = json.load(f)
+    for channel, rule in loaded.items():
+        rules.setdefault(channel, {}).update(rule)
+    return rules
+
+
+def load_threshold_rules(path=DEFAULT_THRESHOLD_PATH) -> dict:
+    """
+    임계값 규칙을 불러옵니다.
+    파일이 있으면 기본 규칙 위에 채널 단위로 덮어쓰고, 없거나 읽을 수 없으면 기본 규칙을 반환합니다.
+    """
+    try:
+        return _read_threshold_rules(path)
+    except Exception as e:
+        print(f"임계값 규칙 불러오기 오류: {e}")
+        return {channel: dict(rule) for channel, rule in DEFAULT_THRESHOLD_RULES.items()}
+
+
+def save_threshold_rules(rules: dict, path=DEFAULT_THRESHOLD_PATH):
+    """
+    임계값 규칙을 JSON 파일에 저장합니다.
+    다른 프로세스(GUI)가 수정 시각을 보고 다시 읽으므로, 임시 파일에 쓴 뒤 교체하여 쓰다 만 파일이 보이지 않게 합니다.
+    """
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(rules, f, ensure_ascii=False, indent=4)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"임계값 규칙 저장 오류: {e}")
+
+
+class ThresholdRulesFile:
+    """
+    임계값 규칙 파일의 수정 시각을 기억해 두고, 바뀌었을 때만 다시 읽습니다.
+    웹 서버 설정 탭에서 저장한 규칙을 재시작 없이 GUI에 반영할 때 사용합니다.
+    """
+    def __init__(self, path=DEFAULT_THRESHOLD_PATH):
+        self.path = path
+        self._mtime = None
+
+    def _stat(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def load(self) -> dict:
+        """규칙을 불러오고 현재 수정 시각을 기억합니다."""
+        self._mtime = self._stat()
+        return load_threshold_rules(self.path)
+
+    def reload_if_changed(self):
+        """
+        마지막으로 읽은 뒤 파일이 바뀌었으면 새 규칙을, 아니면 None을 반환합니다.
+        파일을 읽을 수 없으면 오류를 한 번만 출력하고 None을 반환하여 기존 규칙을 유지합니다.
+        """
+        mtime = self._stat()
+        if mtime == self._mtime:
+            return None
+        self._mtime = mtime
+        try:
+            return _read_threshold_rules(self.path)
+        except Exception as e:
+            print(f"임계값 규칙 다시 불러오기 오류 (기존 규칙 유지): {e}")
+            return None
+
+
+class CompiledChannel:
+    """
+    한 채널의 규칙을 정렬된 경계 배열과 밴드 목록으로 컴파일한 결과입니다.
+    값이 속한 밴드는 bisect 한 번으로 찾습니다. (band_of 참고)
+    """
+    __slots__ = ("edges", "bands", "low_count", "hysteresis", "dwell")
+
+    def __init__(self, rule: dict):
+        edges, bands = [], []
+        for key, level in _LOW_BOUNDS:
+            if rule.get(key) is not None:
+                edges.append(float(rule[key]))
+                bands.append((level, "low"))
+        bands.append((LEVEL_NORMAL, None))
+        for key, level in _HIGH_BOUNDS:
+            if rule.get(key) is not None:
+                edges.append(float(rule[key]))
+                bands.append((level, "high"))
+        if edges != sorted(edges):
+            raise ValueError(f"임계값 경계가 오름차순이 아닙니다: {edges}")
+
+        self.edges = edges
+        self.bands = bands
+        self.low_count = sum(1 for _, side in bands if side == "low")  # edges 앞쪽의 낮은 쪽 경계 수
+        self.hysteresis = float(rule.get("hysteresis", 0.0))
+        self.dwell = float(rule.get("dwell", 0.0))
+
+    def band_of(self, value: float) -> int:
+        """
+        히스테리시스 없이 값이 속한 밴드 인덱스를 반환합니다.
+        경계값이 바깥쪽 밴드에 속하도록 낮은 쪽 경계는 bisect_left, 높은 쪽 경계는 bisect_right로 찾습니다.
+        """
+        low = self.low_count
+        if low and value <= self.edges[low - 1]:
+            return bisect.bisect_left(self.edges, value, 0, low)
+        return bisect.bisect_right(self.edges, value, low)
+
+
+def compile_rules(rules: dict) -> dict:
+    """규칙 딕셔너리를 {채널: CompiledChannel} 로 컴파일합니다."""
+    return {channel: CompiledChannel(rule) for channel, rule in rules.items()}
+
+
+@dataclass
+class AlarmEvent:
+    """채널 상태가 바뀌었을 때만 발생하는 이벤트입니다."""
+    channel: str
+    level: str
+    previous: str | None  # 첫 평가일 때는 None
+    side: str | None      # 'low' / 'high' / None(정상)
+    value: float
+    timestamp: float
+
+    def describe(self) -> str:
+        """사람이 읽을 수 있는 한 줄 설명을 반환합니다. (예: '온도 높음 (31.2 ℃)')"""
+        label = CHANNEL_LABELS.get(self.channel, self.channel)
+        unit = CHANNEL_UNITS.get(self.channel, "")
+        state = {"low": "낮음", "high": "높음"}.get(self.side, "정상")
+        return f"{label} {state} ({self.value:g} {unit})".rstrip()
+
+    def to_dict(self) -> dict:
+        return {
+            "channel": self.channel,
+            "level": self.level,
+            "previous": self.previous,
+            "side": self.side,
+            "value": self.value,
+            "timestamp": self.timestamp,
+            "message": self.describe(),
+        }
+
+
+# ============================================================
+# Alarm Engine Class
+# ============================================================
+class AlarmEngine:
+    """
+    컴파일된 임계값 규칙으로 센서 값을 평가하고, 상태가 바뀔 때만 AlarmEvent를 반환합니다.
+    값이 바뀐 채널과 dwell 대기 중인 채널만 평가하며,
+    히스테리시스와 최소 유지 시간(dwell)으로 경계 근처의 깜빡임을 막습니다.
+    GUI, 웹 서버, 음성 비서가 같은 규칙으로 이 엔진을 사용합니다.
+    """
+    def __init__(self, rules: dict = None):
+        self._rules = {channel: dict(rule) for channel, rule in (rules or DEFAULT_THRESHOLD_RULES).items()}
+        self._channels = compile_rules(self._rules)
+        self._band = {}     # 확정된 밴드 인덱스
+        self._value = {}    # 마지막으로 평가한 값
+        self._pending = {}  # dwell 대기 중인 (밴드, 시작 시간)
+
+    @property
+    def rules(self) -> dict:
+        return self._rules
+
+    def evaluate(self, reading: dict, now: float = None) -> list:
+        """
+        센서 측정값 딕셔너리를 평가하고 상태 전이 이벤트 목록을 반환합니다.
+        """
+        if now is None:
+            now = reading.get("timestamp") or time.time()
+
+        events = []
+        for channel, value in reading.items():
+            compiled = self._channels.get(channel)
+            if compiled is None or value is None:
+                continue
+            if value == self._value.get(channel) and channel not in self._pending:
+                continue
+            self._value[channel] = value
+            event = self._step(channel, compiled, value, now)
+            if event:
+                events.append(event)
+
+        # 값은 그대로지만 dwell 시간이 지난 채널
+        for channel in [c for c in self._pending if c not in reading]:
+            event = self._step(channel, self._channels[channel], self._value[channel], now)
+            if event:
+                events.append(event)
+        return events
+
+    def _step(self, channel, compiled, value, now):
+        current = self._band.get(channel)
+        if current is None:
+            return self._commit(channel, compiled, compiled.band_of(value), value, now)
+
+        # 경계를 히스테리시스만큼 더 넘어야 밴드를 옮깁니다. (경계값 포함 여부는 band_of와 같음)
+        h = compiled.hysteresis
+        candidate = compiled.band_of(value - h)
+        if candidate <= current:
+            candidate = min(current, compiled.band_of(value + h))
+
+        if candidate == current:
+            self._pending.pop(channel, None)
+            return None
+
+        pending = self._pending.get(channel)
+        if pending is None or pending[0] != candidate:
+            pending = (candidate, now)
+            self._pending[channel] = pending
+        if now - pending[1] < compiled.dwell:
+            return None
+
+        self._pending.pop(channel, None)
+        return self._commit(channel, compiled, candidate, value, now)
+
+    def _commit(self, channel, compiled, band, value, now):
+        previous = self._band.get(channel)
+        self._band[channel] = band
+        level, side = compiled.bands[band]
+        prev_level = compiled.bands[previous][0] if previous is not None else None
+        return AlarmEvent(channel, level, prev_level, side, value, now)
+
+    def update_rules(self, rules: dict) -> list:
+        """
+        일부 채널의 규칙을 바꾸고 해당 채널만 다시 컴파일합니다.
+        바뀐 채널은 마지막 값으로 즉시 다시 평가하여 이벤트를 반환합니다.
+        잘못된 규칙이면 ValueError를 발생시키고 기존 규칙을 유지합니다.
+        """
+        merged = {channel: {**self._rules.get(channel, {}), **rule} for channel, rule in rules.items()}
+        compiled = compile_rules(merged)
+        self._rules.update(merged)
+        self._channels.update(compiled)
+
+        events = []
+        for channel in compiled:
+            self._band.pop(channel, None)
+            self._pending.pop(channel, None)
+            if channel in self._value:
+                events.append(self._commit(channel, compiled[channel],
+                                           compiled[channel].band_of(self._value[channel]),
+                                           self._value[channel], time.time()))
+        return events
+
+    def level_of(self, channel: str) -> str:
+        """채널의 현재 확정 수준을 반환합니다. 아직 평가 전이면 NORMAL."""
+        band = self._band.get(channel)
+        if band is None:
+            return LEVEL_NORMAL
+        return self._channels[channel].bands[band][0]
+
+    def snapshot(self) -> list:
+        """모든 채널의 현재 상태를 AlarmEvent 목록으로 반환합니다. (새 구독자 초기화용)"""
+        states = []
+        for channel, band in self._band.items():
+            level, side = self._channels[channel].bands[band]
+            states.append(AlarmEvent(channel, level, None, side, self._value[channel], time.time()))
+        return states
+
+    def worst_level(self) -> str:
+        """모든 채널 중 가장 심각한 수준을 반환합니다."""
+        return max((self.level_of(c) for c in self._channels), key=LEVEL_RANK.get, default=LEVEL_NORMAL)
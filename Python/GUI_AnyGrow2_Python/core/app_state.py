@@ -7,10 +7,12 @@ class AppState(QObject):
     데이터 변경 시 시그널을 발생시켜 UI 및 다른 컴포넌트들이 반응할 수 있도록 합니다.
     """
     data_updated = pyqtSignal(dict) # 모든 센서 데이터가 업데이트될 때 발생
+    alarm_changed = pyqtSignal(object) # 센서 알람 수준이 바뀔 때 발생 (AlarmEvent)
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self._sensor_data = {} # 센서 데이터를 저장할 딕셔너리
+        self._alarm_levels = {} # 채널별 현재 알람 수준
         
     def get_sensor_data(self):
         """현재 센서 데이터 딕셔너리를 반환합니다."""
@@ -28,6 +30,17 @@ class AppState(QObject):
         
         if updated:
             self.data_updated.emit(self._sensor_data)
+
+    def get_alarm_level(self, channel: str):
+        """채널의 현재 알람 수준을 반환합니다. (아직 평가 전이면 None)"""
+        return self._alarm_levels.get(channel)
+
+    def update_alarm(self, event):
+        """
+        AlarmEngine이 만든 상태 전이 이벤트를 반영하고 alarm_changed 시그널을 발생시킵니다.
+        """
+        self._alarm_levels[event.channel] = event.level
+        self.alarm_changed.emit(event)
             
     # 개별 센서 데이터 속성 (읽기 전용)
     @property
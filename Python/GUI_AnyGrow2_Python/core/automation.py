@@ -0,0 +1,156 @@
+# core/automation.py
+import json
+import os
+import time
+from collections import deque
+from datetime import datetime
+
+from core.constants import AUTOMATION_FILE
+
+# ============================================================
+# Helper Functions & Constants
+# ============================================================
+# 규칙 파일(automation_rules.json) 형식 예시:
+# [
+#   {"name": "CO2 환기", "channel": "co2", "op": ">", "value": 2500,
+#    "command": "uv", "args": {"on": true},
+#    "clear_command": "uv", "clear_args": {"on": false},
+#    "cooldown": 60, "max_per_hour": 10},
+#   {"name": "광주기 보광", "channel": "illum", "op": "<", "value": 200,
+#    "between": ["06:00", "22:00"],
+#    "command": "led", "args": {"mode": "On"}, "cooldown": 300}
+# ]
+_OPERATORS = {
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+}
+
+
+def _minutes_of_day(text: str) -> int:
+    """'HH:MM' 문자열을 자정 이후 분으로 변환합니다."""
+    hour, minute = text.split(":")
+    return int(hour) * 60 + int(minute)
+
+
+def load_automation_rules(path=AUTOMATION_FILE) -> list:
+    """자동화 규칙 파일을 불러옵니다. 파일이 없으면 빈 목록을 반환합니다."""
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"자동화 규칙 불러오기 오류: {e}")
+        return []
+
+
+# ============================================================
+# Reaction Rule Class
+# ============================================================
+class ReactionRule:
+    """
+    센서 값 조건 하나와 그에 대한 명령을 표현합니다.
+    조건이 참이 되는 순간 한 번 명령을 내고, 조건이 풀리면 clear_command(있을 때)를 냅니다.
+    cooldown(초)과 max_per_hour로 명령 빈도를 제한합니다.
+    """
+    def __init__(self, spec: dict):
+        self.name = spec.get("name", spec["channel"])
+        self.channel = spec["channel"]
+        if spec.get("op", ">") not in _OPERATORS:
+            raise ValueError(f"알 수 없는 비교 연산자: {spec.get('op')}")
+        self._compare = _OPERATORS[spec.get("op", ">")]
+        self.value = float(spec["value"])
+        self.command = spec["command"]
+        self.args = spec.get("args", {})
+        self.clear_command = spec.get("clear_command")
+        self.clear_args = spec.get("clear_args", {})
+        self.cooldown = float(spec.get("cooldown", 0))
+        self.max_per_hour = spec.get("max_per_hour")
+
+        between = spec.get("between")
+        self._window = (_minutes_of_day(between[0]), _minutes_of_day(between[1])) if between else None
+
+        self.active = False
+        self._fired = deque()  # 최근 1시간 동안의 명령 시간
+        self._last_fire = None
+
+    def in_window(self, minute_of_day: int) -> bool:
+        """규칙의 시간대(between) 안인지 확인합니다. 자정을 넘는 구간도 지원합니다."""
+        if self._window is None:
+            return True
+        start, end = self._window
+        if start <= end:
+            return start <= minute_of_day < end
+        return minute_of_day >= start or minute_of_day < end
+
+    def _allowed(self, now: float) -> bool:
+        if self._last_fire is not None and now - self._last_fire < self.cooldown:
+            return False
+        while self._fired and now - self._fired[0] >= 3600:
+            self._fired.popleft()
+        return self.max_per_hour is None or len(self._fired) < self.max_per_hour
+
+    def step(self, value: float, now: float, minute_of_day: int):
+        """
+        새 값으로 규칙을 평가하고, 보낼 명령이 있으면 (cmd, args)를, 없으면 None을 반환합니다.
+        조건이 참이지만 제한에 걸린 경우에는 다음 측정값에서 다시 시도합니다.
+        """
+        condition = self.in_window(minute_of_day) and self._compare(value, self.value)
+        if condition and not self.active:
+            if not self._allowed(now):
+                return None
+            self.active = True
+            self._last_fire = now
+            self._fired.append(now)
+            return self.command, self.args
+        if not condition and self.active:
+            self.active = False
+            if self.clear_command:
+                return self.clear_command, self.clear_args
+        return None
+
+
+# ============================================================
+# Automation Engine Class
+# ============================================================
+class AutomationEngine:
+    """
+    센서 측정값에 반응하는 자동화 규칙들을 평가합니다.
+    HardwareManager가 하드웨어 스레드에서 파싱 직후 호출하므로, GUI 상태와 무관하게 동작합니다.
+    """
+    def __init__(self, rules: list = None):
+        self._rules = []
+        for spec in rules or []:
+            try:
+                self._rules.append(ReactionRule(spec))
+            except (KeyError, ValueError) as e:
+                print(f"[AUTOMATION] 잘못된 규칙을 건너뜁니다: {spec} ({e})")
+        # 채널별 규칙 목록 (측정값의 채널만 평가)
+        self._by_channel = {}
+        for rule in self._rules:
+            self._by_channel.setdefault(rule.channel, []).append(rule)
+
+    def __bool__(self):
+        return bool(self._rules)
+
+    def evaluate(self, reading: dict, now: float = None) -> list:
+        """
+        측정값을 평가하여 보낼 명령 목록 [(rule_name, cmd, args), ...]을 반환합니다.
+        """
+        if now is None:
+            now = reading.get("timestamp") or time.time()
+        local = datetime.fromtimestamp(now)
+        minute_of_day = local.hour * 60 + local.minute
+
+        actions = []
+        for channel, rules in self._by_channel.items():
+            value = reading.get(channel)
+            if value is None:
+                continue
+            for rule in rules:
+                result = rule.step(value, now, minute_of_day)
+                if result is not None:
+                    actions.append((rule.name, result[0], result[1]))
+        return actions
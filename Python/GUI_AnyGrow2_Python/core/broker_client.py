@@ -0,0 +1,172 @@
+# core/broker_client.py
+import itertools
+import socket
+import threading
+import time
+
+from core.broker_protocol import (
+    KIND_PUBLISH, KIND_SUBSCRIBE, KIND_COMMAND, KIND_ACK, ALL_TOPICS,
+    MessageReader, encode, default_address,
+)
+from core.command_queue import STATUS_FAILED
+from core.constants import BROKER_RECONNECT_INTERVAL, PRIORITY_NORMAL
+
+# ============================================================
+# Broker Client Class
+# ============================================================
+class BrokerClient:
+    """
+    로컬 브로커(broker.py)에 접속하는 스레드 기반 클라이언트. Qt 없이 사용할 수 있습니다. (웹 서버, 음성 비서)
+    연결이 끊기면 BROKER_RECONNECT_INTERVAL 마다 다시 접속하고 구독 목록을 다시 보냅니다.
+
+    콜백은 수신 스레드에서 호출되므로 오래 걸리는 작업을 하지 않아야 합니다.
+    - on_message(topic, body): 구독한 토픽의 메시지
+    - on_ack(ack, context): 명령 결과. ack["id"] 는 submit 에 준 command_id, context 도 submit 에 준 값
+    - on_connection(connected): 브로커 연결/끊김
+    """
+    def __init__(self, topics=(ALL_TOPICS,), address=None, on_message=None, on_ack=None, on_connection=None):
+        self.address = address or default_address()
+        self.topics = list(topics)
+        self.on_message = on_message
+        self.on_ack = on_ack
+        self.on_connection = on_connection
+        self._sock = None
+        self._send_lock = threading.Lock()
+        self._pending = {}              # 브로커에 보낸 명령 번호 -> (command_id, cmd, context)
+        self._pending_lock = threading.Lock()
+        self._seq = itertools.count(1)
+        self._running = False
+        self._thread = None
+
+    @property
+    def connected(self) -> bool:
+        return self._sock is not None
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="BrokerClient", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        self.reconnect()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+
+    def reconnect(self):
+        """현재 연결을 끊습니다. 실행 중이면 수신 스레드가 다시 접속합니다."""
+        sock = self._sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def subscribe(self, topics):
+        """구독 목록을 바꿉니다. 연결되어 있지 않으면 다음 접속 때 보냅니다."""
+        self.topics = list(topics)
+        self._send(encode(KIND_SUBSCRIBE, "", {"topics": self.topics}))
+
+    def submit(self, cmd: str, args=None, command_id=None, priority=PRIORITY_NORMAL, context=None) -> bool:
+        """
+        명령을 브로커의 명령 큐로 보냅니다. 브로커에 연결되어 있지 않으면 False.
+        전송 결과(sent/failed)는 on_ack 로 한 번 전달됩니다.
+        """
+        seq = next(self._seq)
+        with self._pending_lock:
+            self._pending[seq] = (command_id, cmd, context)
+        body = {"id": seq, "cmd": cmd, "args": args or {}, "priority": priority}
+        if self._send(encode(KIND_COMMAND, "", body)):
+            return True
+        with self._pending_lock:
+            self._pending.pop(seq, None)
+        return False
+
+    def _send(self, data: bytes) -> bool:
+        with self._send_lock:
+            if self._sock is None:
+                return False
+            try:
+                self._sock.sendall(data)
+                return True
+            except OSError:
+                return False
+
+    def _connect(self):
+        kind, addr = self.address
+        sock = socket.socket(socket.AF_UNIX if kind == "unix" else socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            sock.connect(addr)
+        except OSError:
+            sock.close()
+            raise
+        if kind == "tcp":
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return sock
+
+    def _run(self):
+        warned = False
+        while self._running:
+            try:
+                sock = self._connect()
+            except OSError as e:
+                # 브로커가 꺼져 있는 동안 매번 출력하지 않도록 한 번만 알립니다.
+                if not warned:
+                    print(f"[Broker] Cannot connect to {self.address[1]}: {e}")
+                    warned = True
+                time.sleep(BROKER_RECONNECT_INTERVAL)
+                continue
+
+            warned = False
+            with self._send_lock:
+                self._sock = sock
+            self._send(encode(KIND_SUBSCRIBE, "", {"topics": self.topics}))
+            print(f"[Broker] Connected to {self.address[1]}")
+            self._notify_connection(True)
+            try:
+                self._read(sock)
+            except (OSError, ValueError) as e:
+                print(f"[Broker] Connection error: {e}")
+            finally:
+                with self._send_lock:
+                    self._sock = None
+                sock.close()
+                self._fail_pending("broker connection lost")
+                self._notify_connection(False)
+            if self._running:
+                time.sleep(BROKER_RECONNECT_INTERVAL)
+
+    def _read(self, sock):
+        messages = MessageReader()
+        while True:
+            data = sock.recv(65536)
+            if not data:
+                return
+            for kind, topic, body in messages.feed(data):
+                if kind == KIND_PUBLISH:
+                    if self.on_message is not None:
+                        self.on_message(topic, body)
+                elif kind == KIND_ACK:
+                    self._handle_ack(body)
+
+    def _handle_ack(self, ack):
+        with self._pending_lock:
+            command_id, _cmd, context = self._pending.pop(ack.get("id"), (None, None, None))
+        ack["id"] = command_id
+        if self.on_ack is not None:
+            self.on_ack(ack, context)
+
+    def _fail_pending(self, error: str):
+        """끊긴 연결로 보낸 명령은 결과를 받을 수 없으므로 실패로 알립니다."""
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        if self.on_ack is None:
+            return
+        for command_id, cmd, context in pending.values():
+            self.on_ack({"id": command_id, "cmd": cmd, "status": STATUS_FAILED, "error": error}, context)
+
+    def _notify_connection(self, connected: bool):
+        if self.on_connection is not None:
+            self.on_connection(connected)
@@ -0,0 +1,99 @@
+# core/broker_protocol.py
+import json
+import os
+import struct
+import tempfile
+
+from core.constants import BROKER_SOCKET_FILE, BROKER_TCP_HOST, BROKER_TCP_PORT, BROKER_MAX_MESSAGE
+
+# ============================================================
+# Helper Functions & Constants
+# ============================================================
+# 메시지 구조: [본문 길이 u32][종류 u8][토픽 길이 u16][토픽 utf-8][본문 JSON utf-8]
+# 길이는 "종류"부터 끝까지의 바이트 수입니다. 정수는 모두 빅엔디언.
+_LENGTH = struct.Struct(">I")
+_HEAD = struct.Struct(">BH")
+
+KIND_PUBLISH = 1     # 브로커 → 클라이언트: 토픽 메시지
+KIND_SUBSCRIBE = 2   # 클라이언트 → 브로커: {"topics": [...]} (보낼 때마다 구독 목록을 교체)
+KIND_COMMAND = 3     # 클라이언트 → 브로커: {"id", "cmd", "args", "priority"}
+KIND_ACK = 4         # 브로커 → 클라이언트: Command.to_ack() (전송 완료 또는 실패 시 한 번)
+
+# 토픽
+TOPIC_SENSOR = "sensor"     # {"temp", "hum", "co2", "illum", "timestamp", "response_ms"}
+TOPIC_RAW = "raw"           # {"hex": "aa,bb,..."} 수신 바이트 (구독자가 있을 때만 만듭니다)
+TOPIC_STATUS = "status"     # {"open": bool, "message": str} 시리얼 포트 상태
+TOPIC_REQUEST = "request"   # {"sent_at"} 센서 요청을 장치로 보냈음
+ALL_TOPICS = "*"
+
+
+def encode(kind: int, topic: str = "", body=None) -> bytes:
+    """메시지 하나를 바이트로 만듭니다. 여러 구독자에게 보낼 때도 한 번만 호출하면 됩니다."""
+    topic_bytes = topic.encode("utf-8")
+    body_bytes = b"" if body is None else json.dumps(body, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    size = _HEAD.size + len(topic_bytes) + len(body_bytes)
+    return _LENGTH.pack(size) + _HEAD.pack(kind, len(topic_bytes)) + topic_bytes + body_bytes
+
+
+def matches(topic: str, subscriptions) -> bool:
+    """구독 목록이 토픽을 포함하는지 확인합니다. "*" 는 전체, "status" 는 "status/..." 하위 토픽도 포함."""
+    for sub in subscriptions:
+        if sub == ALL_TOPICS or sub == topic or topic.startswith(sub + "/"):
+            return True
+    return False
+
+
+def default_address():
+    """기본 브로커 주소. POSIX 는 임시 폴더의 유닉스 도메인 소켓, 그 외(Windows)는 localhost TCP."""
+    if os.name == "posix":
+        return ("unix", os.path.join(tempfile.gettempdir(), BROKER_SOCKET_FILE))
+    return ("tcp", (BROKER_TCP_HOST, BROKER_TCP_PORT))
+
+
+def parse_address(text=None):
+    """
+    "unix:/path/to.sock" 또는 "tcp:host:port" 형식의 주소를 (종류, 주소)로 바꿉니다.
+    비어 있거나 "1"/"default" 이면 default_address() 를 반환합니다. 형식이 잘못되면 ValueError.
+    """
+    if not text or text in ("1", "default"):
+        return default_address()
+    scheme, _, rest = text.partition(":")
+    if scheme == "unix" and rest:
+        return ("unix", rest)
+    if scheme == "tcp" and rest:
+        host, _, port = rest.rpartition(":")
+        return ("tcp", (host or BROKER_TCP_HOST, int(port)))
+    raise ValueError(f"잘못된 브로커 주소: {text}")
+
+
+# ============================================================
+# Message Reader Class
+# ============================================================
+class MessageReader:
+    """
+    끊어서 들어오는 스트림 바이트를 메시지 단위로 다시 조립합니다.
+    길이 머리말로 경계를 찾으므로 본문을 훑지 않고, JSON 디코딩은 메시지마다 한 번만 합니다.
+    """
+    def __init__(self, max_message=BROKER_MAX_MESSAGE):
+        self.max_message = max_message
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes):
+        """수신 바이트를 추가하고, 완성된 (종류, 토픽, 본문) 목록을 반환합니다. 길이가 잘못되면 ValueError."""
+        buf = self._buffer
+        buf += data
+        messages = []
+        while len(buf) >= _LENGTH.size:
+            (size,) = _LENGTH.unpack_from(buf)
+            if size < _HEAD.size or size > self.max_message:
+                raise ValueError(f"잘못된 메시지 길이: {size}")
+            end = _LENGTH.size + size
+            if len(buf) < end:
+                break
+            kind, topic_len = _HEAD.unpack_from(buf, _LENGTH.size)
+            start = _LENGTH.size + _HEAD.size
+            topic = bytes(buf[start:start + topic_len]).decode("utf-8")
+            payload = bytes(buf[start + topic_len:end])
+            del buf[:end]
+            messages.append((kind, topic, json.loads(payload) if payload else None))
+        return messages
@@ -0,0 +1,38 @@
+# core/clock.py
+import time
+from datetime import datetime, timedelta
+
+
+class SystemClock:
+    """실제 벽시계와 단조 시계를 제공합니다. Scheduler의 기본 시계입니다."""
+    def now(self) -> datetime:
+        return datetime.now()
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+
+class SimulatedClock:
+    """
+    직접 움직이는 결정적 시계입니다. 시뮬레이션과 검증에서 Scheduler에 주입합니다.
+    advance()는 벽시계와 단조 시계를 함께 움직이고, jump()는 벽시계만 바꿉니다. (시계 변경 재현용)
+    """
+    def __init__(self, start: datetime):
+        self._now = start
+        self._mono = 0.0
+
+    def now(self) -> datetime:
+        return self._now
+
+    def monotonic(self) -> float:
+        return self._mono
+
+    def advance(self, **delta):
+        """timedelta 인자(minutes=5 등)만큼 시간을 진행합니다."""
+        step = timedelta(**delta)
+        self._now += step
+        self._mono += step.total_seconds()
+
+    def jump(self, to: datetime):
+        """단조 시계는 그대로 두고 벽시계만 바꿉니다."""
+        self._now = to
@@ -0,0 +1,165 @@
+# core/command_queue.py
+import heapq
+import itertools
+import threading
+import time
+from dataclasses import dataclass, field
+
+from core.constants import COMMAND_INTERVAL, COMMAND_QUEUE_LIMIT, PRIORITY_NORMAL
+from core.protocol import PacketBuilder
+
+# ============================================================
+# Helper Functions & Constants
+# ============================================================
+STATUS_QUEUED = "queued"
+STATUS_SENT = "sent"
+STATUS_FAILED = "failed"
+
+LED_MODES = ("Off", "On", "Mood")
+
+# HardwareManager._command_map 과 같은 명령 이름과 인자 형식
+COMMAND_BUILDERS = {
+    "sensor_req": lambda args: PacketBuilder.sensor_request(),
+    # PacketBuilder.led 는 모르는 모드를 Off 로 바꾸므로 여기서 먼저 거릅니다.
+    "led": lambda args: PacketBuilder.led(args["mode"]) if args.get("mode") in LED_MODES else None,
+    "pump": lambda args: PacketBuilder.pump(bool(args.get("on"))),
+    "uv": lambda args: PacketBuilder.uv(bool(args.get("on"))),
+    "bms_time_sync": lambda args: PacketBuilder.bms_time_sync(
+        int(args.get("hour", 0)), int(args.get("minute", 0)), int(args.get("second", 0))),
+    "channel_led": lambda args: PacketBuilder.channel_led(args.get("settings", [])),
+}
+
+
+def build_packet(cmd: str, args: dict):
+    """명령 이름과 인자로 패킷을 만듭니다. 모르는 명령이거나 인자가 잘못되면 None."""
+    builder = COMMAND_BUILDERS.get(cmd)
+    if builder is None:
+        return None
+    try:
+        return builder(args)
+    except (TypeError, ValueError, KeyError, AttributeError):
+        return None
+
+
+@dataclass
+class Command:
+    """큐에 들어온 명령 하나와 처리 상태/시각을 담습니다."""
+    id: object              # 요청한 쪽이 붙인 식별자 (없으면 큐 순번)
+    cmd: str
+    args: dict
+    packet: bytes | None
+    client: object = None   # 응답(ack)을 돌려줄 대상 (예: Socket.IO sid)
+    status: str = STATUS_QUEUED
+    error: str | None = None
+    queued_at: float = field(default_factory=time.time)
+    sent_at: float | None = None
+
+    def to_ack(self) -> dict:
+        ack = {"id": self.id, "cmd": self.cmd, "status": self.status, "queued_at": self.queued_at}
+        if self.sent_at is not None:
+            ack["sent_at"] = self.sent_at
+            ack["wait_ms"] = round((self.sent_at - self.queued_at) * 1000, 1)
+        if self.error:
+            ack["error"] = self.error
+        return ack
+
+
+# ============================================================
+# Command Queue Class
+# ============================================================
+class CommandQueue:
+    """
+    장치로 보낼 명령을 순서대로 내보내는 스레드 안전 큐.
+    이전 전송 후 min_gap 이 지났으면 바로, 아니면 남은 시간만큼만 기다렸다가 보냅니다.
+    같은 우선순위 안에서는 제출 순서를 지키며, 센서 요청은 대기 중인 것이 있으면 합칩니다.
+    """
+    def __init__(self, min_gap=COMMAND_INTERVAL, limit=COMMAND_QUEUE_LIMIT):
+        self.min_gap = min_gap
+        self.limit = limit
+        self._heap = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._last_sent = 0.0       # monotonic
+        self._pending_sensor = None
+        self.sent = 0
+        self.failed = 0
+
+    def __len__(self):
+        with self._cond:
+            return len(self._heap)
+
+    def submit(self, cmd: str, args=None, client=None, command_id=None, priority=PRIORITY_NORMAL,
+               reject: str | None = None) -> Command:
+        """
+        명령을 큐에 넣고 Command 를 반환합니다.
+        패킷을 만들 수 없거나 큐가 가득 차면 status 가 'failed' 인 Command 를 반환합니다.
+        reject 를 주면 큐에 넣지 않고 그 사유로 실패 처리합니다. (예: 포트가 닫혀 있음)
+        """
+        args = args or {}
+        with self._cond:
+            if cmd == "sensor_req" and self._pending_sensor is not None and not reject:
+                return self._pending_sensor
+            seq = next(self._seq)
+            command = Command(command_id if command_id is not None else seq, cmd, args,
+                              build_packet(cmd, args), client)
+            if command.packet is None:
+                return self._fail(command, f"unknown command or bad arguments: {cmd}")
+            if reject:
+                return self._fail(command, reject)
+            if len(self._heap) >= self.limit:
+                return self._fail(command, "command queue is full")
+            heapq.heappush(self._heap, (priority, seq, command))
+            if cmd == "sensor_req":
+                self._pending_sensor = command
+            self._cond.notify()
+        return command
+
+    def pop_due(self):
+        """
+        보낼 차례가 된 명령을 꺼냅니다. (비차단)
+        반환값: (Command, None) / 간격 대기 중이면 (None, 남은 초) / 비어 있으면 (None, None)
+        """
+        with self._cond:
+            return self._pop_due_locked()
+
+    def get(self, timeout=None):
+        """보낼 차례가 된 명령을 꺼냅니다. 없으면 최대 timeout 초까지 기다리고 None 을 반환합니다."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                command, wait = self._pop_due_locked()
+                if command is not None:
+                    return command
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return None
+                    wait = remaining if wait is None else min(wait, remaining)
+                self._cond.wait(wait)
+
+    def mark_sent(self, command: Command):
+        command.status = STATUS_SENT
+        command.sent_at = time.time()
+        self.sent += 1
+
+    def mark_failed(self, command: Command, error: str):
+        with self._cond:
+            self._fail(command, error)
+
+    def _fail(self, command, error):
+        command.status = STATUS_FAILED
+        command.error = error
+        self.failed += 1
+        return command
+
+    def _pop_due_locked(self):
+        if not self._heap:
+            return None, None
+        wait = self._last_sent + self.min_gap - time.monotonic()
+        if wait > 0:
+            return None, wait
+        _, _, command = heapq.heappop(self._heap)
+        if command is self._pending_sensor:
+            self._pending_sensor = None
+        self._last_sent = time.monotonic()
+        return command, None
@@ -2,4 +2,53 @@
 
 WEEKDAYS_MAP = ["월요일", "화요일", "수요일", "목요일", "금요일", "토요일", "일요일"]
 SCHEDULE_FILE = "schedules.json"
+SCHEDULE_SAVE_DEBOUNCE = 1.0 # 연속된 예약 편집을 한 번의 저장으로 합치는 시간 (초)
+SCHEDULE_ARCHIVE_FILE = "schedules_archive.jsonl" # 지난 "오늘" 예약 보관 파일
+DAILY_KEEP_DAYS = 7 # 이 기간보다 오래된 "오늘" 예약은 보관 파일로 옮깁니다 (일)
 COMMAND_INTERVAL = 0.2 # 200ms between commands to prevent spamming
+COMMAND_QUEUE_LIMIT = 100 # 웹 서버/브로커 명령 큐의 최대 대기 명령 수
+
+# 센서 채널 키 (PacketParser.parse_sensor_packet 결과 딕셔너리의 키와 동일)
+SENSOR_KEYS = ("temp", "hum", "co2", "illum")
+
+# 센서 이력 DB
+HISTORY_DB_FILE = "sensor_history.db"
+HISTORY_FLUSH_INTERVAL = 5.0 # 버퍼링된 샘플을 DB에 커밋하는 주기 (초)
+
+# 센서 임계값(알람) 규칙 파일. 없으면 core/alarm.py의 기본 규칙을 사용합니다.
+THRESHOLD_FILE = "thresholds.json"
+THRESHOLD_RELOAD_INTERVAL_MS = 2000 # GUI가 규칙 파일의 수정 시각을 확인하는 주기 (웹 설정 탭에서 바꾼 규칙 반영)
+
+# 센서 반응형 자동화 규칙 파일. 없으면 자동화 규칙을 사용하지 않습니다.
+AUTOMATION_FILE = "automation_rules.json"
+
+# 광주기(일출/일몰) LED 램프 설정 파일. 없으면 광주기 제어를 사용하지 않습니다.
+PHOTOPERIOD_FILE = "photoperiod.json"
+PHOTOPERIOD_MIN_STEP = 5.0 # 램프 단계 사이의 최소 간격 (초)
+
+# 하드웨어 명령 우선순위 (작을수록 먼저 전송)
+PRIORITY_HIGH = 0    # 자동화 규칙 명령
+PRIORITY_NORMAL = 1  # 사용자/스케줄 명령, 센서 요청
+
+# 시작 타임라인 기록 파일 (JSON Lines, 실행마다 한 줄). 키오스크 콜드 스타트 추적용
+STARTUP_LOG_FILE = "startup_timeline.jsonl"
+STARTUP_REPORT_TIMEOUT = 30.0 # 첫 센서 수신이 없어도 이 시간이 지나면 타임라인을 기록합니다 (초)
+
+# 이벤트 루프 정지 감시 (GUI 스레드, 하드웨어 스레드)
+WATCHDOG_HEARTBEAT_MS = 100   # 각 스레드의 하트비트 타이머 간격
+WATCHDOG_STALL_MS = 500       # 하트비트가 이보다 오래 멈추면 정지로 보고 스택을 기록
+WATCHDOG_LOG_FILE = "watchdog.log"
+WATCHDOG_LOG_MAX_BYTES = 1_000_000
+WATCHDOG_LOG_BACKUPS = 3
+WATCHDOG_METRICS_FILE = "watchdog.prom"  # Prometheus textfile 형식 지표 (node_exporter textfile collector용)
+WATCHDOG_METRICS_INTERVAL = 15.0         # 지표 파일을 다시 쓰는 주기 (초)
+
+# 로컬 브로커 (broker.py): 시리얼 포트 하나를 GUI, 웹 서버, 음성 비서가 함께 사용
+BROKER_SOCKET_FILE = "anygrow2_broker.sock" # 임시 폴더에 만드는 유닉스 도메인 소켓 이름 (POSIX)
+BROKER_TCP_HOST = "127.0.0.1"   # 유닉스 도메인 소켓이 없는 플랫폼(Windows)의 대체 주소
+BROKER_TCP_PORT = 52280
+BROKER_MAX_MESSAGE = 1 << 20    # 메시지 하나의 최대 크기 (바이트)
+BROKER_CLIENT_BUFFER_LIMIT = 64 * 1024 # 송신 버퍼가 이보다 쌓인 구독자에게는 센서값/원시 바이트를 건너뜁니다
+BROKER_POLL_INTERVAL = 0.5      # 센서 요청 주기 (초)
+BROKER_READ_INTERVAL = 0.02     # 시리얼 수신 확인 주기 (초)
+BROKER_RECONNECT_INTERVAL = 3.0 # 시리얼/브로커 재연결 시도 간격 (초)
@@ -0,0 +1,196 @@
+# core/device_link.py
+# 장치(시리얼 포트) 하나와 주고받는 공통 흐름 (Qt 없음)
+#   센서 요청 주기 → 명령 큐 → 전송 / 수신 바이트 → 프레임 조립 → 센서값
+# 로컬 브로커(broker.py), 웹 서버 스레드 모드(app.py)와 asyncio 모드(async_app.py)가 함께 사용합니다.
+# 포트를 열고 읽는 방법(블로킹 read, add_reader, 재연결)과 결과를 내보내는 곳은 각 호출자가 정합니다.
+
+import asyncio
+import inspect
+import threading
+import time
+
+from core.command_queue import CommandQueue
+from core.metrics import LatencyHistogram
+from core.protocol import FrameAssembler, PacketParser
+
+# ============================================================
+# Helper Functions & Constants
+# ============================================================
+TIMEOUT_LOG_EVERY = 60  # 장치가 빠진 동안 매 주기 출력하지 않도록 응답 없음은 처음과 이 횟수마다만 알립니다
+
+
+def _next_tick(next_tick: float, interval: float, now: float) -> float:
+    """다음 요청 시각. sleep 오차가 누적되지 않도록 이전 예정 시각에 주기를 더하고, 이미 지났으면 지금으로 맞춥니다."""
+    return max(next_tick + interval, now)
+
+
+async def _maybe_await(result):
+    if inspect.isawaitable(result):
+        await result
+
+
+# ============================================================
+# Device Link Class
+# ============================================================
+class DeviceLink:
+    """
+    명령 큐(CommandQueue)와 프레임 조립기(FrameAssembler)로 장치 하나와의 통신 상태를 관리합니다.
+      - 센서 요청: poll_interval 마다 sensor_req 를 큐에 넣고, 이전 요청의 응답이 없었으면 타임아웃으로 셉니다.
+      - 명령 전송: 큐에서 꺼낸 명령을 write(packet) 으로 보내고 결과를 큐에 기록합니다.
+      - 수신: feed(data) 가 완성된 프레임을 한 번만 파싱하여 센서값 목록을 반환합니다.
+    각 카운터는 값을 바꾸는 루프가 하나뿐이라 잠금 없이 갱신합니다. (웹 서버 /metrics 가 그대로 읽음)
+    """
+    def __init__(self, write, poll_interval: float, on_write_error=None, log_prefix: str = "[Device]"):
+        self.commands = CommandQueue()
+        self.assembler = FrameAssembler()
+        self.poll_interval = poll_interval
+        self._write = write                     # callable(packet: bytes), 실패하면 예외
+        self._on_write_error = on_write_error   # callable(error) 또는 None
+        self._log = log_prefix
+        self._lock = threading.Lock()           # request_sent_at 은 전송/수신 루프가 함께 사용
+
+        self.request_sent_at = None     # 응답을 기다리는 센서 요청의 전송 시각 (monotonic), 없으면 None
+        self.response_timeouts = 0      # 다음 요청 시각까지 응답이 없었던 횟수
+        self.last_response_ms = None    # 마지막 센서 요청 → 프레임 완성까지 걸린 시간 (ms)
+
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.frames_parsed = 0          # 센서값으로 해석된 프레임 (브로커에서 받은 센서값 포함)
+        self.frames_failed = 0          # 완성됐지만 값이 깨진 프레임
+        self.write_errors = 0
+        self.response_ms = LatencyHistogram()       # 센서 요청 전송 → 응답 프레임 완성
+        self.command_wait_ms = LatencyHistogram()   # 명령 접수 → 장치 전송
+        self.loop_lag_ms = LatencyHistogram()       # 센서 요청 루프가 예정 시각보다 늦게 깨어난 시간
+
+    def reset(self):
+        """포트를 다시 열었을 때 조립 중이던 바이트와 응답 대기 상태를 버립니다."""
+        self.assembler.reset()
+        with self._lock:
+            self.request_sent_at = None
+
+    # --------------------------------------------------------
+    # 센서 요청
+    # --------------------------------------------------------
+    def poll_tick(self):
+        """센서 요청을 명령 큐에 넣습니다. 이전 요청의 응답이 아직 없으면 타임아웃으로 셉니다."""
+        with self._lock:
+            if self.request_sent_at is not None:
+                self.response_timeouts += 1
+                if self.response_timeouts == 1 or self.response_timeouts % TIMEOUT_LOG_EVERY == 0:
+                    print(f"{self._log} 센서 응답 없음 (누적 {self.response_timeouts}회)")
+        self.commands.submit("sensor_req")
+
+    def _poll_once(self, is_open, wakeup=None):
+        try:
+            if is_open():
+                self.poll_tick()
+                if wakeup is not None:
+                    wakeup.set()
+        except Exception as e:
+            print(f"{self._log} 센서 요청 오류: {e}")
+
+    def run_poll_loop(self, is_open):
+        """
+        스레드용 센서 요청 루프. 클라이언트 접속 여부와 관계없이 is_open() 이 참이면
+        poll_interval 마다 요청합니다.
+        """
+        next_tick = time.monotonic()
+        while True:
+            self._poll_once(is_open)
+            next_tick = _next_tick(next_tick, self.poll_interval, time.monotonic())
+            time.sleep(max(0.0, next_tick - time.monotonic()))
+            self.loop_lag_ms.observe(max(0.0, time.monotonic() - next_tick) * 1000)
+
+    async def poll_loop(self, is_open, wakeup: asyncio.Event):
+        """asyncio 용 센서 요청 루프. 요청을 넣을 때마다 wakeup 으로 command_loop 를 깨웁니다."""
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while True:
+            self._poll_once(is_open, wakeup)
+            next_tick = _next_tick(next_tick, self.poll_interval, loop.time())
+            await asyncio.sleep(next_tick - loop.time())
+            # 이벤트 루프가 바쁘면 예정 시각보다 늦게 깨어납니다.
+            self.loop_lag_ms.observe(max(0.0, loop.time() - next_tick) * 1000)
+
+    # --------------------------------------------------------
+    # 명령 전송
+    # --------------------------------------------------------
+    def dispatch(self, command) -> bool:
+        """
+        큐에서 꺼낸 명령을 장치로 전송하고 결과를 기록합니다. 센서 요청이면 응답 대기 시각을 기록합니다.
+        쓰기에 실패하면 명령을 실패 처리하고 on_write_error 를 호출한 뒤 False 를 반환합니다.
+        """
+        try:
+            self._write(command.packet)
+        except Exception as e:
+            self.commands.mark_failed(command, str(e))
+            self.write_errors += 1
+            print(f"{self._log} {command.cmd} 쓰기 오류: {e}")
+            if self._on_write_error is not None:
+                self._on_write_error(e)
+            return False
+        self.commands.mark_sent(command)
+        self.bytes_out += len(command.packet)
+        self.command_wait_ms.observe((command.sent_at - command.queued_at) * 1000)
+        if command.cmd == "sensor_req":
+            with self._lock:
+                self.request_sent_at = time.monotonic()
+        else:
+            print(f"{self._log} {command.cmd} 전송: {command.packet.hex()} (대기 {command.to_ack()['wait_ms']} ms)")
+        return True
+
+    def run_command_loop(self, on_done):
+        """스레드용 명령 루프. 명령이 들어오면 최소 간격만 지키고 바로 전송한 뒤 on_done(command) 를 호출합니다."""
+        while True:
+            command = self.commands.get()
+            self.dispatch(command)
+            on_done(command)
+
+    async def command_loop(self, wakeup: asyncio.Event, on_done):
+        """asyncio 용 명령 루프. on_done 은 일반 함수나 코루틴 함수 모두 됩니다."""
+        while True:
+            command, wait = self.commands.pop_due()
+            if command is None:
+                wakeup.clear()
+                try:
+                    await asyncio.wait_for(wakeup.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            self.dispatch(command)
+            await _maybe_await(on_done(command))
+
+    # --------------------------------------------------------
+    # 수신
+    # --------------------------------------------------------
+    def feed(self, data: bytes) -> list:
+        """
+        수신 바이트를 조립하여 02 02 ~ ff ff 센서 프레임이 완성될 때마다 한 번만 파싱합니다.
+        반환값: [{temp, hum, co2, illum, timestamp(epoch 초), response_ms(센서 요청의 응답일 때)}, ...]
+        """
+        self.bytes_in += len(data)
+        readings = []
+        for frame in self.assembler.feed(data):
+            reading = PacketParser.parse_sensor_packet([f"{b:02x}" for b in frame])
+            if reading is None:
+                self.frames_failed += 1
+                continue
+            reading["timestamp"] = time.time()
+            response_ms = self._take_response_ms()
+            if response_ms is not None:
+                reading["response_ms"] = round(response_ms, 1)
+            self.observe_reading(response_ms)
+            readings.append(reading)
+        return readings
+
+    def _take_response_ms(self):
+        with self._lock:
+            sent_at, self.request_sent_at = self.request_sent_at, None
+        return None if sent_at is None else (time.monotonic() - sent_at) * 1000
+
+    def observe_reading(self, response_ms=None):
+        """정상 센서값 하나를 지표에 반영합니다. 다른 프로세스(브로커)가 파싱한 센서값을 받을 때도 사용합니다."""
+        self.frames_parsed += 1
+        if response_ms is not None:
+            self.last_response_ms = response_ms
+            self.response_ms.observe(response_ms)
@@ -0,0 +1,351 @@
+# core/history.py
+import sqlite3
+import struct
+import threading
+import time
+
+from core.constants import (
+    SENSOR_KEYS, HISTORY_DB_FILE, HISTORY_FLUSH_INTERVAL
+)
+
+# ============================================================
+# Helper Functions & Constants
+# ============================================================
+# 롤업 단계: (테이블 접미사, 버킷 크기(초)). 세밀한 단계부터 나열합니다.
+ROLLUP_LEVELS = (("10s", 10), ("1m", 60), ("10m", 600), ("1h", 3600))
+RAW_RETENTION_SEC = 30 * 24 * 3600 # 원시 샘플 보관 기간 (30일)
+DOWNSAMPLE_METHODS = ("lttb", "minmax")
+
+# 바이너리 응답 헤더: 매직(4바이트) + 포인트 수(uint32), 이후 float64 시간 배열과 float32 값 배열
+BINARY_MAGIC = b"AGH1"
+
+
+def lttb(ts: list, vs: list, threshold: int):
+    """
+    LTTB(Largest-Triangle-Three-Buckets) 알고리즘으로 시계열을 threshold 개의 점으로 줄입니다.
+    첫 점과 마지막 점은 항상 유지됩니다.
+    """
+    n = len(ts)
+    if threshold >= n or threshold < 3:
+        return list(ts), list(vs)
+
+    out_t = [ts[0]]
+    out_v = [vs[0]]
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        # 다음 버킷의 평균점
+        avg_start = int((i + 1) * every) + 1
+        avg_end = min(int((i + 2) * every) + 1, n)
+        count = avg_end - avg_start
+        avg_t = sum(ts[avg_start:avg_end]) / count
+        avg_v = sum(vs[avg_start:avg_end]) / count
+
+        # 현재 버킷에서 삼각형 넓이가 가장 큰 점 선택
+        range_start = int(i * every) + 1
+        range_end = int((i + 1) * every) + 1
+        at, av = ts[a], vs[a]
+        max_area = -1.0
+        next_a = range_start
+        for j in range(range_start, range_end):
+            area = abs((at - avg_t) * (vs[j] - av) - (at - ts[j]) * (avg_v - av))
+            if area > max_area:
+                max_area = area
+                next_a = j
+        out_t.append(ts[next_a])
+        out_v.append(vs[next_a])
+        a = next_a
+
+    out_t.append(ts[-1])
+    out_v.append(vs[-1])
+    return out_t, out_v
+
+
+def minmax(ts: list, mins: list, maxs: list, threshold: int):
+    """
+    시계열을 threshold/2 개의 버킷으로 나누고 버킷마다 최소/최대 점을 시간 순으로 남깁니다.
+    원시 데이터는 mins와 maxs에 같은 리스트를 넘깁니다.
+    """
+    n = len(ts)
+    buckets = max(1, threshold // 2)
+    if n <= threshold:
+        out_t, out_v = [], []
+        for t, lo, hi in zip(ts, mins, maxs):
+            out_t.append(t)
+            out_v.append(lo)
+            if hi != lo:
+                out_t.append(t)
+                out_v.append(hi)
+        return out_t, out_v
+
+    out_t, out_v = [], []
+    every = n / buckets
+    for b in range(buckets):
+        start = int(b * every)
+        end = min(int((b + 1) * every), n)
+        if start >= end:
+            continue
+        lo_i = min(range(start, end), key=mins.__getitem__)
+        hi_i = max(range(start, end), key=maxs.__getitem__)
+        if lo_i <= hi_i:
+            out_t += [ts[lo_i], ts[hi_i]]
+            out_v += [mins[lo_i], maxs[hi_i]]
+        else:
+            out_t += [ts[hi_i], ts[lo_i]]
+            out_v += [maxs[hi_i], mins[lo_i]]
+    return out_t, out_v
+
+
+def pack_series(result: dict) -> bytes:
+    """query() 결과를 리틀 엔디언 바이너리(헤더 + float64 시간 + float32 값)로 직렬화합니다."""
+    t, v = result["t"], result["v"]
+    n = len(t)
+    return struct.pack(f"<4sI{n}d{n}f", BINARY_MAGIC, n, *t, *v)
+
+
+# ============================================================
+# Sensor History Class
+# ============================================================
+class SensorHistory:
+    """
+    센서 측정값을 SQLite DB에 저장하고 시간 범위로 조회합니다.
+
+    - samples 테이블: 원시 샘플 (ts 인덱스)
+    - rollup_<단계> 테이블: 버킷별 최소/최대/평균 (bucket 기본키)
+
+    샘플은 메모리에 모았다가 HISTORY_FLUSH_INTERVAL 마다 한 트랜잭션으로 기록하며,
+    조회 시에는 범위와 요청 포인트 수에 맞춰 원시 데이터 또는 롤업을 자동으로 선택한 뒤
+    LTTB 또는 min/max 방식으로 다운샘플링합니다.
+    여러 스레드(GUI, 웹 서버)에서 동시에 사용할 수 있습니다.
+    """
+    def __init__(self, db_path=HISTORY_DB_FILE):
+        self._db_path = db_path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._init_schema()
+
+        self._pending = []
+        # 단계별 진행 중인 버킷 누적값: {단계: {bucket: {key: [min, max, sum, count]}}}
+        self._rollups = {name: {} for name, _ in ROLLUP_LEVELS}
+        self._dirty = {name: set() for name, _ in ROLLUP_LEVELS}
+        self._last_flush = time.monotonic()
+        self._last_prune = 0.0
+        self._last_ts = self._query_last_ts()
+
+    def _init_schema(self):
+        """테이블이 없으면 생성하고 인덱스를 만듭니다."""
+        value_cols = ", ".join(f"{key} REAL" for key in SENSOR_KEYS)
+        rollup_cols = ", ".join(
+            f"{key}_min REAL, {key}_max REAL, {key}_avg REAL, {key}_n INTEGER"
+            for key in SENSOR_KEYS
+        )
+        with self._conn:
+            self._conn.execute(f"CREATE TABLE IF NOT EXISTS samples (ts REAL NOT NULL, {value_cols})")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_samples_ts ON samples(ts)")
+            for name, _ in ROLLUP_LEVELS:
+                self._conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS rollup_{name} (bucket INTEGER PRIMARY KEY, {rollup_cols})"
+                )
+
+    def _query_last_ts(self):
+        row = self._conn.execute("SELECT MAX(ts) FROM samples").fetchone()
+        return row[0] if row and row[0] is not None else 0.0
+
+    # --------------------------------------------------------
+    # 기록
+    # --------------------------------------------------------
+    def append(self, reading: dict):
+        """
+        센서 측정값 하나를 버퍼에 추가하고 롤업 누적값을 갱신합니다.
+        reading에 'timestamp'가 없으면 현재 시간을 사용합니다.
+        """
+        ts = reading.get("timestamp") or time.time()
+        values = [reading.get(key) for key in SENSOR_KEYS]
+
+        with self._lock:
+            self._pending.append((ts, *values))
+            self._last_ts = max(self._last_ts, ts)
+            for name, size in ROLLUP_LEVELS:
+                bucket = int(ts // size) * size
+                acc = self._rollups[name].get(bucket)
+                if acc is None:
+                    acc = self._load_bucket(name, bucket)
+                    self._rollups[name][bucket] = acc
+                for key, value in zip(SENSOR_KEYS, values):
+                    if value is None:
+                        continue
+                    slot = acc[key]
+                    if slot[3] == 0:
+                        slot[0] = slot[1] = value
+                    else:
+                        slot[0] = min(slot[0], value)
+                        slot[1] = max(slot[1], value)
+                    slot[2] += value
+                    slot[3] += 1
+                self._dirty[name].add(bucket)
+
+            if time.monotonic() - self._last_flush >= HISTORY_FLUSH_INTERVAL:
+                self.flush()
+
+    def _load_bucket(self, name, bucket):
+        """이미 DB에 있는 버킷(예: 재시작 전 기록)을 불러와 누적값으로 만듭니다."""
+        acc = {key: [0.0, 0.0, 0.0, 0] for key in SENSOR_KEYS}
+        cols = ", ".join(f"{key}_min, {key}_max, {key}_avg, {key}_n" for key in SENSOR_KEYS)
+        row = self._conn.execute(f"SELECT {cols} FROM rollup_{name} WHERE bucket = ?", (bucket,)).fetchone()
+        if row:
+            for i, key in enumerate(SENSOR_KEYS):
+                lo, hi, avg, n = row[i * 4:i * 4 + 4]
+                if n:
+                    acc[key] = [lo, hi, avg * n, n]
+        return acc
+
+    def flush(self):
+        """버퍼링된 샘플과 변경된 롤업 버킷을 한 트랜잭션으로 DB에 기록합니다."""
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if not self._pending and not any(self._dirty.values()):
+                return
+
+            placeholders = ", ".join("?" * (len(SENSOR_KEYS) + 1))
+            cols = ", ".join(f"{key}_min, {key}_max, {key}_avg, {key}_n" for key in SENSOR_KEYS)
+            rollup_placeholders = ", ".join("?" * (len(SENSOR_KEYS) * 4 + 1))
+            try:
+                with self._conn:
+                    if self._pending:
+                        self._conn.executemany(
+                            f"INSERT INTO samples (ts, {', '.join(SENSOR_KEYS)}) VALUES ({placeholders})",
+                            self._pending
+                        )
+                    for name, _ in ROLLUP_LEVELS:
+                        rows = []
+                        for bucket in self._dirty[name]:
+                            row = [bucket]
+                            for key in SENSOR_KEYS:
+                                lo, hi, total, n = self._rollups[name][bucket][key]
+                                row += [lo, hi, total / n, n] if n else [None, None, None, 0]
+                            rows.append(row)
+                        if rows:
+                            self._conn.executemany(
+                                f"INSERT OR REPLACE INTO rollup_{name} (bucket, {cols}) VALUES ({rollup_placeholders})",
+                                rows
+                            )
+                    self._prune_if_due()
+            except sqlite3.Error as e:
+                print(f"[HISTORY] 이력 저장 오류: {e}")
+                return
+
+            self._pending = []
+            for name, _ in ROLLUP_LEVELS:
+                self._dirty[name].clear()
+                # 진행 중인 최신 버킷만 메모리에 남깁니다.
+                buckets = self._rollups[name]
+                if len(buckets) > 1:
+                    latest = max(buckets)
+                    self._rollups[name] = {latest: buckets[latest]}
+
+    def _prune_if_due(self):
+        """보관 기간이 지난 원시 샘플을 한 시간에 한 번 삭제합니다."""
+        now = time.time()
+        if now - self._last_prune < 3600:
+            return
+        self._last_prune = now
+        self._conn.execute("DELETE FROM samples WHERE ts < ?", (now - RAW_RETENTION_SEC,))
+
+    def close(self):
+        """남은 버퍼를 기록하고 DB 연결을 닫습니다."""
+        with self._lock:
+            self.flush()
+            self._conn.close()
+
+    # --------------------------------------------------------
+    # 조회
+    # --------------------------------------------------------
+    def last_timestamp(self):
+        """
+        마지막 샘플의 시간(epoch 초)을 반환합니다.
+        다른 프로세스(GUI)가 같은 DB에 기록하는 경우도 있으므로 매번 DB의 MAX(ts)를 읽고,
+        이 인스턴스에 아직 기록되지 않은 샘플의 시간과 비교합니다. (ts 인덱스로 바로 찾음)
+        """
+        with self._lock:
+            return max(self._last_ts, self._query_last_ts())
+
+    @staticmethod
+    def choose_source(span: float, points: int):
+        """
+        조회 범위와 요청 포인트 수로 데이터 원본을 고릅니다.
+        요청 포인트 수 이상을 채울 수 있는 가장 거친 롤업을, 없으면 원시 샘플을 사용합니다.
+        반환값: (원본 이름, 버킷 크기 또는 None)
+        """
+        for name, size in reversed(ROLLUP_LEVELS):
+            if span / size >= points:
+                return name, size
+        return "raw", None
+
+    def query(self, sensor: str, start: float, end: float, points: int = 600, method: str = "lttb",
+              flush: bool = True) -> dict:
+        """
+        센서 하나의 [start, end] 구간 이력을 points 개 내외로 다운샘플링하여 반환합니다.
+
+        Args:
+            sensor (str): SENSOR_KEYS 중 하나 (예: 'temp').
+            start (float): 시작 시간 (epoch 초).
+            end (float): 끝 시간 (epoch 초).
+            points (int): 원하는 최대 포인트 수.
+            method (str): 'lttb' 또는 'minmax'.
+            flush (bool): True이면 조회 전에 버퍼를 기록하여 최신 샘플까지 포함합니다.
+                False이면 DB에 이미 기록된 샘플만 읽습니다. (화면 갱신처럼 쓰기 없이 읽어야 할 때)
+
+        Returns:
+            dict: {'sensor', 'start', 'end', 'source', 'method', 't': [...], 'v': [...]}
+        """
+        if sensor not in SENSOR_KEYS:
+            raise ValueError(f"알 수 없는 센서: {sensor}")
+        if method not in DOWNSAMPLE_METHODS:
+            raise ValueError(f"알 수 없는 다운샘플링 방식: {method}")
+        if end < start:
+            start, end = end, start
+        points = max(3, int(points))
+
+        source, size = self.choose_source(end - start, points)
+        with self._lock:
+            if flush and self._pending:
+                self.flush()
+            if source == "raw":
+                rows = self._conn.execute(
+                    f"SELECT ts, {sensor} FROM samples WHERE ts >= ? AND ts <= ? AND {sensor} IS NOT NULL ORDER BY ts",
+                    (start, end)
+                ).fetchall()
+            else:
+                rows = self._conn.execute(
+                    f"SELECT bucket, {sensor}_avg, {sensor}_min, {sensor}_max FROM rollup_{source} "
+                    f"WHERE bucket >= ? AND bucket <= ? AND {sensor}_n > 0 ORDER BY bucket",
+                    (int(start // size) * size, end)
+                ).fetchall()
+
+        if source == "raw":
+            ts = [r[0] for r in rows]
+            vs = [r[1] for r in rows]
+            mins = maxs = vs
+        else:
+            half = size / 2.0
+            ts = [r[0] + half for r in rows]
+            vs = [r[1] for r in rows]
+            mins = [r[2] for r in rows]
+            maxs = [r[3] for r in rows]
+
+        if method == "lttb":
+            out_t, out_v = lttb(ts, vs, points)
+        else:
+            out_t, out_v = minmax(ts, mins, maxs, points)
+
+        return {
+            "sensor": sensor,
+            "start": start,
+            "end": end,
+            "source": source,
+            "method": method,
+            "t": out_t,
+            "v": out_v,
+        }
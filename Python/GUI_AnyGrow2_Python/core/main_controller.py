@@ -3,6 +3,8 @@ from PyQt5.QtCore import QObject, pyqtSignal, QTime, QTimer
 from datetime import datetime
 
 from core.scheduler import Scheduler
+from core.alarm import AlarmEngine, ThresholdRulesFile
+from core.constants import THRESHOLD_RELOAD_INTERVAL_MS
 
 class MainController(QObject):
     """
@@ -15,8 +17,9 @@ class MainController(QObject):
     - 스케줄러를 조정합니다.
     """
     reconnect_signal = pyqtSignal()
+    thresholds_changed = pyqtSignal(dict) # 임계값 규칙 파일이 바뀌어 다시 불러왔을 때 발생 (새 규칙)
 
-    def __init__(self, hardware_manager, hardware_thread, app_state, scheduler, parent=None):
+    def __init__(self, hardware_manager, hardware_thread, app_state, scheduler, history=None, photoperiod=None, parent=None):
         """
         MainController를 초기화합니다.
         
@@ -25,6 +28,8 @@ class MainController(QObject):
             hardware_thread (QThread): 하드웨어 관리자가 실행되는 스레드입니다.
             app_state (AppState): 애플리케이션의 상태를 저장하는 객체입니다.
             scheduler (Scheduler): 예약된 작업을 실행하는 스케줄러입니다.
+            history (SensorHistory): 센서 이력 저장소입니다. None이면 이력을 기록하지 않습니다.
+            photoperiod (PhotoperiodRunner): 광주기 LED 램프 실행기입니다. None이면 사용하지 않습니다.
             parent (QObject): 부모 QObject입니다.
         """
         super().__init__(parent)
@@ -33,6 +38,15 @@ class MainController(QObject):
         self._hardware_thread = hardware_thread
         self._app_state = app_state
         self._scheduler = scheduler
+        self._history = history
+        self._photoperiod = photoperiod
+        self._threshold_file = ThresholdRulesFile()
+        self._alarm_engine = AlarmEngine(self._threshold_file.load())
+
+        # 웹 서버 설정 탭에서 바꾼 임계값을 재시작 없이 반영하도록 규칙 파일의 수정 시각을 주기적으로 확인합니다.
+        self._threshold_timer = QTimer(self)
+        self._threshold_timer.timeout.connect(self._reload_thresholds)
+        self._threshold_timer.start(THRESHOLD_RELOAD_INTERVAL_MS)
 
         self._connect_signals()
         
@@ -42,6 +56,8 @@ class MainController(QObject):
         self._hardware_thread.started.connect(self._hardware_manager.start)
         self.reconnect_signal.connect(self._hardware_manager.reconnect)
         self._scheduler.job_to_execute.connect(self._execute_job)
+        if self._photoperiod is not None:
+            self._photoperiod.step_ready.connect(self._apply_photoperiod_step)
 
     def stop_hardware(self):
         """하드웨어 통신 스레드를 안전하게 중지합니다."""
@@ -54,10 +70,44 @@ class MainController(QObject):
     def _process_sensor_data(self, data: dict):
         """
         하드웨어로부터 들어오는 센서 데이터를 처리합니다.
-        CO2 데이터에 필터를 적용하고 앱 상태를 업데이트합니다.
+        CO2 데이터에 필터를 적용하고 앱 상태를 업데이트한 뒤,
+        임계값 엔진으로 한 번만 평가하여 상태가 바뀐 채널의 알람 이벤트를 앱 상태에 반영합니다.
         """
         processed_data = self._apply_co2_filter(data)
         self._app_state.update_sensor_data(processed_data)
+        for event in self._alarm_engine.evaluate(processed_data):
+            self._app_state.update_alarm(event)
+        if self._history is not None:
+            self._history.append(processed_data)
+
+    def _reload_thresholds(self):
+        """
+        임계값 규칙 파일이 바뀌었으면 알람 엔진의 규칙을 다시 컴파일하고,
+        상태가 바뀐 채널의 알람 이벤트를 앱 상태에 반영한 뒤 thresholds_changed 시그널을 발생시킵니다.
+        """
+        rules = self._threshold_file.reload_if_changed()
+        if rules is None:
+            return
+        try:
+            events = self._alarm_engine.update_rules(rules)
+        except ValueError as e:
+            print(f"임계값 규칙 오류 (기존 규칙 유지): {e}")
+            return
+        print("임계값 규칙 파일이 바뀌어 다시 불러왔습니다.")
+        for event in events:
+            self._app_state.update_alarm(event)
+        self.thresholds_changed.emit(self._alarm_engine.rules)
+
+    def query_history(self, sensor: str, start: float, end: float, points: int = 600, method: str = "lttb") -> dict:
+        """
+        센서 이력을 시간 범위로 조회하여 points 개 내외로 다운샘플링한 결과를 반환합니다.
+        추세 그래프의 작업 스레드에서 호출되므로 버퍼를 기록하지 않고 DB에 있는 샘플만 읽습니다.
+        (아직 기록되지 않은 최근 샘플은 그래프의 메모리 버퍼에 있습니다.)
+        자세한 내용은 SensorHistory.query를 참고하세요.
+        """
+        if self._history is None:
+            return {"sensor": sensor, "start": start, "end": end, "source": None, "method": method, "t": [], "v": []}
+        return self._history.query(sensor, start, end, points, method, flush=False)
         
     def _apply_co2_filter(self, data: dict) -> dict:
         """
@@ -71,6 +121,12 @@ class MainController(QObject):
                 data['co2'] = previous_co2
         return data
 
+    def _apply_photoperiod_step(self, settings: list):
+        """광주기 램프 단계의 채널별 LED 설정을 하드웨어로 보냅니다."""
+        levels = "/".join(str(s['brightness']) for s in settings)
+        print(f"  - 광주기 램프: 채널 밝기 {levels}")
+        self.send_command('channel_led', {'settings': settings})
+
     def send_command(self, command_type: str, params: dict = None):
         """
         하드웨어 관리자에게 명령을 보냅니다.
@@ -0,0 +1,57 @@
+# core/metrics.py
+# Qt 없이 쓰는 지연 히스토그램과 Prometheus 텍스트 형식 도우미 (GUI 워치독, 웹 서버 /metrics 공용)
+
+# ============================================================
+# Helper Functions & Constants
+# ============================================================
+# 지연 히스토그램 구간 상한 (ms). 마지막 구간은 무한대.
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+def histogram_lines(name: str, snapshot: dict, labels: str = "") -> list:
+    """
+    LatencyHistogram.snapshot() 을 Prometheus histogram 샘플 줄(_bucket, _sum, _count)로 변환합니다.
+    labels 는 'thread="GUI"' 처럼 중괄호 없이 넘깁니다. HELP/TYPE 줄은 호출하는 쪽에서 씁니다.
+    """
+    prefix = f"{labels}," if labels else ""
+    lines = []
+    for bound, count in snapshot["buckets"]:
+        le = "+Inf" if bound == float("inf") else f"{bound:g}"
+        lines.append(f'{name}_bucket{{{prefix}le="{le}"}} {count}')
+    suffix = f"{{{labels}}}" if labels else ""
+    lines.append(f"{name}_sum{suffix} {snapshot['sum_ms']:.3f}")
+    lines.append(f"{name}_count{suffix} {snapshot['count']}")
+    return lines
+
+
+# ============================================================
+# Latency Histogram Class
+# ============================================================
+class LatencyHistogram:
+    """누적 버킷 히스토그램 (Prometheus histogram과 같은 의미의 le 구간)."""
+    def __init__(self, bounds=LATENCY_BUCKETS_MS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, ms: float):
+        for i, bound in enumerate(self.bounds):
+            if ms <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    def snapshot(self) -> dict:
+        """{"buckets": [(상한, 누적 개수), ...], "count", "sum_ms", "max_ms"} 를 반환합니다."""
+        cumulative, running = [], 0
+        for bound, n in zip(self.bounds + (float("inf"),), list(self.counts)):
+            running += n
+            cumulative.append((bound, running))
+        return {"buckets": cumulative, "count": self.count, "sum_ms": self.total, "max_ms": self.max}
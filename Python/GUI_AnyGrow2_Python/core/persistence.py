@@ -0,0 +1,129 @@
+# core/persistence.py
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+def atomic_write(path: str, data: bytes):
+    """
+    임시 파일에 쓰고 fsync한 뒤 os.replace로 교체합니다.
+    쓰는 도중 전원이 꺼져도 기존 파일 또는 새 파일 중 하나는 온전하게 남습니다.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    if hasattr(os, "O_DIRECTORY"):
+        # 이름 변경 자체도 디스크에 기록되도록 디렉터리를 fsync합니다. (POSIX 전용)
+        fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+# ============================================================
+# Debounced JSON Writer Class
+# ============================================================
+class DebouncedJsonWriter:
+    """
+    JSON 데이터를 백그라운드 스레드에서 파일로 저장합니다.
+    debounce(초) 안에 연속으로 들어온 요청은 마지막 것 하나로 합쳐지고,
+    직렬화 결과가 마지막으로 저장한 내용과 같으면 쓰기를 건너뜁니다.
+    submit(before_write=...)로 넘긴 작업은 합쳐지지 않고, 다음 저장 직전에 같은 스레드에서 순서대로 실행됩니다.
+    """
+    def __init__(self, path: str, debounce: float = 1.0, name: str = "JsonWriter"):
+        self._path = path
+        self._debounce = debounce
+        self._cond = threading.Condition()
+        self._pending = None
+        self._pending_since = 0.0
+        self._before_write = []
+        self._flush_requested = False
+        self._running = True
+        self._last_digest = self._file_digest()
+
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _file_digest(self):
+        try:
+            with open(self._path, 'rb') as f:
+                return hashlib.sha1(f.read()).digest()
+        except OSError:
+            return None
+
+    def submit(self, data, before_write=None):
+        """
+        저장할 데이터를 제출합니다. 호출자는 이후 data를 변경하지 않아야 합니다. (스냅샷 전달)
+        before_write는 이 파일을 쓰기 전에 저장 스레드에서 먼저 실행할 함수입니다. (예: 보관 파일 덧붙이기)
+        """
+        with self._cond:
+            self._pending = data
+            if before_write is not None:
+                self._before_write.append(before_write)
+            self._pending_since = time.monotonic()
+            self._cond.notify()
+
+    def flush(self, timeout: float = 5.0):
+        """대기 중인 데이터를 즉시 저장하고 완료될 때까지 기다립니다."""
+        with self._cond:
+            if self._pending is None:
+                return
+            self._flush_requested = True
+            self._cond.notify()
+            self._cond.wait_for(lambda: self._pending is None, timeout)
+
+    def close(self):
+        """대기 중인 데이터를 저장하고 스레드를 종료합니다."""
+        self.flush()
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self._thread.join(timeout=5.0)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running and self._pending is None:
+                    self._cond.wait()
+                if self._pending is None:
+                    return
+                # 마지막 요청 이후 debounce 시간이 지나거나 flush가 요청될 때까지 기다립니다.
+                while self._running and not self._flush_requested:
+                    remaining = self._pending_since + self._debounce - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                data = self._pending
+                tasks, self._before_write = self._before_write, []
+
+            for task in tasks:
+                try:
+                    task()
+                except Exception as e:
+                    print(f"[PERSIST] {self._path} 저장 전 작업 오류: {e}")
+            self._write(data)
+
+            with self._cond:
+                if self._pending is data:
+                    self._pending = None
+                self._flush_requested = False
+                self._cond.notify_all()
+
+    def _write(self, data):
+        try:
+            payload = json.dumps(data, ensure_ascii=False, indent=4).encode('utf-8')
+            digest = hashlib.sha1(payload).digest()
+            if digest == self._last_digest:
+                return
+            atomic_write(self._path, payload)
+            self._last_digest = digest
+            print(f"[PERSIST] {self._path} 저장 완료 ({len(payload)} bytes)")
+        except Exception as e:
+            print(f"[PERSIST] {self._path} 저장 오류: {e}")
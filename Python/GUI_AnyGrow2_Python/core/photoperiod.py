@@ -0,0 +1,192 @@
+# core/photoperiod.py
+import bisect
+import json
+import os
+from datetime import datetime, timedelta
+from PyQt5.QtCore import Qt, QObject, pyqtSignal, QTimer
+
+from core.constants import COMMAND_INTERVAL, PHOTOPERIOD_FILE, PHOTOPERIOD_MIN_STEP
+from core.schedule_store import minutes_from_text
+
+# ============================================================
+# Helper Functions & Constants
+# ============================================================
+# 작물별 권장 광주기 (최소, 최대 시간). ui/constants.py의 CROP_INFO와 같은 키를 사용합니다.
+CROP_PHOTOPERIODS = {
+    "lettuce": (14, 16),
+    "basil": (16, 16),
+    "cherry_tomato": (14, 16),
+    "strawberry": (12, 16),
+}
+
+CHANNEL_COUNT = 4
+SECONDS_PER_DAY = 24 * 60 * 60
+
+# photoperiod.json 예시 (없으면 광주기 제어를 사용하지 않습니다):
+# {"enabled": true, "crop": "lettuce", "lights_on": "06:00", "hours": 16,
+#  "ramp_minutes": 30, "peak": [100, 100, 80, 60], "hz": [1, 1, 1, 1], "stagger_minutes": 5}
+DEFAULT_PHOTOPERIOD = {
+    "enabled": False,
+    "crop": "lettuce",
+    "lights_on": "06:00",
+    "hours": None,          # None이면 작물 권장 광주기의 최대값
+    "ramp_minutes": 30,
+    "peak": [100] * CHANNEL_COUNT,
+    "hz": [1] * CHANNEL_COUNT,
+    "stagger_minutes": 0,   # 채널마다 일출은 이만큼 늦게, 일몰은 이만큼 일찍 (스펙트럼 순차 점등)
+}
+
+
+def load_photoperiod_config(path=PHOTOPERIOD_FILE) -> dict:
+    """광주기 설정을 불러와 기본값과 합칩니다."""
+    config = dict(DEFAULT_PHOTOPERIOD)
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                config.update(json.load(f))
+        except Exception as e:
+            print(f"광주기 설정 불러오기 오류: {e}")
+    return config
+
+
+def _smoothstep(x: float) -> float:
+    return x * x * (3 - 2 * x)
+
+
+class PhotoperiodPlan:
+    """
+    하루의 일출/일몰 밝기 곡선을 채널별로 계산하고,
+    PHOTOPERIOD_MIN_STEP 간격으로 양자화한 channel_led 명령 목록으로 컴파일합니다.
+    밝기(정수 %)가 바뀌지 않는 단계는 목록에 넣지 않습니다.
+    """
+    def __init__(self, config: dict):
+        hours = config.get("hours") or CROP_PHOTOPERIODS.get(config.get("crop"), (16, 16))[1]
+        self.start = minutes_from_text(config["lights_on"]) * 60
+        self.length = int(float(hours) * 3600)
+        self.ramp = max(1, int(config.get("ramp_minutes", 30) * 60))
+        self.peak = [max(0, min(100, int(p))) for p in config.get("peak", [100] * CHANNEL_COUNT)]
+        self.hz = [int(h) for h in config.get("hz", [1] * CHANNEL_COUNT)]
+        self.stagger = int(config.get("stagger_minutes", 0) * 60)
+        if len(self.peak) != CHANNEL_COUNT or len(self.hz) != CHANNEL_COUNT:
+            raise ValueError("peak/hz는 채널 4개 값이어야 합니다.")
+        # 명령 큐를 채우지 않도록 단계 간격은 명령 간격보다 충분히 길게 유지합니다.
+        self.step = max(PHOTOPERIOD_MIN_STEP, COMMAND_INTERVAL * 10)
+
+    def _profile(self, t: float, channel: int) -> float:
+        """광주기 시작 기준 t초의 밝기 비율(0~1). 자정을 넘는 광주기는 호출자가 처리합니다."""
+        offset = channel * self.stagger
+        begin, end = self.start + offset, self.start + self.length - offset
+        if t <= begin or t >= end:
+            return 0.0
+        ramp = min(self.ramp, (end - begin) / 2)
+        if t < begin + ramp:
+            return _smoothstep((t - begin) / ramp)
+        if t > end - ramp:
+            return _smoothstep((end - t) / ramp)
+        return 1.0
+
+    def levels_at(self, seconds_of_day: float) -> tuple:
+        """자정 이후 초에서의 채널별 밝기(정수 %)를 반환합니다. 전날 시작해 자정을 넘긴 광주기도 포함합니다."""
+        return tuple(
+            round(self.peak[ch] * max(self._profile(seconds_of_day, ch),
+                                      self._profile(seconds_of_day + SECONDS_PER_DAY, ch)))
+            for ch in range(CHANNEL_COUNT)
+        )
+
+    def settings_for(self, levels: tuple) -> list:
+        """밝기 튜플을 PacketBuilder.channel_led 형식의 설정 목록으로 변환합니다."""
+        return [{"on": level > 0, "hz": self.hz[ch], "brightness": level} for ch, level in enumerate(levels)]
+
+    def _sample_times(self) -> list:
+        """
+        밝기가 변할 수 있는 램프 구간 안의 격자 시각만 모읍니다. (구간 밖은 밝기가 일정)
+        """
+        times = {0.0}
+        for ch in range(CHANNEL_COUNT):
+            offset = ch * self.stagger
+            begin, end = self.start + offset, self.start + self.length - offset
+            ramp = min(self.ramp, (end - begin) / 2)
+            for a, b in ((begin, begin + ramp), (end - ramp, end)):
+                for shift in (0, -SECONDS_PER_DAY):
+                    lo, hi = max(0, a + shift), min(SECONDS_PER_DAY - 1, b + shift + self.step)
+                    k = int(lo // self.step)
+                    while k * self.step <= hi:
+                        times.add(k * self.step)
+                        k += 1
+        return sorted(times)
+
+    def compile_day(self) -> list:
+        """
+        하루치 [(자정 이후 초, 밝기 튜플), ...]을 만듭니다.
+        첫 항목은 자정의 상태이며, 이후에는 밝기가 바뀌는 단계만 포함합니다.
+        """
+        steps = []
+        previous = None
+        for t in self._sample_times():
+            levels = self.levels_at(t)
+            if levels != previous:
+                steps.append((t, levels))
+                previous = levels
+        return steps
+
+
+# ============================================================
+# Photoperiod Runner Class
+# ============================================================
+class PhotoperiodRunner(QObject):
+    """
+    하루에 한 번 광주기 램프를 미리 계산하고, 다음 단계 시각에 맞춰 단발성 타이머로 channel_led 설정을 내보냅니다.
+    시작하거나 설정이 바뀌면 현재 시각의 밝기를 즉시 한 번 보냅니다.
+    """
+    step_ready = pyqtSignal(list)  # PacketBuilder.channel_led 설정 목록
+
+    def __init__(self, config: dict = None, parent=None):
+        super().__init__(parent)
+        self._plan = None
+        self._steps = []
+        self._step_times = []
+        self._day = None
+        self._last_sent = None
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._on_timer)
+        self.apply_config(config if config is not None else load_photoperiod_config())
+
+    def apply_config(self, config: dict):
+        """설정을 적용합니다. enabled가 아니면 타이머를 멈춥니다."""
+        self._timer.stop()
+        self._plan = None
+        self._day = None
+        self._last_sent = None
+        if not config.get("enabled"):
+            return
+        try:
+            self._plan = PhotoperiodPlan(config)
+        except (KeyError, ValueError) as e:
+            print(f"[PHOTOPERIOD] 잘못된 광주기 설정: {e}")
+            return
+        self._timer.start(0)
+
+    def _on_timer(self):
+        now = datetime.now()
+        if now.date() != self._day:
+            self._day = now.date()
+            self._steps = self._plan.compile_day()
+            self._step_times = [t for t, _ in self._steps]
+            print(f"[PHOTOPERIOD] {self._day} 램프 {len(self._steps)}단계 계산 완료")
+
+        seconds = (now - datetime.combine(self._day, datetime.min.time())).total_seconds()
+        index = bisect.bisect_right(self._step_times, seconds) - 1
+        levels = self._steps[index][1]
+        if levels != self._last_sent:
+            self._last_sent = levels
+            self.step_ready.emit(self._plan.settings_for(levels))
+
+        if index + 1 < len(self._steps):
+            wait = self._step_times[index + 1] - seconds
+        else:
+            midnight = datetime.combine(self._day + timedelta(days=1), datetime.min.time())
+            wait = (midnight - now).total_seconds()
+        self._timer.start(max(0, int(wait * 1000)) + 5)
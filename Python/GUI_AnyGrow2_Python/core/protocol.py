@@ -1,7 +1,6 @@
 # core/protocol.py
 import time
 from datetime import datetime
-from PyQt5.QtCore import QTime
 
 # ============================================================
 # Helper Functions & Constants
@@ -51,6 +50,60 @@ class PacketParser:
             "illum": i_raw
         }
 
+# ============================================================
+# Frame Assembler Class
+# ============================================================
+FRAME_LEN = 30
+# 장치의 센서 응답은 "02,02,..." 로 시작해 "...,ff,ff" 로 끝납니다.
+# (기존 anygrow2_client.js / Anygrow2ClientLogic.java 가 "ff,ff" 를 패킷 끝으로 사용)
+# PacketBuilder 명령의 끝 바이트 0x03 과는 다르므로 수신 프레임에는 쓰지 않습니다.
+FRAME_HEADER = b"\x02\x02"
+FRAME_TRAILER = b"\xff\xff"
+
+class FrameAssembler:
+    """
+    끊어서 들어오는 수신 바이트를 02 02 로 시작하고 ff ff 로 끝나는
+    30바이트 센서 프레임 단위로 다시 조립합니다. (PacketParser 가 확인하는 머리말/길이와 같음)
+    프레임 앞의 잡음 바이트나 깨진 프레임은 버리고 다음 머리말부터 다시 찾습니다.
+    """
+    def __init__(self, frame_len=FRAME_LEN):
+        self.frame_len = frame_len
+        self._buffer = bytearray()
+        self.frames = 0         # 완성된 프레임 수
+        self.discarded = 0      # 버린 바이트 수
+
+    def feed(self, data: bytes):
+        """수신 바이트를 추가하고, 완성된 프레임(bytes) 목록을 반환합니다."""
+        buf = self._buffer
+        buf += data
+        frames = []
+        while True:
+            start = buf.find(FRAME_HEADER)
+            if start < 0:
+                # 머리말의 첫 바이트일 수 있는 마지막 0x02 는 남겨 둡니다.
+                keep = 1 if buf.endswith(FRAME_HEADER[:1]) else 0
+                self.discarded += len(buf) - keep
+                del buf[:len(buf) - keep]
+                break
+            if start:
+                self.discarded += start
+                del buf[:start]
+            if len(buf) < self.frame_len:
+                break
+            if buf[self.frame_len - len(FRAME_TRAILER):self.frame_len] != FRAME_TRAILER:
+                # 길이 위치에 끝 표시가 없으면 이 머리말은 프레임 시작이 아님
+                self.discarded += 1
+                del buf[:1]
+                continue
+            frames.append(bytes(buf[:self.frame_len]))
+            del buf[:self.frame_len]
+        self.frames += len(frames)
+        return frames
+
+    def reset(self):
+        """조립 중인 바이트를 버립니다. (포트 재연결 시)"""
+        self._buffer.clear()
+
 # ============================================================
 # Packet Builder Class
 # ============================================================
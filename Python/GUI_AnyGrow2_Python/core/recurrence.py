@@ -0,0 +1,225 @@
+# core/recurrence.py
+from datetime import date, datetime, timedelta
+
+from core.constants import WEEKDAYS_MAP
+from core.schedule_store import minutes_from_text
+
+# ============================================================
+# Helper Functions & Constants
+# ============================================================
+# 반복 규칙은 schedules.json의 "rules" 목록에 저장됩니다. 예:
+# {"name": "2시간마다 급액", "target": "양액 펌프", "action": "켜기 (ON)",
+#  "days": "평일", "start": "06:00", "end": "22:00", "every": 120,
+#  "from": "2026-03-01", "until": "2026-06-30", "except": ["2026-05-05"]}
+# {"name": "소등", "target": "전체 LED", "action": "끄기 (OFF)", "cron": "0 22 * * 1-5"}
+#
+# days  : 요일 이름 목록 또는 "매일"/"평일"/"주말" (기본값: 매일)
+# times : 실행 시각 목록 ["08:00", ...] / start, end, every(분) : 구간 안에서 일정 간격
+# cron  : "분 시 * * 요일" (일·월 필드는 "*"만 지원, 요일 0/7=일요일)
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+DAY_BITS = (1 << MINUTES_PER_DAY) - 1
+
+_DAY_KEYWORDS = {
+    "매일": range(7), "daily": range(7),
+    "평일": range(5), "weekdays": range(5),
+    "주말": range(5, 7), "weekends": range(5, 7),
+}
+
+
+def _parse_days(days) -> list:
+    if days is None:
+        return list(range(7))
+    if isinstance(days, str):
+        if days not in _DAY_KEYWORDS:
+            raise ValueError(f"알 수 없는 요일 지정: {days}")
+        return list(_DAY_KEYWORDS[days])
+    return sorted({WEEKDAYS_MAP.index(day) for day in days})
+
+
+def _parse_cron_field(field: str, low: int, high: int) -> set:
+    """cron 필드 하나('*', '*/n', 'a-b', 'a-b/n', 'a,b')를 값 집합으로 변환합니다."""
+    values = set()
+    for part in field.split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/")
+            step = int(step_text)
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start, end = (int(v) for v in part.split("-"))
+        else:
+            start = end = int(part)
+        if start < low or end > high or step < 1:
+            raise ValueError(f"cron 필드 범위 오류: {field}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+def _parse_cron(expr: str):
+    """'분 시 * * 요일' 형식을 (자정 이후 분 목록, 요일 인덱스 목록)으로 변환합니다."""
+    fields = expr.split()
+    if len(fields) != 5 or fields[2] != "*" or fields[3] != "*":
+        raise ValueError(f"지원하지 않는 cron 형식: {expr}")
+    minutes = _parse_cron_field(fields[0], 0, 59)
+    hours = _parse_cron_field(fields[1], 0, 23)
+    # cron 요일(0/7=일요일)을 WEEKDAYS_MAP 인덱스(0=월요일)로 변환
+    days = {(d - 1) % 7 for d in _parse_cron_field(fields[4], 0, 7)}
+    return sorted(h * 60 + m for h in hours for m in minutes), sorted(days)
+
+
+def _parse_date(text):
+    return datetime.strptime(text, "%Y-%m-%d").date() if text else None
+
+
+# ============================================================
+# Compiled Rule Class
+# ============================================================
+class CompiledRule:
+    """
+    반복 규칙 하나를 주 단위 비트마스크(10080비트, 비트 i = 월요일 00:00부터 i분)로 컴파일한 결과입니다.
+    날짜 범위(from/until)와 예외 날짜(except)는 주마다 해당 요일 구간을 지우는 방식으로 적용합니다.
+    """
+    __slots__ = ("name", "target", "action", "mask", "first", "last", "exceptions")
+
+    def __init__(self, spec: dict):
+        self.name = spec.get("name", "")
+        self.target = spec["target"]
+        self.action = spec["action"]
+
+        if "cron" in spec:
+            minutes, days = _parse_cron(spec["cron"])
+        else:
+            days = _parse_days(spec.get("days"))
+            if "times" in spec:
+                minutes = sorted(minutes_from_text(t) for t in spec["times"])
+            else:
+                start = minutes_from_text(spec.get("start", "00:00"))
+                end = minutes_from_text(spec.get("end", "23:59"))
+                every = int(spec["every"])
+                if every < 1 or end < start:
+                    raise ValueError(f"잘못된 반복 구간: {spec}")
+                minutes = range(start, end + 1, every)
+
+        day_pattern = 0
+        for minute in minutes:
+            if not 0 <= minute < MINUTES_PER_DAY:
+                raise ValueError(f"잘못된 시각: {minute}")
+            day_pattern |= 1 << minute
+        mask = 0
+        for day in days:
+            mask |= day_pattern << (day * MINUTES_PER_DAY)
+
+        self.mask = mask
+        self.first = _parse_date(spec.get("from"))
+        self.last = _parse_date(spec.get("until"))
+        self.exceptions = frozenset(_parse_date(d) for d in spec.get("except", []))
+
+    @property
+    def has_date_limits(self) -> bool:
+        return self.first is not None or self.last is not None or bool(self.exceptions)
+
+    def valid_on(self, day: date) -> bool:
+        if self.first and day < self.first: return False
+        if self.last and day > self.last: return False
+        return day not in self.exceptions
+
+    def mask_for_week(self, week_start: date) -> int:
+        """week_start(월요일)부터 7일 동안 유효한 비트마스크를 반환합니다."""
+        if not self.has_date_limits:
+            return self.mask
+        mask = self.mask
+        for day_index in range(7):
+            if not self.valid_on(week_start + timedelta(days=day_index)):
+                mask &= ~(DAY_BITS << (day_index * MINUTES_PER_DAY))
+        return mask
+
+
+# ============================================================
+# Recurrence Set Class
+# ============================================================
+class RecurrenceSet:
+    """
+    반복 규칙들을 (대상, 동작)별 비트마스크로 묶습니다.
+    "지금 실행할 것"은 비트 검사 한 번, "다음 실행 시각"은 최하위 비트 탐색으로 계산합니다.
+    주별 마스크는 처음 요청될 때 계산하여 캐시합니다.
+    """
+    MAX_SCAN_WEEKS = 53
+
+    def __init__(self, rules: list = None):
+        self.specs = list(rules or [])
+        self._rules = []
+        for spec in self.specs:
+            if not spec.get("enabled", True):
+                continue
+            try:
+                self._rules.append(CompiledRule(spec))
+            except (KeyError, ValueError) as e:
+                print(f"[SCHEDULER] 잘못된 반복 규칙을 건너뜁니다: {spec} ({e})")
+        self._names = {}
+        for rule in self._rules:
+            self._names.setdefault((rule.target, rule.action), []).append(rule.name)
+        self._week_cache = {}
+
+    def __bool__(self):
+        return bool(self._rules)
+
+    def week_masks(self, week_start: date) -> dict:
+        """{(대상, 동작): 비트마스크} 를 반환합니다. week_start는 월요일이어야 합니다."""
+        masks = self._week_cache.get(week_start)
+        if masks is None:
+            masks = {}
+            for rule in self._rules:
+                key = (rule.target, rule.action)
+                masks[key] = masks.get(key, 0) | rule.mask_for_week(week_start)
+            if len(self._week_cache) > 8:
+                self._week_cache.clear()
+            self._week_cache[week_start] = masks
+        return masks
+
+    @staticmethod
+    def _position(dt: datetime):
+        week_start = dt.date() - timedelta(days=dt.weekday())
+        return week_start, dt.weekday() * MINUTES_PER_DAY + dt.hour * 60 + dt.minute
+
+    def fires_at(self, dt: datetime) -> list:
+        """dt가 속한 분에 실행되는 (대상, 동작) 목록을 반환합니다."""
+        week_start, minute = self._position(dt)
+        return [key for key, mask in self.week_masks(week_start).items() if (mask >> minute) & 1]
+
+    def next_fire(self, dt: datetime):
+        """dt 이후(dt가 속한 분 제외) 가장 가까운 실행 시각과 (대상, 동작) 목록을 반환합니다. 없으면 None."""
+        week_start, minute = self._position(dt)
+        for _ in range(self.MAX_SCAN_WEEKS):
+            best, keys = None, []
+            for key, mask in self.week_masks(week_start).items():
+                rest = mask >> (minute + 1)
+                if not rest:
+                    continue
+                offset = minute + 1 + (rest & -rest).bit_length() - 1
+                if best is None or offset < best:
+                    best, keys = offset, [key]
+                elif offset == best:
+                    keys.append(key)
+            if best is not None:
+                return datetime.combine(week_start, datetime.min.time()) + timedelta(minutes=best), keys
+            week_start += timedelta(days=7)
+            minute = -1
+        return None
+
+    def jobs_on(self, day: date) -> list:
+        """해당 날짜에 실행되는 작업 목록을 스케줄러 작업 형식(time = 자정 이후 분)으로 반환합니다."""
+        week_start = day - timedelta(days=day.weekday())
+        shift = day.weekday() * MINUTES_PER_DAY
+        jobs = []
+        for key, mask in self.week_masks(week_start).items():
+            bits = (mask >> shift) & DAY_BITS
+            name = ", ".join(n for n in self._names[key] if n) or "반복 예약"
+            while bits:
+                low = bits & -bits
+                jobs.append({"name": name, "time": low.bit_length() - 1,
+                             "target": key[0], "action": key[1], "rule": True})
+                bits ^= low
+        jobs.sort(key=lambda job: job["time"])
+        return jobs
@@ -0,0 +1,196 @@
+# core/schedule_store.py
+import json
+import os
+from datetime import date, datetime, timedelta
+
+from core.constants import WEEKDAYS_MAP, SCHEDULE_FILE, SCHEDULE_ARCHIVE_FILE, DAILY_KEEP_DAYS
+
+# ============================================================
+# Helper Functions & Constants
+# ============================================================
+# 메모리에서는 작업 시간을 자정 이후 분(int)으로 다루고,
+# 파일에는 기존과 호환되도록 "HH:MM" 문자열로 저장합니다.
+_JOB_CATEGORIES = ('weekly', 'daily', 'templates')
+
+
+def minutes_from_text(text: str) -> int:
+    """
+    'HH:MM' 문자열을 자정 이후 분으로 변환합니다. 'HH:MM:SS'는 초를 버립니다.
+    형식이 잘못되었으면 ValueError를 발생시킵니다.
+    """
+    parts = text.strip().split(":")
+    if len(parts) not in (2, 3) or not all(p.strip().isdigit() for p in parts):
+        raise ValueError(f"잘못된 시간 형식: {text!r} (HH:MM)")
+    hour, minute = int(parts[0]), int(parts[1])
+    if hour > 23 or minute > 59:
+        raise ValueError(f"잘못된 시간: {text!r}")
+    return hour * 60 + minute
+
+
+def minutes_to_text(minutes: int) -> str:
+    """자정 이후 분을 'HH:MM' 문자열로 변환합니다."""
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def empty_schedules() -> dict:
+    return {
+        "weekly": {day: [] for day in WEEKDAYS_MAP},
+        "daily": {},
+        "templates": {}
+    }
+
+
+def _convert_jobs(schedules: dict, convert) -> dict:
+    """
+    작업 목록이 들어 있는 범주만 새 딕셔너리로 만들고 나머지 값은 그대로 둡니다.
+    convert가 None을 반환한 작업은 목록에서 제외합니다.
+    """
+    result = dict(schedules)
+    for category_key in _JOB_CATEGORIES:
+        category = schedules.get(category_key, {})
+        if not isinstance(category, dict): continue
+        result[category_key] = {
+            key: _convert_list(day_list, convert) if isinstance(day_list, list) else day_list
+            for key, day_list in category.items()
+        }
+    return result
+
+
+def _convert_list(jobs: list, convert) -> list:
+    converted = (convert(job) for job in jobs)
+    return [job for job in converted if job is not None]
+
+
+def _job_from_disk(job: dict):
+    """
+    파일의 작업 하나를 메모리 형식으로 변환합니다.
+    시간이 잘못된 작업은 로그를 남기고 None을 반환하여, 작업 하나 때문에 전체 로딩이 실패하지 않게 합니다.
+    """
+    try:
+        job = dict(job)
+        if isinstance(job.get("time"), str):
+            job["time"] = minutes_from_text(job["time"])
+    except (TypeError, ValueError) as e:
+        print(f"[SCHEDULE] 잘못된 예약을 건너뜁니다: {job!r} ({e})")
+        return None
+    return job
+
+
+def _job_to_disk(job: dict) -> dict:
+    job = dict(job)
+    if isinstance(job.get("time"), int):
+        job["time"] = minutes_to_text(job["time"])
+    return job
+
+
+# ============================================================
+# Schedule Store Class
+# ============================================================
+class ScheduleStore:
+    """
+    schedules.json과 지난 "오늘" 예약 보관 파일(JSON Lines)을 관리합니다.
+    최근 DAILY_KEEP_DAYS일과 앞으로의 "오늘" 예약만 메인 파일에 두고,
+    그보다 오래된 날짜는 보관 파일 끝에 덧붙이므로 로드/저장 비용이 기록 기간에 따라 늘어나지 않습니다.
+    보관 파일은 필요할 때만(load_archive) 읽습니다.
+    """
+    def __init__(self, path=SCHEDULE_FILE, archive_path=SCHEDULE_ARCHIVE_FILE, keep_days=DAILY_KEEP_DAYS):
+        self.path = path
+        self.archive_path = archive_path
+        self.keep_days = keep_days
+        self._archive = None  # 지연 로딩 캐시 {날짜: [작업, ...]}
+        self._unwritten = {}  # 캐시를 읽기 전에 take_stale로 꺼낸 항목 (load_archive에서 합침)
+
+    def load(self) -> dict:
+        """
+        예약 파일을 읽어 시간 문자열을 분(int)으로 변환합니다.
+        파일이 없으면 None을 반환하고, 읽기에 실패하면 예외를 그대로 전달합니다.
+        """
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, 'r', encoding='utf-8') as f:
+            loaded = json.load(f)
+        if not isinstance(loaded, dict):
+            raise ValueError("예약 파일의 최상위 값이 객체가 아닙니다.")
+        return _convert_jobs(loaded, _job_from_disk)
+
+    def backup_unreadable(self) -> str:
+        """
+        읽을 수 없는 예약 파일을 '<파일>.bad-<시각>'으로 옮겨 보존합니다.
+        이후 저장이 원본을 빈 예약으로 덮어쓰지 않게 합니다. 옮긴 경로를 반환합니다.
+        """
+        backup = f"{self.path}.bad-{datetime.now():%Y%m%d-%H%M%S}"
+        os.replace(self.path, backup)
+        return backup
+
+    @staticmethod
+    def snapshot(schedules: dict) -> dict:
+        """
+        저장용 스냅샷을 만듭니다. 시간은 "HH:MM" 문자열로 바꾸고 비어 있는 "오늘" 예약은 제외합니다.
+        반환된 딕셔너리는 원본과 작업 딕셔너리를 공유하지 않으므로 다른 스레드에서 직렬화해도 안전합니다.
+        """
+        result = _convert_jobs(schedules, _job_to_disk)
+        if isinstance(result.get("daily"), dict):
+            result["daily"] = {day: jobs for day, jobs in result["daily"].items() if jobs}
+        return result
+
+    def take_stale(self, schedules: dict, today: date = None) -> dict:
+        """
+        keep_days보다 오래된 "오늘" 예약을 schedules에서 꺼내 {날짜: [작업, ...]}으로 반환합니다.
+        메모리만 바꾸므로 GUI 스레드에서 호출해도 됩니다. 보관 파일 쓰기는 append_archive로 따로 합니다.
+        """
+        daily = schedules.get("daily")
+        if not isinstance(daily, dict):
+            return {}
+        cutoff = ((today or date.today()) - timedelta(days=self.keep_days)).strftime("%Y-%m-%d")
+        stale = sorted(day for day in daily if day < cutoff)
+        if not stale:
+            return {}
+
+        archived = {day: daily.pop(day) for day in stale}
+        kept = {day: jobs for day, jobs in archived.items() if jobs}
+        # 보관 파일에 쓰이기 전에 load_archive가 불려도 빠지지 않도록 캐시에 먼저 반영합니다.
+        if self._archive is not None:
+            self._archive.update(kept)
+        else:
+            self._unwritten.update(kept)
+        print(f"[SCHEDULE] 지난 '오늘' 예약 {len(stale)}일치를 보관합니다. ({stale[0]} ~ {stale[-1]})")
+        return archived
+
+    def append_archive(self, archived: dict):
+        """take_stale 결과를 보관 파일 끝에 덧붙이고 fsync합니다. (파일 I/O이므로 GUI 스레드 밖에서 호출)"""
+        lines = [json.dumps({"date": day, "jobs": [_job_to_disk(job) for job in jobs]}, ensure_ascii=False)
+                 for day, jobs in archived.items() if jobs]
+        if not lines:
+            return
+        with open(self.archive_path, 'a', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def compact(self, schedules: dict, today: date = None) -> int:
+        """
+        take_stale과 append_archive를 차례로 실행합니다. (로딩 스레드용)
+        보관한 날짜 수를 반환합니다. 0보다 크면 호출자가 schedules를 다시 저장해야 합니다.
+        """
+        archived = self.take_stale(schedules, today)
+        if archived:
+            self.append_archive(archived)
+        return len(archived)
+
+    def load_archive(self) -> dict:
+        """보관된 지난 "오늘" 예약을 {날짜: [작업, ...]}으로 반환합니다. 처음 호출할 때만 파일을 읽습니다."""
+        if self._archive is None:
+            self._archive = {}
+            if os.path.exists(self.archive_path):
+                with open(self.archive_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line: continue
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            continue  # 쓰는 도중 끊긴 마지막 줄
+                        self._archive[entry["date"]] = _convert_list(entry["jobs"], _job_from_disk)
+            self._archive.update(self._unwritten)
+            self._unwritten = {}
+        return self._archive
@@ -1,131 +1,265 @@
 # core/scheduler.py
-import json
-import os
-import copy
-from datetime import datetime
-from PyQt5.QtCore import QObject, pyqtSignal, QTime, QTimer
+import bisect
+import threading
+from datetime import datetime, date, timedelta
+from PyQt5.QtCore import Qt, QObject, pyqtSignal, QTimer
+
+from core.constants import SCHEDULE_SAVE_DEBOUNCE
+from core.persistence import DebouncedJsonWriter
+from core.schedule_store import ScheduleStore, empty_schedules
+from core.recurrence import RecurrenceSet, MINUTES_PER_DAY, MINUTES_PER_WEEK
+from core.clock import SystemClock
+from core.simulation import effective_jobs, job_minute, simulate
+
+MAX_TIMER_WAIT_MS = 60 * 1000  # 예약이 없어도 최소 1분마다 깨어나 시계 변경을 확인합니다.
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _abs_minute(dt: datetime) -> int:
+    """현지 시각을 기준 시점 이후의 절대 분 번호로 변환합니다."""
+    return int((dt - _EPOCH).total_seconds() // 60)
 
-from core.constants import WEEKDAYS_MAP, SCHEDULE_FILE
 
 class Scheduler(QObject):
     """
     예약 로딩, 저장, 확인을 처리합니다.
-    타이머를 실행하여 현재 시간에 실행할 작업이 있는지 확인합니다.
+    이번 주의 주간/오늘 예약과 반복 규칙을 주 단위 분(minute-of-week) 타임라인으로 컴파일하고,
+    다음 예약 시각에 맞춰 단발성 타이머를 걸어 정확히 그 분의 경계에서 작업을 실행합니다.
+    load_async=True이면 예약 파일 읽기/변환을 백그라운드 스레드에서 하고, 끝나면 GUI 스레드에서 적용합니다.
+    (적용 전까지는 예약을 실행하지 않으며, 적용 후 그동안 지난 예약을 따라잡아 실행합니다.)
     """
     job_to_execute = pyqtSignal(dict)
     schedule_status_updated = pyqtSignal(str)
     schedules_loaded = pyqtSignal(dict)
+    _background_loaded = pyqtSignal(object)  # 로딩 스레드 -> GUI 스레드 전달용
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, clock=None, load_async=False):
         super().__init__(parent)
+        self._clock = clock or SystemClock()
         self.schedules = {}
-        self._load_schedules_from_file()
+        self._loaded = False
+        self._store = ScheduleStore()
+        self._writer = DebouncedJsonWriter(self._store.path, SCHEDULE_SAVE_DEBOUNCE, name="ScheduleWriter")
+        self._recurrence = RecurrenceSet()
+
+        # 타임라인: 요일별 (시그니처, [(주 단위 분, 작업), ...]) 와 이를 이어 붙인 정렬 배열
+        self._week_start = None
+        self._week_base = 0
+        self._day_slices = [None] * 7
+        self._timeline = []
+        self._fire_minutes = []
+
+        # 마지막으로 처리한 절대 분. 시작한 그 분의 작업도 실행되도록 1분 전으로 둡니다.
+        now = self._clock.now()
+        self._last_run_minute = _abs_minute(now) - 1
+        self._last_run_mono = self._clock.monotonic()
+        self._today = now.date()
+        self._ensure_week(now.date())
 
-        self.last_checked_minute = -1
         self.scheduler_timer = QTimer(self)
+        self.scheduler_timer.setSingleShot(True)
+        self.scheduler_timer.setTimerType(Qt.PreciseTimer)
         self.scheduler_timer.timeout.connect(self.check_schedules)
-        self.scheduler_timer.start(1000)  # 1초마다 확인
+
+        self._background_loaded.connect(self._apply_loaded_schedules)
+        if load_async:
+            threading.Thread(target=lambda: self._background_loaded.emit(self._read_schedules_file()),
+                             name="ScheduleLoader", daemon=True).start()
+        else:
+            self._apply_loaded_schedules(self._read_schedules_file())
+
+    def is_loaded(self) -> bool:
+        """예약 파일 로딩이 끝났는지 여부입니다."""
+        return self._loaded
 
     def update_schedules(self, schedules_data: dict):
         """
         UI에서 예약 데이터가 업데이트될 때 호출됩니다.
         """
+        if not self._loaded:
+            # 파일을 읽기 전의 빈 예약으로 저장 파일을 덮어쓰지 않도록 무시합니다.
+            print("[SCHEDULER] 예약 로딩 전의 업데이트는 무시합니다.")
+            return
         self.schedules = schedules_data
+        rules = self.schedules.get("rules") or []
+        if rules != self._recurrence.specs:
+            self._recurrence = RecurrenceSet(rules)
+        self._rebuild_timeline()
         self._save_schedules_to_file()
+        self._arm_timer(self._clock.now())
         self.schedule_status_updated.emit("예약이 업데이트 및 저장되었습니다.")
 
+    # ------------------------------------------------------------
+    # 타임라인 컴파일
+    # ------------------------------------------------------------
+    def _ensure_week(self, day: date):
+        """day가 속한 주의 타임라인을 준비합니다. 주가 바뀌면 모든 요일을 다시 만듭니다."""
+        week_start = day - timedelta(days=day.weekday())
+        if week_start == self._week_start:
+            return
+        self._week_start = week_start
+        self._week_base = _abs_minute(datetime.combine(week_start, datetime.min.time()))
+        self._day_slices = [None] * 7
+        self._rebuild_timeline()
+
+    def _day_source(self, day_index: int) -> list:
+        """해당 요일에 적용되는 작업 목록. (규칙은 core.simulation.effective_jobs 참고)"""
+        return effective_jobs(self.schedules, self._week_start + timedelta(days=day_index), self._recurrence)
+
+    def _rebuild_timeline(self):
+        """
+        요일별 시그니처를 비교하여 바뀐 요일만 다시 정렬합니다.
+        요일 구간은 서로 겹치지 않으므로 순서대로 이어 붙이면 전체가 정렬된 상태가 됩니다.
+        """
+        changed = False
+        for day_index in range(7):
+            jobs = self._day_source(day_index)
+            entries = []
+            for job in jobs:
+                try:
+                    entries.append((day_index * MINUTES_PER_DAY + job_minute(job), job))
+                except (TypeError, ValueError):
+                    print(f"[SCHEDULER] 잘못된 예약 시간을 건너뜁니다: {job}")
+            signature = tuple((m, job.get("name"), job.get("target"), job.get("action")) for m, job in entries)
+            current = self._day_slices[day_index]
+            if current is not None and current[0] == signature:
+                continue
+            entries.sort(key=lambda e: e[0])
+            self._day_slices[day_index] = (signature, entries)
+            changed = True
+
+        if changed:
+            self._timeline = [entry for _, entries in self._day_slices for entry in entries]
+            self._fire_minutes = [m for m, _ in self._timeline]
+
+    # ------------------------------------------------------------
+    # 실행
+    # ------------------------------------------------------------
     def check_schedules(self):
         """
-        현재 시간에 실행할 작업이 있는지 확인합니다.
-        이 메서드는 scheduler_timer에 의해 1초마다 호출됩니다.
+        타이머가 깨어날 때 호출됩니다.
+        마지막 실행 이후 지금까지의 모든 예약을 순서대로 실행(따라잡기)하고 다음 타이머를 겁니다.
         """
-        if self.schedules.get('disabled', False):
-            return
-            
-        now = datetime.now()
-        current_minute = now.minute
-        
-        # 같은 분에 여러 번 확인하는 것을 방지합니다.
-        if current_minute == self.last_checked_minute:
-            return
-        self.last_checked_minute = current_minute
-        
-        current_time_str = now.strftime("%H:%M")
-        current_weekday = WEEKDAYS_MAP[now.weekday()]
-        current_date_str = now.strftime("%Y-%m-%d")
-
-        jobs_to_run = []
-        
-        # "오늘" 예약이 주간 예약보다 우선순위가 높습니다.
-        daily_jobs = self.schedules.get("daily", {}).get(current_date_str)
-        if daily_jobs:
-            for job in daily_jobs:
-                if job.get("time").toString("HH:mm") == current_time_str:
-                    jobs_to_run.append(job)
-        # "오늘" 예약이 없으면 주간 예약을 확인합니다.
-        else:
-            weekly_jobs = self.schedules.get("weekly", {}).get(current_weekday)
-            if weekly_jobs:
-                for job in weekly_jobs:
-                    if job.get("time").toString("HH:mm") == current_time_str:
-                        jobs_to_run.append(job)
-        
-        if jobs_to_run:
-            print(f"실행할 작업 {len(jobs_to_run)}개 ({current_time_str})")
-            for job in jobs_to_run:
+        now = self._clock.now()
+        end = _abs_minute(now)
+        start = self._last_run_minute
+
+        # 단조 시계로 실제 경과 시간을 확인하여, 벽시계 변경(시간 동기화 등)과 실제로 놓친 예약을 구분합니다.
+        mono_now = self._clock.monotonic()
+        elapsed_minutes = int((mono_now - self._last_run_mono) // 60) + 1
+        self._last_run_mono = mono_now
+        if end < start:
+            print(f"[SCHEDULER] 시계가 뒤로 변경되었습니다. ({end - start}분)")
+            start = end
+        elif end - start > elapsed_minutes + 1:
+            print(f"[SCHEDULER] 시계가 앞으로 변경되었습니다. 경과 시간({elapsed_minutes}분) 안의 예약만 확인합니다.")
+            start = end - elapsed_minutes
+
+        due = self._collect_due(start, end)
+        self._last_run_minute = end
+        self._ensure_week(now.date())
+        if now.date() != self._today:
+            self._today = now.date()
+            archived = self._store.take_stale(self.schedules, self._today)
+            if archived:
+                # 보관 파일 덧붙이기(fsync)는 저장 스레드에서 schedules.json을 쓰기 직전에 합니다.
+                self._save_schedules_to_file(before_write=lambda: self._store.append_archive(archived))
+
+        if due and not self.schedules.get('disabled', False):
+            print(f"실행할 작업 {len(due)}개 ({now.strftime('%H:%M')})")
+            for minute, job in due:
+                delay = end - minute
+                if delay > 0:
+                    message = f"놓친 예약 실행: {job.get('name', '')} ({delay}분 지연)"
+                    print(f"[SCHEDULER] {message}")
+                    self.schedule_status_updated.emit(message)
                 self.job_to_execute.emit(job)
 
-    def _save_schedules_to_file(self):
+        self._arm_timer(now)
+
+    def _collect_due(self, start: int, end: int) -> list:
+        """절대 분 (start, end] 구간의 예약을 [(절대 분, 작업), ...] 으로 반환합니다. 주 경계를 넘을 수 있습니다."""
+        due = []
+        while start < end:
+            self._ensure_week((_EPOCH + timedelta(minutes=start + 1)).date())
+            seg_end = min(end, self._week_base + MINUTES_PER_WEEK - 1)
+            lo = bisect.bisect_right(self._fire_minutes, start - self._week_base)
+            hi = bisect.bisect_right(self._fire_minutes, seg_end - self._week_base)
+            due.extend((self._week_base + m, job) for m, job in self._timeline[lo:hi])
+            start = seg_end
+        return due
+
+    def _arm_timer(self, now: datetime):
+        """다음 예약 시각의 분 경계에 맞춰 단발성 타이머를 겁니다."""
+        current = _abs_minute(now) - self._week_base
+        index = bisect.bisect_right(self._fire_minutes, current)
+        if index < len(self._fire_minutes):
+            next_minute = self._fire_minutes[index]
+        else:
+            next_minute = MINUTES_PER_WEEK  # 다음 주 첫 분
+        seconds_into_minute = now.second + now.microsecond / 1_000_000
+        wait_ms = int(((next_minute - current) * 60 - seconds_into_minute) * 1000) + 5
+        self.scheduler_timer.start(max(0, min(wait_ms, MAX_TIMER_WAIT_MS)))
+
+    def _save_schedules_to_file(self, before_write=None):
         """
-        현재 예약을 JSON 파일에 저장합니다.
-        직렬화를 위해 QTime 객체를 문자열로 변환합니다.
+        현재 예약의 스냅샷을 백그라운드 저장 스레드에 넘깁니다.
+        실제 JSON 변환과 파일 쓰기(before_write 포함)는 GUI 스레드 밖에서 수행됩니다.
         """
-        schedules_to_save = copy.deepcopy(self.schedules)
-        for category_key in ['weekly', 'daily', 'templates']:
-            category = schedules_to_save.get(category_key, {})
-            if not isinstance(category, dict): continue
-            for day_list in category.values():
-                if isinstance(day_list, list):
-                    for job in day_list:
-                        if isinstance(job.get("time"), QTime):
-                            job["time"] = job["time"].toString("HH:mm")
-        try:
-            with open(SCHEDULE_FILE, 'w', encoding='utf-8') as f:
-                json.dump(schedules_to_save, f, ensure_ascii=False, indent=4)
-        except Exception as e:
-            print(f"예약 저장 오류: {e}")
+        self._writer.submit(self._store.snapshot(self.schedules), before_write)
 
-    def _load_schedules_from_file(self):
+    def dry_run(self, start: datetime, end: datetime, templates: dict = None):
         """
-        JSON 파일에서 예약을 불러옵니다.
-        시간 문자열을 QTime 객체로 변환합니다.
+        현재 예약을 하드웨어에 보내지 않고 [start, end) 구간에 대해 전개합니다.
+        결과(SimulationReport)에는 이벤트 목록과 같은 분의 ON/OFF 충돌, 중복 작업이 포함됩니다.
         """
-        if not os.path.exists(SCHEDULE_FILE):
-            print("예약 파일을 찾을 수 없습니다. 빈 예약으로 시작합니다.")
-            self.schedules = {
-                "weekly": {day: [] for day in WEEKDAYS_MAP},
-                "daily": {},
-                "templates": {}
-            }
-        else:
-            try:
-                with open(SCHEDULE_FILE, 'r', encoding='utf-8') as f:
-                    loaded_schedules = json.load(f)
-                
-                for category_key in ['weekly', 'daily', 'templates']:
-                    category = loaded_schedules.get(category_key, {})
-                    if not isinstance(category, dict): continue
-                    for day_list in category.values():
-                        if isinstance(day_list, list):
-                            for job in day_list:
-                                if isinstance(job.get("time"), str):
-                                    job["time"] = QTime.fromString(job["time"], "HH:mm")
-                
-                self.schedules = loaded_schedules
-                print("예약을 성공적으로 불러왔습니다.")
-            except Exception as e:
-                print(f"예약 불러오기 오류: {e}")
-                self.schedules = {}
-        
+        return simulate(self.schedules, start, end, self._recurrence, templates)
+
+    def close(self):
+        """대기 중인 예약 저장을 마치고 저장 스레드를 종료합니다. (애플리케이션 종료 시 호출)"""
+        self._writer.close()
+
+    def load_archived_daily(self) -> dict:
+        """보관 파일로 옮겨진 지난 "오늘" 예약을 반환합니다. 처음 호출할 때만 파일을 읽습니다."""
+        return self._store.load_archive()
+
+    def _read_schedules_file(self):
+        """
+        JSON 파일에서 예약을 불러옵니다. Qt 객체를 건드리지 않으므로 백그라운드 스레드에서 호출해도 됩니다.
+        시간 문자열은 자정 이후 분(int)으로 변환되고, 오래된 "오늘" 예약은 보관 파일로 옮겨집니다.
+        시간이 잘못된 작업은 하나씩 건너뜁니다. 파일 전체를 읽을 수 없으면 백업으로 옮긴 뒤 빈 예약으로 시작하고,
+        백업조차 실패하면 None을 반환하여 저장이 원본을 덮어쓰지 않도록 로딩되지 않은 상태로 둡니다.
+        반환값: (예약 딕셔너리, 보관 파일로 옮긴 항목이 있어 다시 저장해야 하는지 여부) 또는 None
+        """
+        try:
+            loaded_schedules = self._store.load()
+            if loaded_schedules is None:
+                print("예약 파일을 찾을 수 없습니다. 빈 예약으로 시작합니다.")
+                return empty_schedules(), False
+            print("예약을 성공적으로 불러왔습니다.")
+            return loaded_schedules, self._store.compact(loaded_schedules, self._clock.now().date())
+        except Exception as e:
+            print(f"예약 불러오기 오류: {e}")
+        try:
+            backup = self._store.backup_unreadable()
+        except OSError as e:
+            print(f"[SCHEDULER] 예약 파일을 백업하지 못했습니다. 예약 편집/저장을 막습니다: {e}")
+            return None
+        print(f"[SCHEDULER] 읽을 수 없는 예약 파일을 {backup} 으로 옮기고 빈 예약으로 시작합니다.")
+        return empty_schedules(), False
+
+    def _apply_loaded_schedules(self, result):
+        """불러온 예약을 적용하고 타이머를 시작합니다. (GUI 스레드)"""
+        if result is None:
+            self.schedule_status_updated.emit("[오류] 예약 파일을 읽을 수 없어 예약 기능을 사용할 수 없습니다.")
+            return
+        self.schedules, compacted = result
+        self._recurrence = RecurrenceSet(self.schedules.get("rules"))
+        self._rebuild_timeline()
+        self._loaded = True
+        if compacted:
+            self._save_schedules_to_file()
+
         # 로딩 및 파싱 후 시그널 발생
         self.schedules_loaded.emit(self.schedules)
+        self.scheduler_timer.start(0)
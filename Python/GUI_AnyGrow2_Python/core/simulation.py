@@ -0,0 +1,189 @@
+# core/simulation.py
+import random
+import time
+from datetime import date, datetime, timedelta
+
+from core.constants import WEEKDAYS_MAP
+from core.recurrence import RecurrenceSet
+from core.schedule_store import minutes_from_text, minutes_to_text
+
+# ============================================================
+# Helper Functions & Constants
+# ============================================================
+ACTION_ON = "켜기 (ON)"
+ACTION_OFF = "끄기 (OFF)"
+
+
+def job_minute(job: dict) -> int:
+    """작업의 실행 시간을 자정 이후 분으로 반환합니다."""
+    t = job.get("time")
+    if isinstance(t, str):
+        return minutes_from_text(t)
+    return int(t)
+
+
+def effective_jobs(schedules: dict, day: date, recurrence: RecurrenceSet = None) -> list:
+    """
+    해당 날짜에 실행될 작업 목록. "오늘" 예약이 있으면 주간 예약보다 우선하며,
+    반복 규칙(rules)에서 나온 작업은 두 모드와 별개로 항상 더해집니다.
+    Scheduler와 시뮬레이션이 같은 규칙을 쓰도록 이 함수를 공유합니다.
+    """
+    jobs = schedules.get("daily", {}).get(day.strftime("%Y-%m-%d"))
+    if not jobs:
+        jobs = schedules.get("weekly", {}).get(WEEKDAYS_MAP[day.weekday()]) or []
+    if recurrence:
+        return list(jobs) + recurrence.jobs_on(day)
+    return jobs
+
+
+def _apply_templates(schedules: dict, templates: dict) -> dict:
+    """{요일 이름 또는 'YYYY-MM-DD': 템플릿 이름} 에 따라 템플릿을 덮어씌운 사본을 만듭니다."""
+    result = dict(schedules)
+    result["weekly"] = dict(schedules.get("weekly", {}))
+    result["daily"] = dict(schedules.get("daily", {}))
+    for key, template_name in templates.items():
+        jobs = schedules.get("templates", {})[template_name]
+        category = "weekly" if key in WEEKDAYS_MAP else "daily"
+        result[category][key] = jobs
+    return result
+
+
+# ============================================================
+# Simulation
+# ============================================================
+class SimulationReport:
+    """
+    시뮬레이션 결과입니다.
+      events     : 시간순 (timestamp, target, action, name) 튜플 목록 (수십만 개를 빠르게 만들기 위해 일반 튜플 사용)
+      conflicts  : 같은 분에 같은 대상을 켜고 끄는 작업 [(timestamp, target, [이름, ...]), ...]
+      duplicates : 같은 분에 같은 대상·동작이 겹치는 작업 [(timestamp, target, action, 개수), ...]
+    """
+    def __init__(self, events, conflicts, duplicates, elapsed):
+        self.events = events
+        self.conflicts = conflicts
+        self.duplicates = duplicates
+        self.elapsed = elapsed
+
+    def summary(self) -> str:
+        return (f"이벤트 {len(self.events)}개, 충돌 {len(self.conflicts)}건, "
+                f"중복 {len(self.duplicates)}건 ({self.elapsed * 1000:.1f} ms)")
+
+
+class _CompiledDay:
+    """
+    하루치 작업을 자정 기준 오프셋 순으로 정렬하고, 같은 분의 충돌/중복을 미리 계산한 결과입니다.
+    주간 예약은 요일마다 한 번만 만들어 매주 재사용합니다.
+    """
+    __slots__ = ("entries", "conflicts", "duplicates")
+
+    def __init__(self, jobs):
+        compiled = sorted(((job_minute(job), job.get("target"), job.get("action"), job.get("name", ""))
+                           for job in jobs), key=lambda e: e[0])
+        self.entries = [(timedelta(minutes=m), t, a, n) for m, t, a, n in compiled]
+        self.conflicts, self.duplicates = [], []
+        i, count = 0, len(compiled)
+        while i < count:
+            j = i + 1
+            while j < count and compiled[j][0] == compiled[i][0]:
+                j += 1
+            if j - i > 1:
+                _check_group(self.entries[i][0], compiled[i:j], self.conflicts, self.duplicates)
+            i = j
+
+
+def simulate(schedules: dict, start: datetime, end: datetime,
+             recurrence: RecurrenceSet = None, templates: dict = None) -> SimulationReport:
+    """
+    실제 하드웨어 없이 [start, end) 구간의 예약 실행을 전개합니다.
+    templates를 주면 해당 요일/날짜에 템플릿을 적용했을 때의 결과를 미리 볼 수 있습니다.
+    주간 예약은 요일별로 한 번만 컴파일해 두고, "오늘" 예약과 반복 규칙이 있는 날만 따로 계산합니다.
+    """
+    started = time.perf_counter()
+    if templates:
+        schedules = _apply_templates(schedules, templates)
+    if recurrence is None and schedules.get("rules"):
+        recurrence = RecurrenceSet(schedules["rules"])
+
+    events, conflicts, duplicates = [], [], []
+    if schedules.get("disabled", False):
+        return SimulationReport(events, conflicts, duplicates, time.perf_counter() - started)
+
+    daily = schedules.get("daily", {})
+    weekly = schedules.get("weekly", {})
+    weekly_compiled = {}
+
+    day = start.date()
+    while day <= end.date():
+        if daily.get(day.strftime("%Y-%m-%d")) or recurrence:
+            compiled = _CompiledDay(effective_jobs(schedules, day, recurrence))
+        else:
+            compiled = weekly_compiled.get(day.weekday())
+            if compiled is None:
+                compiled = _CompiledDay(weekly.get(WEEKDAYS_MAP[day.weekday()]) or [])
+                weekly_compiled[day.weekday()] = compiled
+
+        base = datetime.combine(day, datetime.min.time())
+        if start <= base and base + timedelta(days=1) <= end:
+            events.extend([(base + off, t, a, n) for off, t, a, n in compiled.entries])
+            conflicts.extend([(base + off, t, names) for off, t, names in compiled.conflicts])
+            duplicates.extend([(base + off, t, a, n) for off, t, a, n in compiled.duplicates])
+        else:
+            # 구간 경계에 걸친 첫날/마지막 날
+            events.extend([(base + off, t, a, n) for off, t, a, n in compiled.entries
+                           if start <= base + off < end])
+            conflicts.extend([(base + off, t, names) for off, t, names in compiled.conflicts
+                              if start <= base + off < end])
+            duplicates.extend([(base + off, t, a, n) for off, t, a, n in compiled.duplicates
+                               if start <= base + off < end])
+        day += timedelta(days=1)
+
+    return SimulationReport(events, conflicts, duplicates, time.perf_counter() - started)
+
+
+def _check_group(offset, group, conflicts, duplicates):
+    """같은 분에 실행되는 작업들 중 충돌(ON/OFF)과 중복을 찾습니다."""
+    by_target = {}
+    for _, target, action, name in group:
+        by_target.setdefault(target, []).append((action, name))
+    for target, items in by_target.items():
+        if len(items) < 2:
+            continue
+        actions = [action for action, _ in items]
+        if ACTION_ON in actions and ACTION_OFF in actions:
+            conflicts.append((offset, target, [name for _, name in items]))
+        for action in set(actions):
+            n = actions.count(action)
+            if n > 1:
+                duplicates.append((offset, target, action, n))
+
+
+# ============================================================
+# Benchmark
+# ============================================================
+def random_schedules(job_count: int, seed: int = 0) -> dict:
+    """부하 측정용 무작위 주간 예약을 만듭니다."""
+    rng = random.Random(seed)
+    targets = ["전체 LED", "양액 펌프", "UV 필터"]
+    weekly = {day: [] for day in WEEKDAYS_MAP}
+    for n in range(job_count):
+        weekly[rng.choice(WEEKDAYS_MAP)].append({
+            "name": f"작업 {n}",
+            "time": minutes_to_text(rng.randrange(24 * 60)),
+            "target": rng.choice(targets),
+            "action": rng.choice([ACTION_ON, ACTION_OFF]),
+        })
+    return {"weekly": weekly, "daily": {}, "templates": {}}
+
+
+def benchmark(job_count: int = 20000, days: int = 365) -> SimulationReport:
+    """무작위 예약 job_count개를 days일 동안 전개하고 결과를 출력합니다."""
+    schedules = random_schedules(job_count)
+    start = datetime.combine(date.today(), datetime.min.time())
+    report = simulate(schedules, start, start + timedelta(days=days))
+    print(f"[SIMULATION] 작업 {job_count}개 x {days}일: {report.summary()}")
+    return report
+
+
+if __name__ == "__main__":
+    import sys
+    benchmark(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,56 @@
+# core/startup.py
+import json
+import time
+
+from core.constants import STARTUP_LOG_FILE
+
+# 모듈을 처음 불러온 시점을 시작 기준으로 사용합니다. (app.py가 가장 먼저 불러옴)
+_PROCESS_T0 = time.perf_counter()
+
+
+class StartupTimeline:
+    """
+    애플리케이션 시작 단계별 경과 시간을 기록합니다.
+    같은 이름은 처음 한 번만 기록되므로 "첫 화면", "첫 센서 수신" 같은 지점을 여러 곳에서 표시해도 됩니다.
+    report()는 요약을 출력하고 STARTUP_LOG_FILE에 한 줄(JSON)로 덧붙여 부팅 간 비교가 가능하게 합니다.
+    """
+    def __init__(self, log_path=STARTUP_LOG_FILE, t0: float = None):
+        self.log_path = log_path
+        self._t0 = _PROCESS_T0 if t0 is None else t0
+        self._wall_start = time.time() - (time.perf_counter() - self._t0)
+        self._marks = {}
+        self._reported = False
+
+    def mark(self, name: str) -> float:
+        """단계를 기록하고 시작 후 경과 시간(ms)을 반환합니다. 이미 기록된 단계는 그대로 둡니다."""
+        if name not in self._marks:
+            self._marks[name] = (time.perf_counter() - self._t0) * 1000
+        return self._marks[name]
+
+    def has(self, name: str) -> bool:
+        return name in self._marks
+
+    def marks(self) -> dict:
+        """{단계 이름: 경과 ms}를 기록 순서대로 반환합니다."""
+        return dict(self._marks)
+
+    def report(self, reason: str = "") -> dict:
+        """타임라인을 출력하고 기록 파일에 덧붙입니다. 한 번만 동작합니다."""
+        if self._reported:
+            return self.marks()
+        self._reported = True
+        print(f"[STARTUP] 시작 타임라인{f' ({reason})' if reason else ''}:")
+        for name, ms in self._marks.items():
+            print(f"[STARTUP]   {ms:8.1f} ms  {name}")
+
+        record = {
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self._wall_start)),
+            "reason": reason,
+            "marks_ms": {name: round(ms, 1) for name, ms in self._marks.items()},
+        }
+        try:
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"[STARTUP] 타임라인 기록 오류: {e}")
+        return self.marks()
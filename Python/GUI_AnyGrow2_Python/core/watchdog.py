@@ -0,0 +1,220 @@
+# core/watchdog.py
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from logging.handlers import RotatingFileHandler
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSlot
+
+from core.metrics import LatencyHistogram, histogram_lines
+from core.constants import (
+    WATCHDOG_HEARTBEAT_MS, WATCHDOG_STALL_MS,
+    WATCHDOG_LOG_FILE, WATCHDOG_LOG_MAX_BYTES, WATCHDOG_LOG_BACKUPS,
+    WATCHDOG_METRICS_FILE, WATCHDOG_METRICS_INTERVAL,
+)
+
+# ============================================================
+# Helper Functions & Constants
+# ============================================================
+def _make_logger(path: str) -> logging.Logger:
+    logger = logging.getLogger("anygrow2.watchdog")
+    if not logger.handlers:
+        handler = RotatingFileHandler(path, maxBytes=WATCHDOG_LOG_MAX_BYTES,
+                                      backupCount=WATCHDOG_LOG_BACKUPS, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
+# ============================================================
+# Heartbeat Class
+# ============================================================
+class Heartbeat(QObject):
+    """
+    감시 대상 스레드의 이벤트 루프에서 도는 하트비트 타이머입니다.
+    타이머가 예정보다 늦게 울린 시간(이벤트 루프 지연)을 히스토그램에 기록합니다.
+    대상 스레드로 moveToThread한 뒤 그 스레드에서 start()가 호출되어야 합니다.
+    """
+    def __init__(self, name: str, interval_ms: int = WATCHDOG_HEARTBEAT_MS):
+        super().__init__()
+        self.name = name
+        self.interval_ms = interval_ms
+        self.histogram = LatencyHistogram()
+        self.thread_ident = None
+        self.last_beat = None   # time.monotonic(), 시작 전에는 None
+        self._timer = None
+
+    @pyqtSlot()
+    def start(self):
+        self.thread_ident = threading.get_ident()
+        self.last_beat = time.monotonic()
+        self._timer = QTimer()
+        self._timer.timeout.connect(self._beat)
+        self._timer.start(self.interval_ms)
+
+    @pyqtSlot()
+    def stop(self):
+        if self._timer:
+            self._timer.stop()
+        self.last_beat = None
+
+    def _beat(self):
+        now = time.monotonic()
+        late_ms = (now - self.last_beat) * 1000 - self.interval_ms
+        self.last_beat = now
+        self.histogram.observe(max(0.0, late_ms))
+
+
+# ============================================================
+# Stall Watchdog Class
+# ============================================================
+class StallWatchdog:
+    """
+    Qt 밖의 감시 스레드가 각 하트비트의 마지막 시각을 확인합니다.
+    하트비트가 stall_ms 이상 멈추면 그 스레드의 파이썬 스택을 잡아 회전 로그 파일에 기록하고,
+    다시 뛰기 시작하면 정지 시간을 기록합니다.
+    평소에는 감시 스레드가 주기적으로 시각 비교만 하므로 부하가 거의 없습니다.
+    metrics_path가 있으면 WATCHDOG_METRICS_INTERVAL마다 to_prometheus() 결과를 그 파일에 씁니다.
+    (node_exporter textfile collector가 읽을 수 있도록 임시 파일에 쓴 뒤 교체합니다. None이면 쓰지 않음)
+    add_histogram()으로 등록한 다른 지연 히스토그램(예: 자동화 명령 지연)도 같은 파일에 기록합니다.
+    """
+    def __init__(self, stall_ms: int = WATCHDOG_STALL_MS, log_path: str = WATCHDOG_LOG_FILE,
+                 metrics_path: str = WATCHDOG_METRICS_FILE):
+        self.stall_ms = stall_ms
+        self.metrics_path = metrics_path
+        self._metrics_error = False
+        self._heartbeats = []
+        self._histograms = []   # (지표 이름, 설명, 스냅샷 함수)
+        self._stalls = {}       # 이름 -> {"count", "total_ms", "last": {...}}
+        self._active = {}       # 이름 -> 진행 중인 정지의 시작 시각(마지막 하트비트)
+        self._logger = _make_logger(log_path)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def watch_current_thread(self, name: str) -> Heartbeat:
+        """호출한 스레드(보통 GUI 스레드)를 감시 대상으로 추가합니다."""
+        heartbeat = Heartbeat(name)
+        heartbeat.start()
+        self._heartbeats.append(heartbeat)
+        return heartbeat
+
+    def watch_qthread(self, name: str, thread) -> Heartbeat:
+        """QThread를 감시 대상으로 추가합니다. 스레드가 시작되면 그 스레드에서 하트비트가 시작됩니다."""
+        heartbeat = Heartbeat(name)
+        heartbeat.moveToThread(thread)
+        thread.started.connect(heartbeat.start)
+        thread.finished.connect(heartbeat.stop)
+        self._heartbeats.append(heartbeat)
+        return heartbeat
+
+    def add_histogram(self, name: str, help_text: str, snapshot):
+        """
+        지표 파일에 함께 기록할 지연 히스토그램을 등록합니다.
+        snapshot 은 LatencyHistogram.snapshot() 형식을 반환하는 함수이며 감시 스레드에서 호출됩니다.
+        """
+        self._histograms.append((name, help_text, snapshot))
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="StallWatchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread and self._thread.ident:
+            self._thread.join(timeout=1.0)
+
+    def _run(self):
+        interval = WATCHDOG_HEARTBEAT_MS / 1000
+        next_export = time.monotonic()
+        while not self._stop.wait(interval):
+            now = time.monotonic()
+            for heartbeat in self._heartbeats:
+                self._check(heartbeat, now)
+            if self.metrics_path and now >= next_export:
+                next_export = now + WATCHDOG_METRICS_INTERVAL
+                self._write_metrics()
+        if self.metrics_path:
+            self._write_metrics()  # 종료 직전 값
+
+    def _write_metrics(self):
+        """to_prometheus() 결과를 metrics_path에 원자적으로 씁니다. 실패는 처음 한 번만 출력합니다."""
+        tmp_path = f"{self.metrics_path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(self.to_prometheus())
+            os.replace(tmp_path, self.metrics_path)
+            self._metrics_error = False
+        except OSError as e:
+            if not self._metrics_error:
+                print(f"[WATCHDOG] 지표 파일 쓰기 오류 ({self.metrics_path}): {e}")
+            self._metrics_error = True
+
+    def _check(self, heartbeat: Heartbeat, now: float):
+        last = heartbeat.last_beat
+        if last is None:
+            return
+        name = heartbeat.name
+        started = self._active.get(name)
+
+        if started is not None and started != last:
+            # 정지가 끝남: 멈추기 전 마지막 하트비트부터 다시 뛴 하트비트까지의 시간을 기록합니다.
+            duration = (last - started) * 1000
+            del self._active[name]
+            stats = self._stalls.setdefault(name, {"count": 0, "total_ms": 0.0, "last": None})
+            stats["count"] += 1
+            stats["total_ms"] += duration
+            stats["last"] = {"at": time.time(), "duration_ms": duration}
+            print(f"[WATCHDOG] {name} 이벤트 루프 재개 ({duration:.0f} ms 정지)")
+            self._logger.warning(f"[{name}] 이벤트 루프 재개, 정지 시간 {duration:.0f} ms")
+
+        stalled_ms = (now - last) * 1000
+        if stalled_ms >= self.stall_ms and name not in self._active:
+            # 새 정지: 멈춘 스레드의 현재 스택을 기록합니다.
+            self._active[name] = last
+            frame = sys._current_frames().get(heartbeat.thread_ident)
+            stack = "".join(traceback.format_stack(frame)) if frame else "(스택 없음)\n"
+            print(f"[WATCHDOG] {name} 이벤트 루프 정지 감지 ({stalled_ms:.0f} ms 이상)")
+            self._logger.warning(f"[{name}] 이벤트 루프 정지 {stalled_ms:.0f} ms 이상\n{stack}")
+
+    def stats(self) -> dict:
+        """스레드별 하트비트 지연 히스토그램과 정지 통계를 반환합니다. (to_prometheus / 지표 파일용)"""
+        result = {}
+        for heartbeat in self._heartbeats:
+            stalls = self._stalls.get(heartbeat.name, {"count": 0, "total_ms": 0.0, "last": None})
+            result[heartbeat.name] = {
+                "latency": heartbeat.histogram.snapshot(),
+                "stalls": dict(stalls),
+                "stalled_now": heartbeat.name in self._active,
+            }
+        return result
+
+    def recently_stalled(self, name: str, within: float) -> bool:
+        """해당 스레드가 지금 멈춰 있거나 최근 within초 안에 멈췄던 적이 있는지 확인합니다."""
+        if name in self._active:
+            return True
+        last = self._stalls.get(name, {}).get("last")
+        return bool(last) and time.time() - last["at"] <= within
+
+    def to_prometheus(self, prefix: str = "anygrow2") -> str:
+        """stats()를 Prometheus 텍스트 형식으로 변환합니다."""
+        lines = [
+            f"# HELP {prefix}_event_loop_lag_ms Event loop heartbeat lateness per thread.",
+            f"# TYPE {prefix}_event_loop_lag_ms histogram",
+        ]
+        stall_lines = []
+        for name, stats in self.stats().items():
+            lines += histogram_lines(f"{prefix}_event_loop_lag_ms", stats["latency"], f'thread="{name}"')
+            stall_lines.append(f'{prefix}_event_loop_stalls_total{{thread="{name}"}} {stats["stalls"]["count"]}')
+        lines.append(f"# HELP {prefix}_event_loop_stalls_total Event loop stalls longer than the watchdog threshold.")
+        lines.append(f"# TYPE {prefix}_event_loop_stalls_total counter")
+        lines += stall_lines
+        for name, help_text, snapshot in self._histograms:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} histogram")
+            lines += histogram_lines(f"{prefix}_{name}", snapshot())
+        return "\n".join(lines) + "\n"
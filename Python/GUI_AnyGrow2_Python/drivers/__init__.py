@@ -1,7 +1,17 @@
 """Hardware / driver layer for AnyGrow2 board."""
 
-from .hardware import HardwareManager
-
 __all__ = [
     "HardwareManager",
+    "BrokerHardwareManager",
 ]
+
+
+def __getattr__(name):
+    # PyQt5가 필요한 관리자는 사용할 때 불러옵니다. (broker.py는 PyQt5 없이 serial_communicator만 사용)
+    if name == "HardwareManager":
+        from .hardware import HardwareManager
+        return HardwareManager
+    if name == "BrokerHardwareManager":
+        from .broker_hardware import BrokerHardwareManager
+        return BrokerHardwareManager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,108 @@
+# drivers/broker_hardware.py
+import time
+from PyQt5 import QtCore
+
+from core.automation import AutomationEngine
+from core.metrics import LatencyHistogram
+from core.broker_client import BrokerClient
+from core.broker_protocol import TOPIC_SENSOR, TOPIC_RAW, TOPIC_STATUS, TOPIC_REQUEST
+from core.command_queue import STATUS_FAILED
+from core.constants import PRIORITY_HIGH, PRIORITY_NORMAL
+
+class BrokerHardwareManager(QtCore.QObject):
+    """
+    HardwareManager와 같은 시그널/슬롯을 제공하지만, 시리얼 포트를 직접 열지 않고
+    로컬 브로커(broker.py)를 통해 장치와 통신합니다. 웹 서버 등과 포트를 함께 쓸 때 사용합니다.
+    센서 요청 주기와 명령 간격은 브로커의 명령 큐가 관리합니다.
+    """
+    status_changed = QtCore.pyqtSignal(str)
+    data_updated = QtCore.pyqtSignal(dict)
+    raw_string_updated = QtCore.pyqtSignal(str)
+    request_sent = QtCore.pyqtSignal()
+
+    def __init__(self, address=None, automation=None):
+        super().__init__()
+        # 콜백은 BrokerClient 수신 스레드에서 호출되며, 시그널로 각 스레드에 전달됩니다.
+        self._client = BrokerClient(
+            topics=(TOPIC_SENSOR, TOPIC_RAW, TOPIC_STATUS, TOPIC_REQUEST),
+            address=address,
+            on_message=self._on_message,
+            on_ack=self._on_ack,
+            on_connection=self._on_connection,
+        )
+        self._automation = automation or AutomationEngine()
+        self._automation_latency = LatencyHistogram()  # 자동화 규칙: 센서값 수신 → 명령 전송 지연 (ms)
+        self._running = False
+
+    @QtCore.pyqtSlot()
+    def start(self):
+        """브로커 연결을 시작합니다."""
+        if self._running: return
+        self._running = True
+        self.status_changed.emit(f"브로커 {self._client.address[1]}에 연결 시도 중...")
+        self._client.start()
+
+    @QtCore.pyqtSlot()
+    def stop(self):
+        """브로커 연결을 종료합니다."""
+        self.status_changed.emit("하드웨어 스레드 중지 중...")
+        self._running = False
+        self._client.stop()
+        self.status_changed.emit("하드웨어 스레드 중지됨.")
+
+    @QtCore.pyqtSlot()
+    def reconnect(self):
+        """수동으로 브로커 재연결을 요청합니다. 시리얼 포트 재연결은 브로커가 직접 처리합니다."""
+        self.status_changed.emit("수동으로 재연결 요청...")
+        print("[HARDWARE] 수동으로 브로커 재연결 요청...")
+        self._client.reconnect()
+
+    def automation_latency_stats(self) -> dict:
+        """
+        자동화 명령의 센서값 수신→전송 지연 히스토그램(LatencyHistogram.snapshot)을 반환합니다.
+        워치독이 Prometheus 지표 파일에 함께 기록합니다. (app.py 참고)
+        """
+        return self._automation_latency.snapshot()
+
+    @QtCore.pyqtSlot(str, object)
+    def submit_command(self, cmd: str, args=None):
+        """명령을 브로커의 명령 큐로 보냅니다."""
+        if not self._running: return
+        self._send(cmd, args or {}, PRIORITY_NORMAL)
+
+    def _send(self, cmd, args, priority, origin=None):
+        if not self._client.submit(cmd, args, priority=priority, context=origin):
+            self.status_changed.emit(f"[오류] 브로커에 연결되어 있지 않아 명령을 보내지 못했습니다: {cmd}")
+
+    def _on_message(self, topic, body):
+        if topic == TOPIC_SENSOR:
+            reading = dict(body)
+            reading.pop("response_ms", None)
+            # 자동화 규칙은 GUI 스레드를 거치지 않고 수신 즉시 평가하여 높은 우선순위로 보냅니다.
+            parsed_at = time.perf_counter()
+            for name, cmd, args in self._automation.evaluate(reading):
+                print(f"[AUTOMATION] 규칙 '{name}' 발동: {cmd} {args}")
+                self._send(cmd, args, PRIORITY_HIGH, (name, parsed_at))
+            self.data_updated.emit(reading)
+        elif topic == TOPIC_RAW:
+            self.raw_string_updated.emit(body.get("hex", ""))
+        elif topic == TOPIC_STATUS:
+            self.status_changed.emit(body.get("message", ""))
+        elif topic == TOPIC_REQUEST:
+            self.request_sent.emit()
+
+    def _on_ack(self, ack, origin):
+        if ack.get("status") == STATUS_FAILED:
+            self.status_changed.emit(f"[오류] 명령 실패: {ack.get('cmd')} ({ack.get('error')})")
+            return
+        if origin is not None:
+            name, parsed_at = origin
+            latency_ms = (time.perf_counter() - parsed_at) * 1000
+            self._automation_latency.observe(latency_ms)
+            print(f"[AUTOMATION] 규칙 '{name}' 명령 전송 (지연 {latency_ms:.1f} ms)")
+
+    def _on_connection(self, connected):
+        if connected:
+            self.status_changed.emit("브로커 연결됨.")
+        elif self._running:
+            self.status_changed.emit("[오류] 브로커 연결 끊김. 재연결 대기 중...")
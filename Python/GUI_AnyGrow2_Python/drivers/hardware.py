@@ -1,10 +1,13 @@
 # drivers/hardware.py
 import time
 import queue
+import itertools
 from PyQt5 import QtCore
 
 from core.protocol import PacketBuilder, PacketParser
-from core.constants import COMMAND_INTERVAL
+from core.constants import COMMAND_INTERVAL, PRIORITY_HIGH, PRIORITY_NORMAL
+from core.automation import AutomationEngine
+from core.metrics import LatencyHistogram
 from drivers.serial_communicator import SerialCommunicator
 
 def _hex_list_from_bytes(data: bytes):
@@ -23,10 +26,14 @@ class HardwareManager(QtCore.QObject):
     raw_string_updated = QtCore.pyqtSignal(str)
     request_sent = QtCore.pyqtSignal()
 
-    def __init__(self, port="COM5", baud_rate=38400):
+    def __init__(self, port="COM5", baud_rate=38400, automation=None):
         super().__init__()
         self._communicator = SerialCommunicator(port, baud_rate)
-        self._command_queue = queue.Queue()
+        # (우선순위, 순번, cmd, args, 원인 측정 시각) - 같은 우선순위 안에서는 제출 순서를 지킵니다.
+        self._command_queue = queue.PriorityQueue()
+        self._command_seq = itertools.count()
+        self._automation = automation or AutomationEngine()
+        self._automation_latency = LatencyHistogram()  # 자동화 규칙: 센서값 수신 → 명령 전송 지연 (ms)
         self._running = False
         self._mutex = QtCore.QMutex()
         self._last_write_timestamp = 0
@@ -136,27 +143,58 @@ class HardwareManager(QtCore.QObject):
         """시리얼 포트에서 데이터를 읽고 파싱합니다."""
         if not self._communicator.is_open(): return
         
+        actions = []
         self._mutex.lock()
         try:
             data = self._communicator.read()
             if data:
                 arr = _hex_list_from_bytes(data)
-                self.raw_string_updated.emit(",".join(arr))
                 reading = PacketParser.parse_sensor_packet(arr)
                 if reading is not None:
                     reading['timestamp'] = time.time()
+                    parsed_at = time.perf_counter()
+                    if self._automation:
+                        actions = [(name, cmd, args, parsed_at)
+                                   for name, cmd, args in self._automation.evaluate(reading)]
+                self.raw_string_updated.emit(",".join(arr))
+                if reading is not None:
                     self.data_updated.emit(reading)
         except Exception as e:
             self._handle_serial_error(f"[오류] 시리얼 읽기 오류: {e}")
         finally:
             self._mutex.unlock()
 
+        if actions:
+            self._dispatch_automation(actions)
+
+    def _dispatch_automation(self, actions):
+        """
+        자동화 규칙 명령을 높은 우선순위로 큐에 넣고, 명령 간격이 허용되는 즉시 전송합니다.
+        GUI 스레드를 거치지 않으므로 GUI가 바쁘더라도 지연되지 않습니다.
+        """
+        for name, cmd, args, parsed_at in actions:
+            print(f"[AUTOMATION] 규칙 '{name}' 발동: {cmd} {args}")
+            self._command_queue.put((PRIORITY_HIGH, next(self._command_seq), cmd, args, (name, parsed_at)))
+
+        remaining = COMMAND_INTERVAL - (time.time() - self._last_write_timestamp)
+        if remaining <= 0:
+            self._process_command_queue()
+        else:
+            QtCore.QTimer.singleShot(int(remaining * 1000) + 1, self._process_command_queue)
+
+    def automation_latency_stats(self) -> dict:
+        """
+        자동화 명령의 센서값 수신→전송 지연 히스토그램(LatencyHistogram.snapshot)을 반환합니다.
+        워치독이 Prometheus 지표 파일에 함께 기록합니다. (app.py 참고)
+        """
+        return self._automation_latency.snapshot()
+
     @QtCore.pyqtSlot(str, object)
     def submit_command(self, cmd: str, args=None):
         """명령 큐에 명령을 제출합니다."""
         if not self._running: return
         if args is None: args = {}
-        self._command_queue.put((cmd, args))
+        self._command_queue.put((PRIORITY_NORMAL, next(self._command_seq), cmd, args, None))
 
     def _process_command_queue(self):
         """명령 큐를 처리하고 하드웨어에 명령을 보냅니다."""
@@ -167,9 +205,10 @@ class HardwareManager(QtCore.QObject):
             return
 
         try:
-            cmd, args = self._command_queue.get_nowait()
+            item = self._command_queue.get_nowait()
         except queue.Empty:
             return
+        _, _, cmd, args, _ = item
 
         builder = self._command_map.get(cmd)
         if not builder:
@@ -181,20 +220,27 @@ class HardwareManager(QtCore.QObject):
             self.status_changed.emit(f"[오류] 명령에 대한 패킷을 만들 수 없습니다: {cmd}")
             return
 
-        self._write_to_serial(packet_to_send, cmd, args)
+        self._write_to_serial(packet_to_send, item)
 
-    def _write_to_serial(self, packet, cmd, args):
+    def _write_to_serial(self, packet, item):
         """시리얼 포트에 패킷을 씁니다."""
+        _, _, cmd, _, origin = item
         self._mutex.lock()
         try:
             if not self._communicator.is_open():
-                self.submit_command(cmd, args) # Re-queue if disconnected
+                if self._running:
+                    self._command_queue.put(item) # Re-queue if disconnected (우선순위 유지)
                 return
             self._communicator.write(packet)
             print(f"[HARDWARE] 패킷 전송: {packet.hex().upper()}")
             self._last_write_timestamp = time.time()
             if cmd == 'sensor_req':
                 self.request_sent.emit()
+            if origin is not None:
+                name, parsed_at = origin
+                latency_ms = (time.perf_counter() - parsed_at) * 1000
+                self._automation_latency.observe(latency_ms)
+                print(f"[AUTOMATION] 규칙 '{name}' 명령 전송 (지연 {latency_ms:.1f} ms)")
         except Exception as e:
             self._handle_serial_error(f"[오류] 시리얼 쓰기 오류: {e}")
         finally:
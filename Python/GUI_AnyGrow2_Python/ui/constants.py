@@ -1,4 +1,7 @@
 # ui/constants.py
+from core.alarm import (
+    LEVEL_NORMAL, LEVEL_WARNING, LEVEL_CRITICAL, compile_rules, load_threshold_rules
+)
 
 CROP_INFO = {
     "lettuce": ("상추", "엽채류, 14~16h 장일에서 잘 자람"),
@@ -17,33 +20,34 @@ MAX_CO2 = 4999.0
 MAX_ILLUM = 8000.0
 
 
+# 알람 수준별 색상
+LEVEL_COLORS = {
+    LEVEL_NORMAL: "#4caf50",
+    LEVEL_WARNING: "#ff9800",
+    LEVEL_CRITICAL: "#f44336",
+}
+
+# 임계값 규칙은 core/alarm.py 와 공유합니다. 규칙 파일이 바뀌면 MainController.thresholds_changed 로 다시 컴파일합니다.
+_COMPILED_RULES = compile_rules(load_threshold_rules())
+
+
+def set_threshold_rules(rules: dict):
+    """get_bar_color 가 사용할 임계값 규칙을 새 규칙으로 다시 컴파일합니다."""
+    global _COMPILED_RULES
+    _COMPILED_RULES = compile_rules(rules)
+
+
 def get_bar_color(sensor: str, value: float) -> str:
-    if sensor == "temp":
-        if value < 15 or value > 30:
-            return "#f44336"
-        elif 15 <= value <= 18 or 27 <= value <= 30:
-            return "#ff9800"
-        else:
-            return "#4caf50"
-    if sensor == "hum":
-        if value < 30 or value > 80:
-            return "#f44336"
-        elif 30 <= value <= 40 or 70 <= value <= 80:
-            return "#ff9800"
-        else:
-            return "#4caf50"
-    if sensor == "co2":
-        if value > 1500:
-            return "#f44336"
-        elif value > 1000:
-            return "#ff9800"
-        else:
-            return "#4caf50"
-    if sensor == "illum":
-        if value < 200:
-            return "#f44336"
-        elif value < 800:
-            return "#ff9800"
-        else:
-            return "#4caf50"
-    return "#4caf50"
+    """
+    임계값 규칙의 밴드로 값의 색상을 반환합니다. (히스테리시스/dwell 없는 즉시 판정)
+    실시간 표시는 AlarmEngine의 상태 전이 이벤트(AppState.alarm_changed)를 사용합니다.
+    """
+    compiled = _COMPILED_RULES.get(sensor)
+    if compiled is None:
+        return LEVEL_COLORS[LEVEL_NORMAL]
+    level, _side = compiled.bands[compiled.band_of(value)]
+    return LEVEL_COLORS[level]
+
+
+# 메인 윈도우 화면 갱신 빈도 (Hz). 신호가 이보다 자주 와도 최신 상태만 이 주기로 반영합니다. (10~30 권장)
+UI_UPDATE_HZ = 20
@@ -1,24 +1,34 @@
 # ui/main_window.py
 import sys
 import time
+from collections import deque
 from datetime import datetime
 
 from PyQt5 import QtCore, QtGui, QtWidgets
 
 from ui.widgets.sensor_widget import SensorWidget
-from ui.widgets.raw_data_widget import RawDataWidget
+from ui.widgets.raw_data_widget import RawDataWidget, RAW_LOG_MAX_LINES
+from ui.widgets.trend_widget import TrendWidget
 from ui.widgets.control_widget import ControlWidget
 from ui.widgets.schedule_widget import ScheduleWidget
+from ui.constants import UI_UPDATE_HZ, set_threshold_rules
 
 # 센서 데이터가 마지막으로 수신된 후 타임아웃으로 간주할 시간 (초)
 SENSOR_DATA_TIMEOUT = 5.0
+# 화면이 숨겨진 동안 보관할 추세 샘플 수 (초과분은 오래된 것부터 버림)
+PENDING_TREND_LIMIT = 3600
+# 빠른 시작 모드에서 예약 편집기 자리 높이 (편집기를 열어도 창 배치가 바뀌지 않도록)
+SCHEDULE_PLACEHOLDER_HEIGHT = 300
+RAW_TAB_INDEX = 1
 
 class AnyGrowMainWindow(QtWidgets.QMainWindow):
     """
     AnyGrow2 애플리케이션의 메인 윈도우 클래스입니다.
     모든 UI 컴포넌트를 조립하고 애플리케이션의 핵심 로직에 연결하는 역할을 합니다.
     """
-    def __init__(self, app_state, main_controller, hardware_manager, scheduler):
+    first_frame_shown = QtCore.pyqtSignal()  # 창이 처음 그려졌을 때 한 번 발생
+
+    def __init__(self, app_state, main_controller, hardware_manager, scheduler, lazy=False):
         """
         메인 윈도우를 초기화합니다.
         
@@ -27,8 +37,12 @@ class AnyGrowMainWindow(QtWidgets.QMainWindow):
             main_controller (MainController): 애플리케이션의 메인 컨트롤러입니다.
             hardware_manager (HardwareManager): 하드웨어 통신을 관리하는 객체입니다.
             scheduler (Scheduler): 예약된 작업을 실행하는 스케줄러입니다.
+            lazy (bool): 빠른 시작 모드. 예약 편집기, BMS 설정, 수신 데이터 보기를 처음 사용할 때 만듭니다.
         """
         super().__init__()
+        self._lazy = lazy
+        self._first_frame = False
+        self._watchdog = None
 
         self._app_state = app_state
         self._main_controller = main_controller
@@ -40,6 +54,16 @@ class AnyGrowMainWindow(QtWidgets.QMainWindow):
 
         self._last_data_timestamp = 0
 
+        # 화면 갱신 묶음 처리: 신호가 오면 상태만 모아 두고 프레임 주기마다 한 번 반영합니다.
+        self._pending_data = None                               # 최신 센서 값만 유지
+        self._pending_trend = deque(maxlen=PENDING_TREND_LIMIT)  # 추세 그래프는 모든 샘플 필요
+        self._pending_raw = deque(maxlen=RAW_LOG_MAX_LINES)
+        self._pending_status = None
+        self._pending_requests = 0
+        self._request_count = 0
+        self._last_flush = 0.0
+        self._frame_interval = 1.0 / UI_UPDATE_HZ
+
         central = QtWidgets.QWidget()
         self.setCentralWidget(central)
 
@@ -65,17 +89,26 @@ class AnyGrowMainWindow(QtWidgets.QMainWindow):
         left_panel = QtWidgets.QVBoxLayout()
         left_panel.setSpacing(8)
         self.sensor_widget = SensorWidget()
-        self.raw_data_widget = RawDataWidget()
+        self.raw_data_widget = None
+        self.trend_widget = TrendWidget(history_source=self._main_controller.query_history)
         self._setup_schedule_controls()
+
+        # 추세 그래프와 수신 패킷 문자열은 탭으로 나눠 표시합니다.
+        self.data_tabs = QtWidgets.QTabWidget()
+        self.data_tabs.addTab(self.trend_widget, "추세 그래프")
+        self.data_tabs.addTab(QtWidgets.QWidget(), "수신 데이터")
+        self.data_tabs.currentChanged.connect(self._on_data_tab_changed)
+        if not self._lazy:
+            self._ensure_raw_data_widget()
         
         left_panel.addWidget(self.sensor_widget, 0)
-        left_panel.addWidget(self.raw_data_widget, 1)
+        left_panel.addWidget(self.data_tabs, 1)
         left_panel.addWidget(self.gb_schedule)
         left_panel.addStretch(2)
         main_row.addLayout(left_panel, 1)
 
         # 오른쪽 패널: 수동 제어
-        self.control_widget = ControlWidget()
+        self.control_widget = ControlWidget(lazy=self._lazy)
         scroll_area = QtWidgets.QScrollArea()
         scroll_area.setWidgetResizable(True)
         scroll_area.setWidget(self.control_widget)
@@ -110,14 +143,72 @@ class AnyGrowMainWindow(QtWidgets.QMainWindow):
         top_bar.addWidget(self.lbl_current_time)
 
     def _setup_schedule_controls(self):
-        """UI의 예약 설정 섹션을 설정합니다."""
+        """UI의 예약 설정 섹션을 설정합니다. 빠른 시작 모드에서는 편집기 대신 여는 버튼만 둡니다."""
         self.gb_schedule = QtWidgets.QGroupBox("예약 설정")
-        root_v_layout = QtWidgets.QVBoxLayout(self.gb_schedule)
+        self._schedule_layout = QtWidgets.QVBoxLayout(self.gb_schedule)
+        self.schedule_widget = None
+        if self._lazy:
+            self.btn_open_schedule = QtWidgets.QPushButton("예약 설정 열기")
+            self.btn_open_schedule.setMinimumHeight(SCHEDULE_PLACEHOLDER_HEIGHT)
+            self.btn_open_schedule.clicked.connect(self._ensure_schedule_widget)
+            self._schedule_layout.addWidget(self.btn_open_schedule)
+        else:
+            self._ensure_schedule_widget()
+
+    def _ensure_schedule_widget(self):
+        """예약 편집기를 아직 만들지 않았다면 만들고, 이미 불러온 예약이 있으면 바로 표시합니다."""
+        if self.schedule_widget is not None:
+            return
+        started = time.perf_counter()
+        if self._lazy:
+            self.btn_open_schedule.hide()
+            self.btn_open_schedule.deleteLater()
         self.schedule_widget = ScheduleWidget()
-        root_v_layout.addWidget(self.schedule_widget)
+        self._schedule_layout.addWidget(self.schedule_widget)
+        self.schedule_widget.schedules_updated.connect(self._scheduler.update_schedules)
+        self._scheduler.schedules_loaded.connect(self._on_schedules_loaded)
+        if self._scheduler.is_loaded():
+            self.schedule_widget.load_schedules(self._scheduler.schedules)
+        else:
+            # 로딩이 끝나기 전의 편집은 Scheduler가 저장하지 않고 로딩 결과로 덮이므로, 끝날 때까지 막아 둡니다.
+            self.schedule_widget.setEnabled(False)
+            self.gb_schedule.setTitle("예약 설정 (불러오는 중...)")
+        print(f"[UI] 예약 편집기 생성 ({(time.perf_counter() - started) * 1000:.1f} ms)")
+
+    @QtCore.pyqtSlot(dict)
+    def _on_schedules_loaded(self, schedules):
+        """백그라운드 예약 로딩이 끝나면 편집기에 표시하고 편집을 허용합니다."""
+        self.schedule_widget.load_schedules(schedules)
+        self.schedule_widget.setEnabled(True)
+        self.gb_schedule.setTitle("예약 설정")
+
+    def _ensure_raw_data_widget(self):
+        """수신 데이터 보기를 아직 만들지 않았다면 만들어 탭에 넣습니다. 그동안 모인 패킷은 다음 프레임에 표시됩니다."""
+        if self.raw_data_widget is not None:
+            return
+        self.raw_data_widget = RawDataWidget()
+        current = self.data_tabs.currentIndex()
+        placeholder = self.data_tabs.widget(RAW_TAB_INDEX)
+        self.data_tabs.blockSignals(True)
+        self.data_tabs.removeTab(RAW_TAB_INDEX)
+        self.data_tabs.insertTab(RAW_TAB_INDEX, self.raw_data_widget, "수신 데이터")
+        self.data_tabs.setCurrentIndex(current)
+        self.data_tabs.blockSignals(False)
+        placeholder.deleteLater()
+        if self._pending_raw:
+            self._schedule_flush()
+
+    def _on_data_tab_changed(self, index: int):
+        if index == RAW_TAB_INDEX:
+            self._ensure_raw_data_widget()
         
     def _start_ui_timers(self):
         """UI 업데이트를 위한 타이머를 시작합니다."""
+        # 모아 둔 상태를 화면에 반영하는 단발성 타이머
+        self.flush_timer = QtCore.QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.timeout.connect(self._flush_ui_updates)
+
         # 메인 시계용 타이머
         self.clock_timer = QtCore.QTimer(self)
         self.clock_timer.setInterval(1000)
@@ -141,37 +232,129 @@ class AnyGrowMainWindow(QtWidgets.QMainWindow):
         
         # 하드웨어 매니저 시그널
         self._hardware_manager.status_changed.connect(self.set_serial_status)
-        self._hardware_manager.raw_string_updated.connect(self.raw_data_widget.set_text)
+        self._hardware_manager.raw_string_updated.connect(self._on_raw_string)
         self._hardware_manager.request_sent.connect(self._increment_request_count)
 
         # 메인 컨트롤러 및 앱 상태 시그널
         self.btn_reconnect.clicked.connect(self._main_controller.reconnect_hardware)
+        self._main_controller.thresholds_changed.connect(set_threshold_rules)
         self._app_state.data_updated.connect(self._on_app_state_updated)
+        self._app_state.alarm_changed.connect(self.sensor_widget.set_alarm_level)
         
-        # 스케줄러 시그널
-        self.schedule_widget.schedules_updated.connect(self._scheduler.update_schedules)
-        self._scheduler.schedules_loaded.connect(self.schedule_widget.load_schedules)
+        # 스케줄러 시그널 (예약 편집기와의 연결은 _ensure_schedule_widget에서)
         self._scheduler.schedule_status_updated.connect(self.set_serial_status)
 
+    # ============================================================
+    # 화면 갱신 묶음 처리
+    # ============================================================
+    def set_update_rate(self, hz: float):
+        """화면 갱신 빈도(Hz)를 바꿉니다. 10~30Hz를 권장합니다."""
+        self._frame_interval = 1.0 / max(1.0, float(hz))
+
+    def _is_display_paused(self) -> bool:
+        """창이 최소화되었거나 숨겨져 있으면 화면 갱신을 멈춥니다."""
+        return self.isMinimized() or not self.isVisible()
+
+    def _schedule_flush(self):
+        """다음 프레임에 반영하도록 예약합니다. 이미 예약되어 있거나 화면이 멈춘 상태면 아무것도 하지 않습니다."""
+        if self.flush_timer.isActive() or self._is_display_paused():
+            return
+        wait = self._frame_interval - (time.monotonic() - self._last_flush)
+        self.flush_timer.start(max(0, int(wait * 1000)))
+
+    def _flush_ui_updates(self):
+        """모아 둔 상태를 한 번에 위젯에 반영합니다. 값은 항상 가장 최근 것만 표시합니다."""
+        if self._is_display_paused():
+            return
+        self._last_flush = time.monotonic()
+
+        if self._pending_data is not None:
+            self.sensor_widget.update_sensor_bars(self._pending_data)
+            self._pending_data = None
+        while self._pending_trend:
+            self.trend_widget.append_reading(self._pending_trend.popleft())
+        # 수신 데이터 보기를 아직 만들지 않았다면 최근 패킷만 보관해 둡니다. (deque 최대 길이)
+        if self._pending_raw and self.raw_data_widget is not None:
+            self.raw_data_widget.append_texts(list(self._pending_raw))
+            self._pending_raw.clear()
+        if self._pending_status is not None:
+            self.lbl_serial_status.setText(self._pending_status)
+            self._pending_status = None
+        if self._pending_requests:
+            self._request_count += self._pending_requests
+            self._pending_requests = 0
+            self.lbl_req_count.setText(str(self._request_count))
+
+    def _set_display_paused(self, paused: bool):
+        """최소화/숨김 시 시계와 갱신 타이머를 멈추고, 복귀하면 즉시 최신 상태를 반영합니다."""
+        if paused:
+            self.flush_timer.stop()
+            self.clock_timer.stop()
+            self.sensor_status_timer.stop()
+            return
+        if not self.clock_timer.isActive():
+            self.clock_timer.start()
+            self.sensor_status_timer.start()
+            self._update_clock()
+            self._check_sensor_data_age()
+        self._schedule_flush()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self._first_frame:
+            self._first_frame = True
+            self.first_frame_shown.emit()
+
+    def changeEvent(self, event):
+        if event.type() == QtCore.QEvent.WindowStateChange:
+            self._set_display_paused(self._is_display_paused())
+        super().changeEvent(event)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._set_display_paused(self._is_display_paused())
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._set_display_paused(True)
+
     @QtCore.pyqtSlot(dict)
     def _on_app_state_updated(self, data: dict):
-        """센서 데이터가 업데이트될 때 UI를 새로고침하는 슬롯."""
-        self.sensor_widget.update_sensor_bars(data)
+        """센서 데이터가 업데이트될 때 UI 갱신을 예약하는 슬롯."""
+        self._pending_data = data
+        self._pending_trend.append(data)
         self._last_data_timestamp = time.time()
+        self._schedule_flush()
+
+    @QtCore.pyqtSlot(str)
+    def _on_raw_string(self, text: str):
+        """수신 패킷 문자열을 모아 두었다가 다음 프레임에 로그에 추가합니다."""
+        self._pending_raw.append(text)
+        self._schedule_flush()
 
     @QtCore.pyqtSlot(str)
     def set_serial_status(self, text: str):
-        """시리얼 상태 라벨의 텍스트를 설정합니다."""
-        self.lbl_serial_status.setText(text)
+        """시리얼 상태 라벨의 텍스트를 설정합니다. (다음 프레임에 최신 텍스트만 반영)"""
+        self._pending_status = text
+        self._schedule_flush()
     
     @QtCore.pyqtSlot()
     def _increment_request_count(self):
         """센서 요청 카운터를 1 증가시킵니다."""
-        try:
-            cnt = int(self.lbl_req_count.text()) + 1
-        except ValueError:
-            cnt = 1
-        self.lbl_req_count.setText(str(cnt))
+        self._pending_requests += 1
+        self._schedule_flush()
+
+    def set_watchdog(self, watchdog):
+        """이벤트 루프 정지 감시기를 연결합니다. 센서 수신 경고에 정지 여부를 함께 표시합니다."""
+        self._watchdog = watchdog
+
+    def _stall_note(self) -> str:
+        """최근 이벤트 루프 정지가 있었다면 경고 문구에 붙일 설명을 반환합니다."""
+        if self._watchdog is None:
+            return ""
+        stalled = [name for name in ("GUI", "HARDWARE")
+                   if self._watchdog.recently_stalled(name, SENSOR_DATA_TIMEOUT * 2)]
+        return f" - {', '.join(stalled)} 이벤트 루프 정지 감지" if stalled else ""
 
     def _check_sensor_data_age(self):
         """마지막 데이터 수신 후 경과 시간을 확인하고 상태 라벨을 업데이트합니다."""
@@ -183,7 +366,8 @@ class AnyGrowMainWindow(QtWidgets.QMainWindow):
         if age_sec < SENSOR_DATA_TIMEOUT:
             self.sensor_widget.set_sensor_status_text(f"센서 통신 정상 (마지막 수신 {age_sec:4.1f}초 전)")
         else:
-            self.sensor_widget.set_sensor_status_text(f"⚠ 센서 데이터 안 들어옴 (마지막 수신 {age_sec:4.1f}초 전)")
+            self.sensor_widget.set_sensor_status_text(
+                f"⚠ 센서 데이터 안 들어옴 (마지막 수신 {age_sec:4.1f}초 전){self._stall_note()}")
             
     def _update_clock(self):
         """메인 시계 표시를 업데이트합니다."""
@@ -1,49 +1,139 @@
 # ui/widgets/analog_clock_widget.py
 from PyQt5 import QtCore, QtGui, QtWidgets
 import math
+import time
+
+# ============================================================
+# Helper Functions & Constants
+# ============================================================
+# 스타일별 바늘 범위 (이름, 중심 뒤쪽 길이, 바늘 길이, 반폭) - 200x200 논리 좌표 기준.
+# 시간이 바뀔 때 이 범위만 다시 그리도록 변경 영역을 계산하는 데 사용합니다.
+_HAND_EXTENTS = {
+    1: (("hour", 8, 60, 7), ("minute", 10, 80, 4), ("second", 10, 90, 3)),
+    2: (("hour", 4, 54, 4), ("minute", 3, 73, 3), ("second", 11, 81, 1)),
+    3: (("hour", 2, 57, 2), ("minute", 1, 76, 1)),
+    4: (("hour", 3, 43, 3), ("minute", 2, 62, 2)),
+}
+_DIRTY_MARGIN = 2   # 안티앨리어싱 가장자리 여유 (픽셀)
+
+
+def _hand_angles(t: QtCore.QTime) -> dict:
+    return {
+        "hour": 30.0 * (t.hour() + t.minute() / 60.0),
+        "minute": 6.0 * (t.minute() + t.second() / 60.0),
+        "second": 6.0 * t.second(),
+    }
+
 
 class AnalogClockWidget(QtWidgets.QWidget):
+    """
+    아날로그 시계 위젯입니다.
+    눈금/숫자/배경 같은 정적인 문자판은 스타일별로 한 번만 픽스맵(기기 픽셀 비율 반영)에 그려 두고,
+    매 틱에는 캐시된 문자판을 복사한 뒤 바늘만 그립니다. 크기나 스타일이 바뀌면 캐시를 다시 만듭니다.
+    시간이 바뀌면 이전/새 바늘이 차지하는 영역만 다시 그리도록 요청합니다.
+    """
     def __init__(self, parent=None):
         super().__init__(parent)
         self._time = QtCore.QTime.currentTime()
         self.setMinimumSize(100, 100)
         self.style_id = 1 # Default to style 1
+        self._face_cache = {}   # style_id -> QPixmap
+        self._paint_times = {}  # style_id -> [횟수, 누적 초]
 
     def setTime(self, time):
         if isinstance(time, QtCore.QTime):
+            if time == self._time:
+                return
+            dirty = self._hands_region(self._time).united(self._hands_region(time))
             self._time = time
-            self.update()
+            self.update(dirty)
 
     def setStyle(self, style_id):
+        if style_id == self.style_id:
+            return
         self.style_id = style_id
         self.update()
 
-    def paintEvent(self, event):
+    def resizeEvent(self, event):
+        self._face_cache.clear()
+        super().resizeEvent(event)
+
+    # ------------------------------------------------------------
+    # 좌표 / 캐시
+    # ------------------------------------------------------------
+    def _logical_transform(self) -> QtGui.QTransform:
+        """200x200 논리 좌표(중심 원점)를 위젯 좌표로 바꾸는 변환입니다."""
         side = min(self.width(), self.height())
-        
-        painter = QtGui.QPainter(self)
+        transform = QtGui.QTransform()
+        transform.translate(self.width() / 2, self.height() / 2)
+        transform.scale(side / 200.0, side / 200.0)
+        return transform
+
+    def _hands_region(self, t: QtCore.QTime) -> QtGui.QRegion:
+        """시각 t의 바늘들이 차지하는 위젯 영역입니다."""
+        transform = self._logical_transform()
+        angles = _hand_angles(t)
+        region = QtGui.QRegion()
+        for name, tail, length, half in _HAND_EXTENTS.get(self.style_id, _HAND_EXTENTS[1]):
+            rotate = QtGui.QTransform().rotate(angles[name])
+            polygon = QtGui.QPolygonF([
+                QtCore.QPointF(-half, tail), QtCore.QPointF(half, tail),
+                QtCore.QPointF(half, -length), QtCore.QPointF(-half, -length),
+            ])
+            rect = (rotate * transform).map(polygon).boundingRect().toAlignedRect()
+            region = region.united(rect.adjusted(-_DIRTY_MARGIN, -_DIRTY_MARGIN, _DIRTY_MARGIN, _DIRTY_MARGIN))
+        return region
+
+    def _begin_logical(self, painter: QtGui.QPainter):
         painter.setRenderHint(QtGui.QPainter.Antialiasing)
-        painter.translate(self.width() / 2, self.height() / 2)
-        painter.scale(side / 200.0, side / 200.0)
-
-        if self.style_id == 1:
-            self._paint_style_1(painter)
-        elif self.style_id == 2:
-            self._paint_style_2(painter)
-        elif self.style_id == 3:
-            self._paint_style_3(painter)
-        elif self.style_id == 4:
-            self._paint_style_4(painter)
-        else:
-            self._paint_style_1(painter) # Default
-
-    def _paint_style_1(self, painter): # Classic Thick Hands
-        hour_hand_color = QtGui.QColor(0, 0, 0)
-        minute_hand_color = QtGui.QColor(50, 50, 50)
-        second_hand_color = QtGui.QColor(255, 0, 0)
-        hour_hand_poly = QtGui.QPolygonF([QtCore.QPointF(-7, 8), QtCore.QPointF(7, 8), QtCore.QPointF(0, -60)])
-        minute_hand_poly = QtGui.QPolygonF([QtCore.QPointF(-4, 10), QtCore.QPointF(4, 10), QtCore.QPointF(0, -80)])
+        painter.setTransform(self._logical_transform(), True)
+
+    def _face_pixmap(self) -> QtGui.QPixmap:
+        """현재 스타일의 정적 문자판 픽스맵을 반환합니다. 없으면 만들어 캐시합니다."""
+        pixmap = self._face_cache.get(self.style_id)
+        if pixmap is None:
+            dpr = self.devicePixelRatioF()
+            pixmap = QtGui.QPixmap(int(self.width() * dpr), int(self.height() * dpr))
+            pixmap.setDevicePixelRatio(dpr)
+            pixmap.fill(QtCore.Qt.transparent)
+            painter = QtGui.QPainter(pixmap)
+            painter.setFont(self.font())
+            self._begin_logical(painter)
+            self._paint_face(painter)
+            painter.end()
+            self._face_cache[self.style_id] = pixmap
+        return pixmap
+
+    # ------------------------------------------------------------
+    # 그리기
+    # ------------------------------------------------------------
+    def paintEvent(self, event):
+        started = time.perf_counter()
+        painter = QtGui.QPainter(self)
+        painter.drawPixmap(0, 0, self._face_pixmap())
+        self._begin_logical(painter)
+        self._paint_hands(painter)
+        painter.end()
+
+        stats = self._paint_times.setdefault(self.style_id, [0, 0.0])
+        stats[0] += 1
+        stats[1] += time.perf_counter() - started
+
+    def paint_stats(self) -> dict:
+        """스타일별 paintEvent 평균 시간(ms)을 반환합니다."""
+        return {style: total / count * 1000 for style, (count, total) in self._paint_times.items() if count}
 
+    def _paint_face(self, painter):
+        faces = {2: self._paint_face_2, 3: self._paint_face_3, 4: self._paint_face_4}
+        faces.get(self.style_id, self._paint_face_1)(painter)
+
+    def _paint_hands(self, painter):
+        hands = {2: self._paint_hands_2, 3: self._paint_hands_3, 4: self._paint_hands_4}
+        hands.get(self.style_id, self._paint_hands_1)(painter)
+
+    # Style 1: Classic Thick Hands
+    def _paint_face_1(self, painter):
+        hour_hand_color = QtGui.QColor(0, 0, 0)
         painter.setPen(QtGui.QPen(hour_hand_color, 4))
         for i in range(12):
             painter.drawLine(88, 0, 96, 0)
@@ -53,19 +143,26 @@ class AnalogClockWidget(QtWidgets.QWidget):
             if (j % 5) != 0: painter.drawLine(92, 0, 96, 0)
             painter.rotate(6.0)
 
+    def _paint_hands_1(self, painter):
+        hour_hand_color = QtGui.QColor(0, 0, 0)
+        minute_hand_color = QtGui.QColor(50, 50, 50)
+        second_hand_color = QtGui.QColor(255, 0, 0)
+        hour_hand_poly = QtGui.QPolygonF([QtCore.QPointF(-7, 8), QtCore.QPointF(7, 8), QtCore.QPointF(0, -60)])
+        minute_hand_poly = QtGui.QPolygonF([QtCore.QPointF(-4, 10), QtCore.QPointF(4, 10), QtCore.QPointF(0, -80)])
+
         painter.setPen(QtCore.Qt.NoPen)
         painter.setBrush(QtGui.QBrush(hour_hand_color))
         painter.save()
         painter.rotate(30.0 * ((self._time.hour() + self._time.minute() / 60.0)))
         painter.drawConvexPolygon(hour_hand_poly)
         painter.restore()
-        
+
         painter.setBrush(QtGui.QBrush(minute_hand_color))
         painter.save()
         painter.rotate(6.0 * (self._time.minute() + self._time.second() / 60.0))
         painter.drawConvexPolygon(minute_hand_poly)
         painter.restore()
-        
+
         painter.setPen(QtGui.QPen(second_hand_color, 2))
         painter.save()
         painter.rotate(6.0 * self._time.second())
@@ -74,16 +171,19 @@ class AnalogClockWidget(QtWidgets.QWidget):
         painter.setBrush(QtGui.QBrush(second_hand_color))
         painter.drawEllipse(-3, -3, 6, 6)
 
-    def _paint_style_2(self, painter): # Modern Line Caps
+    # Style 2: Modern Line Caps
+    def _paint_face_2(self, painter):
         hour_color = QtGui.QColor(50, 50, 150)
-        minute_color = QtGui.QColor(100, 100, 150, 191)
-        second_color = QtGui.QColor(200, 100, 100, 150)
-
         painter.setPen(QtGui.QPen(hour_color, 6))
         for i in range(12):
             painter.drawLine(92, 0, 96, 0)
             painter.rotate(30.0)
 
+    def _paint_hands_2(self, painter):
+        hour_color = QtGui.QColor(50, 50, 150)
+        minute_color = QtGui.QColor(100, 100, 150, 191)
+        second_color = QtGui.QColor(200, 100, 100, 150)
+
         painter.setPen(QtGui.QPen(hour_color, 8, QtCore.Qt.SolidLine, QtCore.Qt.RoundCap))
         painter.save()
         painter.rotate(30.0 * ((self._time.hour() + self._time.minute() / 60.0)))
@@ -95,17 +195,16 @@ class AnalogClockWidget(QtWidgets.QWidget):
         painter.rotate(6.0 * (self._time.minute() + self._time.second() / 60.0))
         painter.drawLine(0, 0, 0, -70)
         painter.restore()
-        
+
         painter.setPen(QtGui.QPen(second_color, 2, QtCore.Qt.SolidLine, QtCore.Qt.RoundCap))
         painter.save()
         painter.rotate(6.0 * self._time.second())
         painter.drawLine(0, 10, 0, -80)
         painter.restore()
 
-    def _paint_style_3(self, painter): # Minimal Thin
+    # Style 3: Minimal Thin
+    def _paint_face_3(self, painter):
         line_color = QtGui.QColor(10, 10, 10)
-        second_color = QtGui.QColor(150, 150, 150, 127)
-
         painter.setPen(line_color)
         for i in range(12):
             if i % 3 == 0:
@@ -113,6 +212,9 @@ class AnalogClockWidget(QtWidgets.QWidget):
                 painter.drawLine(85, 0, 96, 0)
             painter.rotate(30.0)
 
+    def _paint_hands_3(self, painter):
+        line_color = QtGui.QColor(10, 10, 10)
+
         painter.setPen(QtGui.QPen(line_color, 3, QtCore.Qt.SolidLine, QtCore.Qt.RoundCap))
         painter.save()
         painter.rotate(30.0 * ((self._time.hour() + self._time.minute() / 60.0)))
@@ -127,11 +229,10 @@ class AnalogClockWidget(QtWidgets.QWidget):
 
         # No second hand for minimal style
 
-    def _paint_style_4(self, painter): # Detailed with Numbers
+    # Style 4: Detailed with Numbers
+    def _paint_face_4(self, painter):
         background_color = QtGui.QColor(240, 240, 240)
         number_color = QtGui.QColor(50, 50, 50)
-        hour_color = QtGui.QColor(0, 0, 0)
-        minute_color = QtGui.QColor(50, 50, 50)
 
         # Draw background
         painter.setPen(QtCore.Qt.NoPen)
@@ -151,6 +252,10 @@ class AnalogClockWidget(QtWidgets.QWidget):
             y = 80 * math.sin(_rad)
             painter.drawText(QtCore.QRectF(x - 15, y - 15, 30, 30), QtCore.Qt.AlignCenter, str(i))
 
+    def _paint_hands_4(self, painter):
+        hour_color = QtGui.QColor(0, 0, 0)
+        minute_color = QtGui.QColor(50, 50, 50)
+
         # Draw hour hand
         painter.setPen(QtGui.QPen(hour_color, 6, QtCore.Qt.SolidLine, QtCore.Qt.RoundCap))
         painter.save()
@@ -165,4 +270,49 @@ class AnalogClockWidget(QtWidgets.QWidget):
         painter.drawLine(0, 0, 0, -60)
         painter.restore()
 
-        # No second hand for this style
\ No newline at end of file
+        # No second hand for this style.
+
+
+# ============================================================
+# Paint Benchmark
+# ============================================================
+def measure_paint_times(size: int = 120, iterations: int = 300) -> dict:
+    """
+    스타일별로 "문자판+바늘 전체 그리기"와 "캐시된 문자판 복사+바늘"의 1회 평균 시간(ms)을 비교합니다.
+    QApplication이 있어야 합니다. 반환값: {style_id: (전체 ms, 캐시 ms)}
+    """
+    clock = AnalogClockWidget()
+    clock.resize(size, size)
+    target = QtGui.QPixmap(size, size)
+    results = {}
+    for style_id in sorted(_HAND_EXTENTS):
+        clock.setStyle(style_id)
+        timings = []
+        for cached in (False, True):
+            clock._face_cache.clear()
+            clock._face_pixmap()  # 캐시 준비 (측정에서 제외)
+            started = time.perf_counter()
+            for n in range(iterations):
+                clock._time = QtCore.QTime(n % 24, n % 60, n % 60)
+                target.fill(QtCore.Qt.white)
+                painter = QtGui.QPainter(target)
+                if cached:
+                    painter.drawPixmap(0, 0, clock._face_pixmap())
+                    clock._begin_logical(painter)
+                else:
+                    clock._begin_logical(painter)
+                    painter.save()
+                    clock._paint_face(painter)
+                    painter.restore()
+                clock._paint_hands(painter)
+                painter.end()
+            timings.append((time.perf_counter() - started) / iterations * 1000)
+        results[style_id] = tuple(timings)
+        print(f"[UI] 시계 스타일 {style_id}: 전체 {timings[0]:.3f} ms → 캐시 {timings[1]:.3f} ms")
+    return results
+
+
+if __name__ == "__main__":
+    import sys
+    app = QtWidgets.QApplication(sys.argv)
+    measure_paint_times()
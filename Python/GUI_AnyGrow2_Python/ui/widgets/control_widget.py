@@ -12,8 +12,12 @@ class ControlWidget(QtWidgets.QWidget):
     uv_command = QtCore.pyqtSignal(bool)
     bms_time_sync_command = QtCore.pyqtSignal(datetime)
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, lazy=False):
+        """lazy=True이면 BMS 시간 설정 영역은 처음 열 때 만듭니다. (빠른 시작 모드)"""
         super().__init__(parent)
+        self._lazy = lazy
+        self._last_bms_dt = None
+        self.bms_analog_clock = None
         
         layout = QtWidgets.QVBoxLayout(self)
         layout.setSpacing(8)
@@ -117,7 +121,22 @@ class ControlWidget(QtWidgets.QWidget):
         
     def _setup_bms_controls(self):
         self.gb_bms = QtWidgets.QGroupBox("BMS 시간 설정")
-        bms_layout = QtWidgets.QVBoxLayout(self.gb_bms)
+        self._bms_layout = QtWidgets.QVBoxLayout(self.gb_bms)
+        if self._lazy:
+            self.btn_open_bms = QtWidgets.QPushButton("BMS 시간 설정 열기")
+            self.btn_open_bms.clicked.connect(self.ensure_bms_controls)
+            self._bms_layout.addWidget(self.btn_open_bms)
+        else:
+            self.ensure_bms_controls()
+
+    def ensure_bms_controls(self):
+        """BMS 시계/시간 조정 위젯을 아직 만들지 않았다면 만듭니다."""
+        if self.bms_analog_clock is not None:
+            return
+        if self._lazy:
+            self.btn_open_bms.hide()
+            self.btn_open_bms.deleteLater()
+        bms_layout = self._bms_layout
 
         time_display_layout = QtWidgets.QHBoxLayout()
         self.bms_analog_clock = AnalogClockWidget()
@@ -146,9 +165,15 @@ class ControlWidget(QtWidgets.QWidget):
         bms_layout.addSpacing(40)
         bms_layout.addWidget(self.bms_time_adjustment_widget)
 
+        if self._last_bms_dt is not None:
+            self.update_bms_display(self._last_bms_dt)
+
     @QtCore.pyqtSlot(datetime)
     def update_bms_display(self, dt: datetime):
         """Updates the BMS time display widgets with the given datetime."""
+        self._last_bms_dt = dt
+        if self.bms_analog_clock is None:
+            return  # 아직 만들지 않음 - 열 때 마지막 값으로 표시
         now_str = dt.strftime("%H시 %M분")
         self.lbl_bms_current_time.setText(now_str)
         self.bms_analog_clock.setTime(QtCore.QTime(dt.hour, dt.minute, dt.second))
\ No newline at end of file
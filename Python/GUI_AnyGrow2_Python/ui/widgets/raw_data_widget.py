@@ -1,22 +1,200 @@
 # ui/widgets/raw_data_widget.py
+import time
+from collections import deque
 
-from PyQt5 import QtWidgets
+from PyQt5 import QtGui, QtWidgets
 
+from core.protocol import PacketParser
+
+# ============================================================
+# Helper Functions & Constants
+# ============================================================
+RAW_LOG_MAX_LINES = 500     # 화면과 메모리에 보관하는 최대 줄 수 (오래된 줄부터 삭제)
+EMPTY_TEXT = "(아직 수신된 데이터 없음)"
+
+KIND_SENSOR = "sensor"
+KIND_OTHER = "other"
+KIND_ERROR = "error"
+
+# (표시 이름, 포함할 종류) - 필터 콤보박스 항목
+FILTERS = [
+    ("전체", (KIND_SENSOR, KIND_OTHER, KIND_ERROR)),
+    ("센서 패킷", (KIND_SENSOR,)),
+    ("기타 패킷", (KIND_OTHER,)),
+    ("파싱 실패", (KIND_ERROR,)),
+]
+
+
+def classify_packet(arr: list) -> str:
+    """
+    수신 패킷(16진수 문자열 리스트)의 종류를 판정합니다.
+    센서 패킷 식별자(02 02)가 있는데 파싱되지 않거나 길이가 모자라면 파싱 실패로 봅니다.
+    """
+    if len(arr) < 30:
+        return KIND_ERROR
+    if arr[-30] == "02" and arr[-29] == "02":
+        return KIND_SENSOR if PacketParser.parse_sensor_packet(arr) is not None else KIND_ERROR
+    return KIND_OTHER
+
+
+def _to_ascii(arr: list) -> str:
+    """16진수 문자열 리스트를 출력 가능한 ASCII로 바꿉니다. (그 외 바이트는 '.')"""
+    chars = []
+    for h in arr:
+        try:
+            b = int(h, 16)
+        except ValueError:
+            b = 0
+        chars.append(chr(b) if 0x20 <= b < 0x7f else ".")
+    return "".join(chars)
+
+
+# ============================================================
+# Raw Data Widget Class
+# ============================================================
 class RawDataWidget(QtWidgets.QGroupBox):
+    """
+    수신 패킷을 로그 형태로 보여줍니다.
+    패킷마다 문서를 새로 만들지 않고, 메인 윈도우가 한 프레임 동안 모은 패킷(append_texts)을
+    한 번의 편집으로 끝에 추가하며 최대 줄 수(setMaximumBlockCount)를 넘는 앞부분은 Qt가 잘라냅니다.
+    장치가 빠르게 보내도 화면 갱신 횟수는 메인 윈도우의 프레임 주기로 일정하므로 CPU 사용량이 늘지 않습니다.
+    """
     def __init__(self, parent=None):
         super().__init__("센서 데이터 (수신 패킷 문자열)", parent)
 
         raw_v = QtWidgets.QVBoxLayout(self)
         raw_v.setContentsMargins(8, 6, 8, 8)
 
+        top = QtWidgets.QHBoxLayout()
+        self.chk_pause = QtWidgets.QCheckBox("일시정지")
+        self.chk_pause.toggled.connect(self._on_pause_toggled)
+        self.cmb_format = QtWidgets.QComboBox()
+        self.cmb_format.addItems(["HEX", "ASCII"])
+        self.cmb_format.currentIndexChanged.connect(lambda _i: self._rerender())
+        self.cmb_filter = QtWidgets.QComboBox()
+        for label, _kinds in FILTERS:
+            self.cmb_filter.addItem(label)
+        self.cmb_filter.currentIndexChanged.connect(lambda _i: self._rerender())
+        self.btn_clear = QtWidgets.QPushButton("지우기")
+        self.btn_clear.clicked.connect(self.reset)
+        self.lbl_stats = QtWidgets.QLabel()
+
+        top.addWidget(self.chk_pause)
+        top.addWidget(QtWidgets.QLabel("표시:"))
+        top.addWidget(self.cmb_format)
+        top.addWidget(QtWidgets.QLabel("필터:"))
+        top.addWidget(self.cmb_filter)
+        top.addWidget(self.btn_clear)
+        top.addStretch(1)
+        top.addWidget(self.lbl_stats)
+        raw_v.addLayout(top)
+
         self.txt_raw = QtWidgets.QPlainTextEdit()
         self.txt_raw.setReadOnly(True)
-        self.txt_raw.setPlainText("(아직 수신된 데이터 없음)")
+        self.txt_raw.setUndoRedoEnabled(False)
+        self.txt_raw.setMaximumBlockCount(RAW_LOG_MAX_LINES)
         self.txt_raw.setLineWrapMode(QtWidgets.QPlainTextEdit.WidgetWidth) # Enable word wrap
+        self.txt_raw.setFont(QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.FixedFont))
+        self.txt_raw.setPlaceholderText(EMPTY_TEXT)
         raw_v.addWidget(self.txt_raw)
 
+        self._formats = {
+            KIND_SENSOR: QtGui.QTextCharFormat(),
+            KIND_OTHER: QtGui.QTextCharFormat(),
+            KIND_ERROR: QtGui.QTextCharFormat(),
+        }
+        self._formats[KIND_OTHER].setForeground(QtGui.QColor("#757575"))
+        self._formats[KIND_ERROR].setForeground(QtGui.QColor("#c62828"))
+        self._formats[KIND_ERROR].setBackground(QtGui.QColor("#ffebee"))
+
+        # 최근 기록 (형식/필터 변경 시 다시 그리기용)과 일시정지 순간의 기록 (일시정지 중 다시 그리기용)
+        self._records = deque(maxlen=RAW_LOG_MAX_LINES)
+        self._frozen = None
+        self._total = 0
+        self._errors = 0
+        self._update_stats()
+
     def set_text(self, text: str):
-        self.txt_raw.setPlainText(text)
+        """수신 패킷 문자열("02,02,...") 하나를 기록하고 화면에 추가합니다."""
+        self.append_texts([text])
+
+    def append_texts(self, texts):
+        """
+        수신 패킷 문자열 여러 개를 기록하고 한 번의 편집으로 화면에 추가합니다.
+        일시정지 중에는 기록만 하고 화면은 그대로 둡니다.
+        """
+        records = []
+        for text in texts:
+            arr = text.split(",") if text else []
+            kind = classify_packet(arr)
+            records.append((time.time(), kind, arr))
+            if kind == KIND_ERROR:
+                self._errors += 1
+        if not records:
+            return
+        self._records.extend(records)
+        self._total += len(records)
+        if not self.chk_pause.isChecked():
+            self._write_records(records)
+        self._update_stats()
 
     def reset(self):
-        self.set_text("(아직 수신된 데이터 없음)")
+        self._records.clear()
+        if self._frozen is not None:
+            self._frozen = []
+        self._total = self._errors = 0
+        self.txt_raw.clear()
+        self._update_stats()
+
+    # ------------------------------------------------------------
+    # 내부 처리
+    # ------------------------------------------------------------
+    def _format_record(self, record) -> str:
+        t, _kind, arr = record
+        stamp = time.strftime("%H:%M:%S", time.localtime(t)) + f".{int(t * 1000) % 1000:03d}"
+        body = _to_ascii(arr) if self.cmb_format.currentIndex() == 1 else " ".join(arr)
+        return f"{stamp}  {body}"
+
+    def _write_records(self, records):
+        """기록들을 한 번의 편집 블록으로 문서 끝에 추가합니다. 사용자가 위로 스크롤했다면 위치를 유지합니다."""
+        kinds = FILTERS[self.cmb_filter.currentIndex()][1]
+        records = [r for r in records if r[1] in kinds]
+        if not records:
+            return
+        scrollbar = self.txt_raw.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum() - 2
+
+        cursor = QtGui.QTextCursor(self.txt_raw.document())
+        cursor.movePosition(QtGui.QTextCursor.End)
+        cursor.beginEditBlock()
+        first = self.txt_raw.document().isEmpty()
+        for record in records[-RAW_LOG_MAX_LINES:]:
+            if not first:
+                cursor.insertBlock()
+            first = False
+            cursor.insertText(self._format_record(record), self._formats[record[1]])
+        cursor.endEditBlock()
+
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
+
+    def _rerender(self):
+        """
+        형식/필터가 바뀌면 보관 중인 기록으로 화면을 다시 만듭니다.
+        일시정지 중에는 일시정지 순간까지의 기록만 그려서, 그 뒤에 들어온 패킷이 보이지 않게 합니다.
+        """
+        self.txt_raw.clear()
+        self._write_records(self._frozen if self._frozen is not None else list(self._records))
+
+    def _on_pause_toggled(self, paused: bool):
+        if paused:
+            self._frozen = list(self._records)
+        else:
+            # 일시정지 동안 쌓인 기록까지 포함해 다시 그립니다.
+            self._frozen = None
+            self._rerender()
+        self._update_stats()
+
+    def _update_stats(self):
+        state = " (일시정지)" if self.chk_pause.isChecked() else ""
+        self.lbl_stats.setText(f"수신 {self._total}건 · 파싱 실패 {self._errors}건{state}")
@@ -0,0 +1,241 @@
+# ui/widgets/schedule_list_model.py
+from PyQt5 import QtCore, QtWidgets, QtGui
+
+from core.schedule_store import minutes_to_text
+
+# ============================================================
+# Helper Functions & Constants
+# ============================================================
+ROW_HEIGHT = 34             # 모든 행의 높이를 같게 하여 QListView가 보이는 행만 배치/그리도록 함
+EDIT_BUTTON_WIDTH = 60
+ROW_MARGIN = 2
+AVAILABLE_TARGETS = ["전체 LED", "양액 펌프", "UV 필터"]
+AVAILABLE_ACTIONS = ["켜기 (ON)", "끄기 (OFF)"]
+
+ScheduleRole = QtCore.Qt.UserRole + 1   # 예약 딕셔너리 자체
+
+
+# ============================================================
+# Schedule List Model Class
+# ============================================================
+class ScheduleListModel(QtCore.QAbstractListModel):
+    """
+    하루치 예약 목록(딕셔너리 리스트)을 감싸는 모델입니다.
+    리스트는 복사하지 않고 참조로 보관하므로, 모델을 통한 수정은 schedules 데이터에 바로 반영됩니다.
+    추가/삭제/수정은 해당 행만 알리므로 뷰 전체를 다시 만들지 않습니다.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._jobs = []
+
+    def schedule_list(self) -> list:
+        return self._jobs
+
+    def set_schedule_list(self, jobs: list):
+        """보여줄 목록을 바꿉니다. (모드/요일 변경, 덮어쓰기 붙여넣기)"""
+        self.beginResetModel()
+        self._jobs = jobs
+        self.endResetModel()
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._jobs)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._jobs):
+            return None
+        job = self._jobs[index.row()]
+        if role == ScheduleRole:
+            return job
+        if role == QtCore.Qt.DisplayRole:
+            return f"{job['name']} {minutes_to_text(job['time'])} {job['target']} {job['action']}"
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+        return QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEditable
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        """value 딕셔너리의 값으로 해당 예약을 제자리에서 수정합니다."""
+        if role != QtCore.Qt.EditRole or not index.isValid():
+            return False
+        self._jobs[index.row()].update(value)
+        self.dataChanged.emit(index, index, [QtCore.Qt.DisplayRole, ScheduleRole])
+        return True
+
+    def append_jobs(self, jobs: list) -> int:
+        """목록 끝에 예약들을 추가하고 첫 추가 행 번호를 반환합니다."""
+        first = len(self._jobs)
+        if jobs:
+            self.beginInsertRows(QtCore.QModelIndex(), first, first + len(jobs) - 1)
+            self._jobs.extend(jobs)
+            self.endInsertRows()
+        return first
+
+    def remove_row(self, row: int):
+        if not 0 <= row < len(self._jobs):
+            return
+        self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+        del self._jobs[row]
+        self.endRemoveRows()
+
+
+# ============================================================
+# Schedule Row Editor Class
+# ============================================================
+class ScheduleRowEditor(QtWidgets.QFrame):
+    """수정 중인 행 하나에만 만들어지는 편집 위젯입니다."""
+    save_clicked = QtCore.pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setAutoFillBackground(True)
+        layout = QtWidgets.QHBoxLayout(self)
+        layout.setContentsMargins(8, 2, 8, 2)
+
+        self.edit_name = QtWidgets.QLineEdit()
+
+        # Time input with two spin boxes
+        self.spin_hour = QtWidgets.QSpinBox()
+        self.spin_hour.setRange(0, 23)
+        self.spin_hour.setSuffix("시")
+        self.spin_min = QtWidgets.QSpinBox()
+        self.spin_min.setRange(0, 59)
+        self.spin_min.setSuffix("분")
+
+        time_layout = QtWidgets.QHBoxLayout()
+        time_layout.setSpacing(2)
+        time_layout.addWidget(self.spin_hour)
+        time_layout.addWidget(QtWidgets.QLabel(" : "))
+        time_layout.addWidget(self.spin_min)
+        time_layout.addStretch(1)
+
+        self.cmb_target = QtWidgets.QComboBox()
+        self.cmb_target.addItems(AVAILABLE_TARGETS)
+
+        self.cmb_action = QtWidgets.QComboBox()
+        self.cmb_action.addItems(AVAILABLE_ACTIONS)
+
+        self.btn_save = QtWidgets.QPushButton("저장")
+        self.btn_save.setFixedWidth(EDIT_BUTTON_WIDTH)
+        self.btn_save.clicked.connect(self.save_clicked)
+
+        layout.addWidget(self.edit_name, 3)
+        layout.addLayout(time_layout, 2)
+        layout.addWidget(self.cmb_target, 2)
+        layout.addWidget(self.cmb_action, 2)
+        layout.addWidget(self.btn_save, 0)
+
+    def set_data(self, job: dict):
+        self.edit_name.setText(job["name"])
+        hour, minute = divmod(job["time"], 60)
+        self.spin_hour.setValue(hour)
+        self.spin_min.setValue(minute)
+        self.cmb_target.setCurrentText(job["target"])
+        self.cmb_action.setCurrentText(job["action"])
+
+    def get_data(self) -> dict:
+        return {
+            "name": self.edit_name.text(),
+            "time": self.spin_hour.value() * 60 + self.spin_min.value(),
+            "target": self.cmb_target.currentText(),
+            "action": self.cmb_action.currentText(),
+        }
+
+    def set_time_now(self):
+        """시/분 입력을 현재 시각으로 설정합니다."""
+        now = QtCore.QTime.currentTime()
+        self.spin_hour.setValue(now.hour())
+        self.spin_min.setValue(now.minute())
+
+
+# ============================================================
+# Schedule Item Delegate Class
+# ============================================================
+class ScheduleItemDelegate(QtWidgets.QStyledItemDelegate):
+    """
+    보기 모드 행은 위젯 없이 직접 그리고, 수정 중인 행에만 ScheduleRowEditor를 만듭니다.
+    편집기는 포커스를 잃어도 닫히지 않으며, 저장/취소로만 닫힙니다.
+    """
+    edit_requested = QtCore.pyqtSignal(QtCore.QModelIndex)   # 행의 "수정" 버튼 클릭
+    save_requested = QtCore.pyqtSignal(QtWidgets.QWidget)    # 편집기의 "저장" 버튼 클릭
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pen_normal = QtGui.QPen(QtGui.QColor("#AAAAAA"), 1)
+        self._pen_selected = QtGui.QPen(QtGui.QColor("#4D98E2"), 1.5)
+
+    def sizeHint(self, option, index):
+        return QtCore.QSize(option.rect.width(), ROW_HEIGHT)
+
+    def _edit_button_rect(self, rect: QtCore.QRect) -> QtCore.QRect:
+        frame = rect.adjusted(ROW_MARGIN, ROW_MARGIN, -ROW_MARGIN, -ROW_MARGIN)
+        return QtCore.QRect(frame.right() - 8 - EDIT_BUTTON_WIDTH, frame.top() + 3,
+                            EDIT_BUTTON_WIDTH, frame.height() - 6)
+
+    def paint(self, painter, option, index):
+        job = index.data(ScheduleRole)
+        if job is None:
+            return
+        painter.save()
+        frame = option.rect.adjusted(ROW_MARGIN, ROW_MARGIN, -ROW_MARGIN, -ROW_MARGIN)
+        selected = bool(option.state & QtWidgets.QStyle.State_Selected)
+        painter.setPen(self._pen_selected if selected else self._pen_normal)
+        painter.setBrush(option.palette.base())
+        painter.drawRect(frame)
+
+        # 이름 2 : 시간 1 : 대상 1 : 동작 1 비율로 열을 나눕니다. (기존 행 위젯과 같은 배치)
+        button_rect = self._edit_button_rect(option.rect)
+        text_rect = QtCore.QRect(frame.left() + 8, frame.top(), button_rect.left() - frame.left() - 14, frame.height())
+        unit = text_rect.width() / 5
+        painter.setPen(option.palette.color(QtGui.QPalette.Text))
+        columns = (
+            (job["name"], 0, 2),
+            (minutes_to_text(job["time"]), 2, 1),
+            (job["target"], 3, 1),
+            (job["action"], 4, 1),
+        )
+        for text, start, span in columns:
+            cell = QtCore.QRect(int(text_rect.left() + unit * start), text_rect.top(),
+                                int(unit * span) - 4, text_rect.height())
+            elided = option.fontMetrics.elidedText(text, QtCore.Qt.ElideRight, cell.width())
+            painter.drawText(cell, QtCore.Qt.AlignVCenter | QtCore.Qt.AlignLeft, elided)
+
+        button = QtWidgets.QStyleOptionButton()
+        button.rect = button_rect
+        button.text = "수정"
+        button.state = QtWidgets.QStyle.State_Enabled | QtWidgets.QStyle.State_Raised
+        style = option.widget.style() if option.widget else QtWidgets.QApplication.style()
+        style.drawControl(QtWidgets.QStyle.CE_PushButton, button, painter, option.widget)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        """행의 "수정" 버튼 영역 클릭을 편집 요청으로 바꿉니다."""
+        if (event.type() == QtCore.QEvent.MouseButtonRelease
+                and event.button() == QtCore.Qt.LeftButton
+                and self._edit_button_rect(option.rect).contains(event.pos())):
+            self.edit_requested.emit(index)
+            return True
+        return super().editorEvent(event, model, option, index)
+
+    def createEditor(self, parent, option, index):
+        editor = ScheduleRowEditor(parent)
+        editor.save_clicked.connect(lambda: self.save_requested.emit(editor))
+        return editor
+
+    def setEditorData(self, editor, index):
+        editor.set_data(index.data(ScheduleRole))
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.get_data(), QtCore.Qt.EditRole)
+
+    def updateEditorGeometry(self, editor, option, index):
+        editor.setGeometry(option.rect.adjusted(ROW_MARGIN, ROW_MARGIN, -ROW_MARGIN, -ROW_MARGIN))
+
+    def eventFilter(self, editor, event):
+        # 기본 구현은 포커스를 잃으면 커밋 후 편집기를 닫으므로, 저장/취소 버튼으로만 닫히도록 막습니다.
+        if event.type() == QtCore.QEvent.FocusOut:
+            return False
+        if event.type() == QtCore.QEvent.KeyPress and event.key() in (QtCore.Qt.Key_Escape, QtCore.Qt.Key_Return, QtCore.Qt.Key_Enter):
+            return False
+        return super().eventFilter(editor, event)
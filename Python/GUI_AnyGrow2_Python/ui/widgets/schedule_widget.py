@@ -2,14 +2,15 @@
 from PyQt5 import QtCore, QtWidgets, QtGui
 from datetime import datetime
 import copy
-from .schedule_row_widget import ScheduleRowWidget
+from .schedule_list_model import ScheduleListModel, ScheduleItemDelegate
 from .paste_template_dialog import PasteTemplateDialog
 from core.constants import WEEKDAYS_MAP
 
 class ScheduleWidget(QtWidgets.QFrame):
     """
     요일별 스케줄을 관리하는 메인 위젯입니다.
-    내부에 여러 개의 ScheduleRowWidget을 포함하고 관리합니다.
+    예약 목록은 ScheduleListModel + QListView로 표시하므로 보이는 행만 그리며,
+    수정 중인 행에만 편집 위젯(ScheduleRowEditor)이 만들어집니다.
     """
     schedules_updated = QtCore.pyqtSignal(dict)
 
@@ -32,8 +33,8 @@ class ScheduleWidget(QtWidgets.QFrame):
         self.current_mode = "weekly"
         self.current_day = self.today_weekday_str
 
-        self.selected_row = None
-        self.editing_row = None
+        self.editing_index = None   # 수정 중인 행 (QPersistentModelIndex)
+        self.editing_is_new = False
         
         root_layout = QtWidgets.QVBoxLayout(self)
         self._setup_controls(root_layout)
@@ -71,7 +72,7 @@ class ScheduleWidget(QtWidgets.QFrame):
         self.btn_paste.clicked.connect(self._paste_schedule)
 
         self.btn_add = QtWidgets.QPushButton("✚ 추가")
-        self.btn_add.clicked.connect(self._add_row)
+        self.btn_add.clicked.connect(self._on_add_clicked)
         
         self.btn_delete_cancel = QtWidgets.QPushButton("삭제")
         self.btn_delete_cancel.setStyleSheet("color: red;")
@@ -90,20 +91,24 @@ class ScheduleWidget(QtWidgets.QFrame):
         layout.addLayout(controls_layout)
 
     def _setup_schedule_list(self, layout):
-        self.scroll_area = QtWidgets.QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setMinimumHeight(250)
-        scroll_widget = QtWidgets.QWidget()
-        
-        self.schedule_list_layout = QtWidgets.QVBoxLayout(scroll_widget)
-        self.schedule_list_layout.setSpacing(4)
-        self.schedule_list_layout.addStretch(1)
-        
-        self.scroll_area.setWidget(scroll_widget)
-        layout.addWidget(self.scroll_area)
+        self.schedule_model = ScheduleListModel(self)
+        self.schedule_delegate = ScheduleItemDelegate(self)
+        self.schedule_delegate.edit_requested.connect(self._enter_edit_mode)
+        self.schedule_delegate.save_requested.connect(self._on_row_save)
+
+        self.list_view = QtWidgets.QListView()
+        self.list_view.setModel(self.schedule_model)
+        self.list_view.setItemDelegate(self.schedule_delegate)
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
+        self.list_view.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.list_view.setVerticalScrollMode(QtWidgets.QAbstractItemView.ScrollPerPixel)
+        self.list_view.setMinimumHeight(250)
+        self.list_view.doubleClicked.connect(self._enter_edit_mode)
+        layout.addWidget(self.list_view)
 
     def _set_schedule_controls_enabled(self, enabled):
-        self.scroll_area.setEnabled(enabled)
+        self.list_view.setEnabled(enabled)
         self.btn_copy.setEnabled(enabled)
         self.btn_paste.setEnabled(enabled)
         self.btn_add.setEnabled(enabled)
@@ -171,14 +176,12 @@ class ScheduleWidget(QtWidgets.QFrame):
         template_data = templates[selected_template]
         
         if result == QtWidgets.QDialog.Accepted:
-            self._current_schedule_list.extend(copy.deepcopy(template_data))
+            self._attach_editable_list()
+            self.schedule_model.append_jobs(copy.deepcopy(template_data))
         elif result == PasteTemplateDialog.OverwriteRole:
-            if self.current_mode == 'weekly':
-                self.schedules[self.current_mode][self.current_day] = copy.deepcopy(template_data)
-            else:
-                self.schedules[self.current_mode][self.current_day] = copy.deepcopy(template_data)
+            self.schedules[self.current_mode][self.current_day] = copy.deepcopy(template_data)
+            self._load_day_schedules()
 
-        self._load_day_schedules()
         self.schedules_updated.emit(self.schedules)
 
     def _on_mode_changed(self, checked):
@@ -201,15 +204,11 @@ class ScheduleWidget(QtWidgets.QFrame):
             self._set_schedule_controls_enabled(True)
             self._load_day_schedules()
         elif sender == self.rb_mode_disabled:
-            if self.editing_row:
+            if self.editing_index is not None:
                 self._cancel_edit()
             self.date_time_stack.setVisible(False)
             self._set_schedule_controls_enabled(False)
-            while self.schedule_list_layout.count() > 1:
-                item = self.schedule_list_layout.takeAt(0)
-                widget = item.widget()
-                if widget:
-                    widget.deleteLater()
+            self.schedule_model.set_schedule_list([])
         
         self.schedules['disabled'] = self.rb_mode_disabled.isChecked()
         self.schedules['mode'] = self.current_mode
@@ -217,44 +216,38 @@ class ScheduleWidget(QtWidgets.QFrame):
 
     @property
     def _current_schedule_list(self):
+        """현재 보고 있는 예약 목록 (읽기 전용). "오늘" 예약이 없으면 빈 목록을 새로 만들지 않습니다."""
         if self.current_mode == "weekly":
             return self.schedules["weekly"][self.current_day]
         else:
-            if self.current_day not in self.schedules["daily"]:
-                self.schedules["daily"][self.current_day] = []
-            return self.schedules["daily"][self.current_day]
+            return self.schedules["daily"].get(self.current_day, [])
+
+    def _editable_schedule_list(self):
+        """예약을 추가할 목록을 반환합니다. "오늘" 예약은 이때 처음 만들어집니다."""
+        if self.current_mode == "weekly":
+            return self.schedules["weekly"][self.current_day]
+        return self.schedules["daily"].setdefault(self.current_day, [])
+
+    def _attach_editable_list(self):
+        """모델이 실제 저장 목록을 가리키도록 합니다. ("오늘" 예약은 처음 추가할 때 목록이 만들어짐)"""
+        editable = self._editable_schedule_list()
+        if self.schedule_model.schedule_list() is not editable:
+            self.schedule_model.set_schedule_list(editable)
 
     def _load_day_schedules(self):
+        """현재 모드/요일의 목록으로 모델을 바꿉니다. 행 위젯을 만들지 않으므로 목록 크기와 무관하게 즉시 끝납니다."""
+        if self.editing_index is not None:
+            self.list_view.closePersistentEditor(QtCore.QModelIndex(self.editing_index))
+        self.editing_index = None
+        self.editing_is_new = False
+
         # Do not load schedules if the mode is disabled
         if self.rb_mode_disabled.isChecked():
-            while self.schedule_list_layout.count() > 1:
-                item = self.schedule_list_layout.takeAt(0)
-                widget = item.widget()
-                if widget:
-                    widget.deleteLater()
+            self.schedule_model.set_schedule_list([])
             return
 
-        while self.schedule_list_layout.count() > 1:
-            item = self.schedule_list_layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
-        
-        for schedule_data in self._current_schedule_list:
-            self._create_and_add_row_widget(schedule_data)
-        
-        self.selected_row = None
-        self.editing_row = None
-        if hasattr(self, 'btn_add'): # Check if UI is setup
-            self._update_ui_for_mode_change()
-
-    def _create_and_add_row_widget(self, data_ref):
-        new_row = ScheduleRowWidget(data_ref)
-        new_row.clicked.connect(self.select_row)
-        new_row.edit_mode_entered.connect(self._on_row_edit_mode)
-        new_row.save_requested.connect(self._on_row_save)
-        self.schedule_list_layout.insertWidget(self.schedule_list_layout.count() - 1, new_row)
-        return new_row
+        self.schedule_model.set_schedule_list(self._current_schedule_list)
+        self._update_ui_for_mode_change()
 
     @QtCore.pyqtSlot(dict)
     def load_schedules(self, schedules_data):
@@ -298,16 +291,8 @@ class ScheduleWidget(QtWidgets.QFrame):
         if not is_disabled:
             self._load_day_schedules()
 
-    def select_row(self, row_widget):
-        if self.editing_row:
-             return
-        if self.selected_row:
-            self.selected_row.set_selected(False)
-        self.selected_row = row_widget
-        self.selected_row.set_selected(True)
-
     def _day_changed(self, day):
-        if self.editing_row:
+        if self.editing_index is not None:
             msg_box = QtWidgets.QMessageBox(self)
             msg_box.setIcon(QtWidgets.QMessageBox.Warning)
             msg_box.setText("현재 수정 중인 예약을 먼저 저장하거나 취소해주세요.")
@@ -323,7 +308,7 @@ class ScheduleWidget(QtWidgets.QFrame):
         self._load_day_schedules()
         
     def _add_row(self):
-        if self.editing_row:
+        if self.editing_index is not None:
             msg_box = QtWidgets.QMessageBox(self)
             msg_box.setIcon(QtWidgets.QMessageBox.Warning)
             msg_box.setText("현재 수정 중인 예약을 먼저 저장하거나 취소해주세요.")
@@ -332,33 +317,59 @@ class ScheduleWidget(QtWidgets.QFrame):
             msg_box.setWindowFlags(msg_box.windowFlags() & ~QtCore.Qt.WindowContextHelpButtonHint)
             msg_box.exec_()
             return
-        current_list = self._current_schedule_list
+        self._attach_editable_list()
         new_data = {
-            "name": f"새 예약 {len(current_list) + 1}",
-            "time": QtCore.QTime(12, 0),
+            "name": f"새 예약 {self.schedule_model.rowCount() + 1}",
+            "time": 12 * 60,
             "target": "전체 LED",
             "action": "켜기 (ON)"
         }
-        current_list.append(new_data)
-        new_row = self._create_and_add_row_widget(new_data)
-        new_row.is_new = True
-        new_row.enter_edit_mode()
+        row = self.schedule_model.append_jobs([new_data])
+        self._enter_edit_mode(self.schedule_model.index(row), is_new=True)
+
+    def _enter_edit_mode(self, index, is_new=False):
+        """해당 행에만 편집 위젯을 엽니다. 이미 다른 행을 수정 중이면 그 편집은 저장하지 않고 닫습니다."""
+        if not index.isValid():
+            return
+        if self.editing_index is not None:
+            if QtCore.QModelIndex(self.editing_index) == index:
+                return
+            row = index.row()
+            self._cancel_edit()
+            # 취소로 새 행이 지워졌다면 행 번호를 다시 구합니다.
+            index = self.schedule_model.index(min(row, self.schedule_model.rowCount() - 1))
+            if not index.isValid():
+                return
+        self.editing_index = QtCore.QPersistentModelIndex(index)
+        self.editing_is_new = is_new
+        self.list_view.setCurrentIndex(index)
+        self.list_view.scrollTo(index)
+        self.list_view.openPersistentEditor(index)
+        self._update_ui_for_mode_change()
+
+    def _close_editor(self):
+        index = QtCore.QModelIndex(self.editing_index)
+        self.editing_index = None
+        self.editing_is_new = False
+        self.list_view.closePersistentEditor(index)
+        self._update_ui_for_mode_change()
+        return index
 
     def _cancel_edit(self):
-        if self.editing_row:
-            if self.editing_row.is_new:
-                data_to_remove = self.editing_row.get_data()
-                if data_to_remove in self._current_schedule_list:
-                    self._current_schedule_list.remove(data_to_remove)
-            self.editing_row = None
-            self._load_day_schedules()
+        if self.editing_index is None:
+            return
+        was_new = self.editing_is_new
+        index = self._close_editor()
+        if was_new and index.isValid():
+            self.schedule_model.remove_row(index.row())
             self.schedules_updated.emit(self.schedules)
 
     def _handle_delete_cancel(self):
-        if self.editing_row:
+        if self.editing_index is not None:
             self._cancel_edit()
         else:
-            if not self.selected_row:
+            selected = self.list_view.selectionModel().selectedIndexes()
+            if not selected:
                 msg_box = QtWidgets.QMessageBox(self)
                 msg_box.setIcon(QtWidgets.QMessageBox.Information)
                 msg_box.setText("삭제할 예약을 먼저 선택해주세요.")
@@ -378,39 +389,33 @@ class ScheduleWidget(QtWidgets.QFrame):
             reply = msg_box.exec_()
 
             if reply == QtWidgets.QMessageBox.Yes:
-                row_to_remove = self.selected_row
-                data_to_remove = row_to_remove.get_data()
-                if data_to_remove in self._current_schedule_list:
-                    self._current_schedule_list.remove(data_to_remove)
-                self.schedule_list_layout.removeWidget(row_to_remove)
-                row_to_remove.deleteLater()
-                self.selected_row = None
+                self.schedule_model.remove_row(selected[0].row())
+                self.list_view.clearSelection()
                 self.schedules_updated.emit(self.schedules)
 
     def _set_current_time_on_editing_row(self):
-        if self.editing_row:
-            self.editing_row.setTimeNow()
-
-    def _on_row_edit_mode(self, row_widget):
-        if self.editing_row and self.editing_row is not row_widget:
-            self.editing_row.enter_view_mode(from_save=False)
-        self.editing_row = row_widget
-        self.select_row(row_widget)
-        self._update_ui_for_mode_change()
+        if self.editing_index is not None:
+            editor = self.list_view.indexWidget(QtCore.QModelIndex(self.editing_index))
+            if editor:
+                editor.set_time_now()
+
+    def _on_add_clicked(self):
+        """추가 버튼은 수정 중에는 "현재시간" 버튼으로 동작합니다."""
+        if self.editing_index is not None:
+            self._set_current_time_on_editing_row()
+        else:
+            self._add_row()
 
-    def _on_row_save(self, row_widget):
-        row_widget.is_new = False
-        self.editing_row = None
-        self._update_ui_for_mode_change()
+    def _on_row_save(self, editor):
+        if self.editing_index is None:
+            return
+        index = QtCore.QModelIndex(self.editing_index)
+        self.schedule_delegate.setModelData(editor, self.schedule_model, index)
+        self._close_editor()
         self.schedules_updated.emit(self.schedules)
 
     def _update_ui_for_mode_change(self):
-        try:
-            self.btn_add.clicked.disconnect()
-        except TypeError:
-            pass
-
-        is_editing = self.editing_row is not None
+        is_editing = self.editing_index is not None
         
         self.btn_delete_cancel.setText("취소" if is_editing else "삭제")
         self.btn_delete_cancel.setStyleSheet("color: black;" if is_editing else "color: red;")
@@ -420,12 +425,6 @@ class ScheduleWidget(QtWidgets.QFrame):
         if self.current_mode == "weekly":
             self.day_selector.setDisabled(is_editing)
 
-        if is_editing:
-            self.btn_add.setText("현재시간")
-            self.btn_add.clicked.connect(self._set_current_time_on_editing_row)
-            self.btn_add.setDisabled(False)
-        else:
-            self.btn_add.setText("✚ 추가")
-            self.btn_add.clicked.connect(self._add_row)
-            self.btn_add.setDisabled(False)
+        self.btn_add.setText("현재시간" if is_editing else "✚ 추가")
+        self.btn_add.setDisabled(False)
 
@@ -1,13 +1,29 @@
 # ui/widgets/sensor_widget.py
 
+import time
+
 from PyQt5 import QtCore, QtGui, QtWidgets
 
 from ui.constants import (
-    MAX_TEMP, MAX_HUM, MAX_CO2, MAX_ILLUM, get_bar_color
+    MAX_TEMP, MAX_HUM, MAX_CO2, MAX_ILLUM, LEVEL_COLORS
 )
 
+# 스타일시트는 미리 만들어 두고, 알람 수준이 바뀔 때만 적용합니다.
+_BAR_BASE_STYLE = "QProgressBar { border: 1px solid #bdbdbd; border-radius: 2px; }"
+_BAR_STYLES = {
+    level: _BAR_BASE_STYLE + f"QProgressBar::chunk {{ background: {color}; }}"
+    for level, color in LEVEL_COLORS.items()
+}
+_TREND_UP, _TREND_DOWN, _TREND_NONE = "▲", "▼", "─"
+_TREND_COLORS = {_TREND_UP: "green", _TREND_DOWN: "red", _TREND_NONE: "gray"}
+STATS_REPORT_EVERY = 600  # 갱신 이 횟수마다 렌더링 비용을 출력합니다 (0.5초 주기 기준 약 5분)
+
 
 class SensorWidget(QtWidgets.QGroupBox):
+    """
+    센서 값, 추세, 막대를 표시합니다.
+    색상은 스타일시트 재파싱 없이 미리 만든 팔레트로 바꾸고, 텍스트와 막대 값은 실제로 바뀔 때만 설정합니다.
+    """
     def __init__(self, parent=None):
         super().__init__("센서 데이터", parent)
 
@@ -18,6 +34,14 @@ class SensorWidget(QtWidgets.QGroupBox):
 
         self._bars = {}
         self.previous_values = {} # Store previous values for trend
+        self._shown = {}   # 키별 마지막으로 표시한 (텍스트, 막대 값, 추세)
+        self._levels = {}  # 키별 마지막으로 적용한 알람 수준
+
+        # 색상별 팔레트 캐시 (QLabel은 스타일시트가 없으면 팔레트 색으로 그려집니다)
+        self._palettes = {}
+
+        # 렌더링 비용 측정 (render_stats 참고)
+        self._stats = {"updates": 0, "setters": 0, "restyles": 0, "total_ms": 0.0, "max_ms": 0.0}
 
         self._add_sensor_row(0, "온도", "temp", MAX_TEMP)
         self._add_sensor_row(1, "습도", "hum", MAX_HUM)
@@ -31,6 +55,14 @@ class SensorWidget(QtWidgets.QGroupBox):
         env_grid.addWidget(self.lbl_last_update, 4, 0, 1, 4) # Span 4 columns
         env_grid.addWidget(self.lbl_sensor_status, 5, 0, 1, 4) # Span 4 columns
 
+    def _palette(self, color: str) -> QtGui.QPalette:
+        palette = self._palettes.get(color)
+        if palette is None:
+            palette = QtGui.QPalette(self.palette())
+            palette.setColor(QtGui.QPalette.WindowText, QtGui.QColor(color))
+            self._palettes[color] = palette
+        return palette
+
     def _add_sensor_row(self, r: int, title: str, key: str, max_v: float):
         name = QtWidgets.QLabel(title)
         name.setStyleSheet("font-weight: bold;")
@@ -38,8 +70,11 @@ class SensorWidget(QtWidgets.QGroupBox):
         value_lbl = QtWidgets.QLabel("-")
         value_lbl.setMinimumWidth(95)
         value_lbl.setAlignment(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
+        value_font = value_lbl.font()
+        value_font.setBold(True)
+        value_lbl.setFont(value_font)
         
-        trend_lbl = QtWidgets.QLabel("─")
+        trend_lbl = QtWidgets.QLabel(_TREND_NONE)
         trend_font = trend_lbl.font()
         trend_font.setBold(True)
         trend_lbl.setFont(trend_font)
@@ -52,10 +87,7 @@ class SensorWidget(QtWidgets.QGroupBox):
         bar.setTextVisible(False)
         bar.setFixedHeight(18)
         bar.setMinimumWidth(240)
-        bar.setStyleSheet(
-            "QProgressBar { border: 1px solid #bdbdbd; border-radius: 2px; }"
-            "QProgressBar::chunk { background: #4caf50; }"
-        )
+        bar.setStyleSheet(_BAR_STYLES["NORMAL"])
 
         self.layout().addWidget(name, r, 0)
         self.layout().addWidget(value_lbl, r, 1)
@@ -64,6 +96,9 @@ class SensorWidget(QtWidgets.QGroupBox):
         self._bars[key] = (value_lbl, trend_lbl, bar, max_v)
 
     def update_sensor_bars(self, data: dict):
+        started = time.perf_counter()
+        setters = 0
+
         # 센서 키와 값을 추출합니다.
         t = data.get("temp", 0.0)
         h = data.get("hum", 0.0)
@@ -78,50 +113,93 @@ class SensorWidget(QtWidgets.QGroupBox):
         }
         for key, (val, max_v, txt) in sensor_data.items():
             value_lbl, trend_lbl, bar, _ = self._bars[key]
+            shown_txt, shown_bar, shown_trend = self._shown.get(key, (None, None, _TREND_NONE))
 
             ratio = max(0.0, min(1.0, float(val) / float(max_v)))
-            bar.setValue(int(ratio * 1000))
-
-            color = get_bar_color(key, float(val))
-            value_lbl.setText(txt)
-            value_lbl.setStyleSheet(f"color: {color}; font-weight: bold;")
-            bar.setStyleSheet(
-                "QProgressBar { border: 1px solid #bdbdbd; border-radius: 2px; }"
-                f"QProgressBar::chunk {{ background: {color}; }}"
-            )
+            bar_value = int(ratio * 1000)
+            if bar_value != shown_bar:
+                bar.setValue(bar_value)
+                setters += 1
+            if txt != shown_txt:
+                value_lbl.setText(txt)
+                setters += 1
             
             # Update trend indicator
+            trend = shown_trend
             prev_val = self.previous_values.get(key)
             if prev_val is not None:
                 diff = val - prev_val
                 # A small threshold to prevent flickering for tiny changes
                 if diff > 0.01:
-                    trend_lbl.setText("▲")
-                    trend_lbl.setStyleSheet("color: green;")
+                    trend = _TREND_UP
                 elif diff < -0.01:
-                    trend_lbl.setText("▼")
-                    trend_lbl.setStyleSheet("color: red;")
+                    trend = _TREND_DOWN
                 # If the value is the same, do nothing to keep the last trend indicator
+            if trend != shown_trend:
+                trend_lbl.setText(trend)
+                trend_lbl.setPalette(self._palette(_TREND_COLORS[trend]))
+                setters += 2
             
             self.previous_values[key] = val
+            self._shown[key] = (txt, bar_value, trend)
+
+        self._record(started, setters)
+
+    def _record(self, started: float, setters: int, restyles: int = 0):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        stats = self._stats
+        stats["updates"] += 1
+        stats["setters"] += setters
+        stats["restyles"] += restyles
+        stats["total_ms"] += elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+        if stats["updates"] % STATS_REPORT_EVERY == 0:
+            s = self.render_stats()
+            print(f"[UI] SensorWidget 갱신 {s['updates']}회: 평균 {s['avg_ms']:.3f} ms, 최대 {s['max_ms']:.3f} ms, "
+                  f"setter {s['setters']}회, 스타일 적용 {s['restyles']}회")
+
+    def render_stats(self) -> dict:
+        """
+        갱신 비용 통계를 반환합니다.
+        setters/restyles는 실제로 호출된 Qt setter/스타일 적용 횟수이며, 값이 그대로일 때는 늘지 않습니다.
+        """
+        stats = dict(self._stats)
+        stats["avg_ms"] = stats["total_ms"] / stats["updates"] if stats["updates"] else 0.0
+        return stats
     
+    def set_alarm_level(self, event):
+        """
+        알람 상태 전이 이벤트(AlarmEvent)를 받아 해당 센서의 값/막대 색상을 바꿉니다.
+        색상은 수준이 실제로 바뀔 때만 갱신됩니다. (값 라벨은 팔레트, 막대는 미리 만든 스타일시트)
+        """
+        if event.channel not in self._bars or self._levels.get(event.channel) == event.level:
+            return
+        started = time.perf_counter()
+        self._levels[event.channel] = event.level
+        value_lbl, _trend_lbl, bar, _ = self._bars[event.channel]
+        color = LEVEL_COLORS.get(event.level, LEVEL_COLORS["NORMAL"])
+        value_lbl.setPalette(self._palette(color))
+        bar.setStyleSheet(_BAR_STYLES.get(event.level, _BAR_STYLES["NORMAL"]))
+        self._record(started, 1, 1)
+
     def set_last_update_text(self, text: str):
-        self.lbl_last_update.setText(text)
+        if self.lbl_last_update.text() != text:
+            self.lbl_last_update.setText(text)
 
     def set_sensor_status_text(self, text: str):
-        self.lbl_sensor_status.setText(text)
+        if self.lbl_sensor_status.text() != text:
+            self.lbl_sensor_status.setText(text)
         
     def reset(self):
         self.set_last_update_text("마지막 갱신: -")
         self.set_sensor_status_text("센서 데이터 수신 기록 없음")
         self.previous_values = {} # Clear previous values on reset
+        self._shown = {}
+        self._levels = {}
         for key, (value_lbl, trend_lbl, bar, max_v) in self._bars.items():
             value_lbl.setText("-")
-            value_lbl.setStyleSheet("")
-            trend_lbl.setText("─")
-            trend_lbl.setStyleSheet("color: gray;")
+            value_lbl.setPalette(self.palette())
+            trend_lbl.setText(_TREND_NONE)
+            trend_lbl.setPalette(self._palette(_TREND_COLORS[_TREND_NONE]))
             bar.setValue(0)
-            bar.setStyleSheet(
-                "QProgressBar { border: 1px solid #bdbdbd; border-radius: 2px; }"
-                "QProgressBar::chunk { background: #4caf50; }"
-            )
\ No newline at end of file
+            bar.setStyleSheet(_BAR_STYLES["NORMAL"])
@@ -0,0 +1,451 @@
+# ui/widgets/trend_widget.py
+import bisect
+import math
+import threading
+import time
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+from ui.constants import MAX_TEMP, MAX_HUM, MAX_CO2, MAX_ILLUM
+
+# ============================================================
+# Helper Functions & Constants
+# ============================================================
+TREND_BUFFER_SECONDS = 6 * 3600     # 메모리 버퍼에 보관하는 기간 (이보다 긴 구간은 이력 DB에서 조회)
+TREND_SPANS = [                     # (표시 이름, 초)
+    ("10분", 600),
+    ("1시간", 3600),
+    ("6시간", 6 * 3600),
+    ("1일", 24 * 3600),
+    ("7일", 7 * 24 * 3600),
+]
+MIN_SPAN, MAX_SPAN = 60, 7 * 24 * 3600
+ZOOM_STEP = 1.25
+HISTORY_SPAN_THRESHOLD = 3600       # 이보다 긴 구간은 메모리 버퍼 대신 이력 DB 롤업으로 다시 그립니다
+HISTORY_PREFETCH_SPANS = 1.0        # 이력 조회 시 보이는 구간 좌우로 더 가져오는 폭 (구간 길이 배수)
+HISTORY_FETCH_DELAY_MS = 200        # 확대/이동이 멈춘 뒤 이력을 조회하기까지 기다리는 시간
+
+
+def _format_span(seconds: float) -> str:
+    if seconds >= 24 * 3600:
+        return f"{seconds / 86400:g}일"
+    if seconds >= 3600:
+        return f"{seconds / 3600:.1f}시간".replace(".0시간", "시간")
+    return f"{seconds / 60:.0f}분"
+
+
+class TrendBuffer:
+    """
+    최근 capacity초 동안의 (시간, 값)을 시간 순 리스트로 보관합니다.
+    오래된 앞부분은 일정량이 쌓였을 때 한 번에 잘라내므로 추가는 상수 시간이고,
+    시간 범위 조회는 bisect로 합니다.
+    """
+    TRIM_CHUNK = 1024
+
+    def __init__(self, capacity: float = TREND_BUFFER_SECONDS):
+        self.capacity = capacity
+        self.t = []
+        self.v = []
+
+    def append(self, t: float, v: float):
+        if self.t and t < self.t[-1]:
+            return  # 시간 역행 샘플은 무시
+        self.t.append(t)
+        self.v.append(v)
+        cut = bisect.bisect_left(self.t, t - self.capacity)
+        if cut >= self.TRIM_CHUNK:
+            del self.t[:cut]
+            del self.v[:cut]
+
+    def first_time(self):
+        return self.t[0] if self.t else None
+
+    def range(self, start: float, end: float):
+        """[start, end] 구간의 (시간 리스트, 값 리스트) 조각을 반환합니다."""
+        lo = bisect.bisect_left(self.t, start)
+        hi = bisect.bisect_right(self.t, end)
+        return self.t[lo:hi], self.v[lo:hi]
+
+
+# ============================================================
+# Trend Chart Class
+# ============================================================
+class TrendChart(QtWidgets.QWidget):
+    """
+    센서 하나의 추세 그래프입니다.
+    화면 가로 1픽셀(열)마다 최소/최대값을 세로선 하나로 그리며(앞 열의 마지막 값과 이어짐),
+    그 결과를 픽스맵 층에 캐시합니다.
+      - 실시간 모드: 새 샘플이 들어오면 마지막 열만 다시 그리고, 열이 넘어가면 픽스맵을 왼쪽으로 스크롤합니다.
+      - 확대/이동(휠, 드래그) 시에만 보이는 구간 전체를 한 번 다시 그립니다. 더블클릭하면 실시간으로 돌아갑니다.
+    이력 DB 조회는 그리기 중에 하지 않습니다. 보이는 구간보다 넓게 가져온 결과를 캐시해 두고,
+    구간이 캐시 밖으로 나가면 이동이 멈춘 뒤 작업 스레드에서 다시 조회하여 도착하면 다시 그립니다.
+    """
+    _history_ready = QtCore.pyqtSignal(object)
+
+    def __init__(self, key: str, title: str, unit: str, y_max: float, color: str, parent=None):
+        super().__init__(parent)
+        self.key = key
+        self.title = title
+        self.unit = unit
+        self.y_min, self.y_max = 0.0, y_max
+        self.color = QtGui.QColor(color)
+        self.setMinimumSize(200, 70)
+
+        self.buffer = TrendBuffer()
+        self.history_source = None  # callable(sensor, start, end, points, method) -> dict (작업 스레드에서 호출)
+        self._history = None        # 캐시된 이력: {"start", "end", "res", "t", "v"}
+        self._history_fetching = False
+        self._history_timer = QtCore.QTimer(self)
+        self._history_timer.setSingleShot(True)
+        self._history_timer.setInterval(HISTORY_FETCH_DELAY_MS)
+        self._history_timer.timeout.connect(self._fetch_history)
+        self._history_ready.connect(self._on_history_ready)
+
+        self.span = 3600.0
+        self.view_end = None        # None이면 실시간(최신 샘플을 오른쪽 끝에 표시)
+        self._drag_origin = None
+
+        self._grid_layer = None
+        self._series_layer = None
+        self._right_col = None      # 픽스맵 오른쪽 끝 열의 절대 열 번호
+        self._col_extent = {}       # 오른쪽 끝 열의 (최소, 최대, 마지막 값) - 증분 그리기용
+        self._prev_last = None      # 오른쪽 끝 바로 앞 열의 마지막 값
+
+        self._pen = QtGui.QPen(self.color)
+        self._pen.setWidth(1)
+
+    # ------------------------------------------------------------
+    # 좌표 변환
+    # ------------------------------------------------------------
+    def _sec_per_px(self) -> float:
+        return self.span / max(1, self.width())
+
+    def _col_of(self, t: float) -> int:
+        return math.floor(t / self._sec_per_px())
+
+    def _y_of(self, v: float) -> float:
+        h = self.height() - 4
+        ratio = (v - self.y_min) / (self.y_max - self.y_min)
+        return 2 + h - max(0.0, min(1.0, ratio)) * h
+
+    def _current_end(self) -> float:
+        if self.view_end is not None:
+            return self.view_end
+        return self.buffer.t[-1] if self.buffer.t else time.time()
+
+    def _visible_range(self):
+        """보이는 구간의 (시작, 끝) 시간. 가장 왼쪽/오른쪽 열의 경계입니다."""
+        sec_per_px = self._sec_per_px()
+        right_col = self._col_of(self._current_end())
+        return (right_col - self.width() + 1) * sec_per_px, (right_col + 1) * sec_per_px
+
+    # ------------------------------------------------------------
+    # 데이터
+    # ------------------------------------------------------------
+    def append(self, t: float, v: float):
+        """새 샘플을 버퍼에 넣고, 실시간 모드이면 해당 열만 증분으로 그립니다."""
+        self.buffer.append(t, v)
+        if self.view_end is not None or self._series_layer is None:
+            self.update()
+            return
+
+        col = self._col_of(t)
+        if col > self._right_col:
+            self._scroll_layer(col - self._right_col)
+        elif col < self._right_col:
+            return
+        self._draw_last_column(v)
+        self.update()
+
+    def set_span(self, seconds: float):
+        self.span = max(MIN_SPAN, min(MAX_SPAN, float(seconds)))
+        self._invalidate()
+
+    def _invalidate(self, grid: bool = False):
+        """보이는 구간 전체를 다음 paintEvent에서 다시 그리도록 표시합니다."""
+        self._series_layer = None
+        if grid:
+            self._grid_layer = None
+        self.update()
+
+    def _needs_history(self, start: float, end: float) -> bool:
+        """메모리 버퍼에 없는 과거 구간이 보이거나 구간이 길면 이력 DB를 사용합니다."""
+        if self.history_source is None:
+            return False
+        first = self.buffer.first_time()
+        return first is None or start < first or end - start > HISTORY_SPAN_THRESHOLD
+
+    def _history_covers(self, start: float, end: float) -> bool:
+        """
+        캐시가 [start, end]를 현재 해상도로 덮는지 확인합니다.
+        캐시 끝 이후는 메모리 버퍼로 채울 수 있으면 덮는 것으로 봅니다.
+        """
+        cache = self._history
+        if cache is None or cache["res"] != (self.span, self.width()) or start < cache["start"]:
+            return False
+        first = self.buffer.first_time()
+        return end <= cache["end"] or (first is not None and first <= cache["end"])
+
+    def _visible_points(self, start: float, end: float):
+        """
+        보이는 구간의 점들. 이력 DB가 필요한 구간은 캐시된 조회 결과를 쓰고,
+        캐시의 마지막 점 이후(아직 DB에 기록되지 않은 최근 샘플 포함)는 메모리 버퍼로 이어 붙입니다.
+        캐시가 구간을 덮지 못하면 조회를 예약하고, 그동안은 가진 데이터로 그립니다.
+        """
+        if not self._needs_history(start, end):
+            return self.buffer.range(start, end)
+        if not self._history_covers(start, end):
+            self._schedule_history()
+        cache = self._history
+        if cache is None:
+            return self.buffer.range(start, end)
+
+        lo = bisect.bisect_left(cache["t"], start)
+        hi = bisect.bisect_right(cache["t"], end)
+        ts, vs = cache["t"][lo:hi], cache["v"][lo:hi]
+        bt, bv = self.buffer.range(start, end)
+        if cache["t"]:
+            cut = bisect.bisect_right(bt, cache["t"][-1])
+            bt, bv = bt[cut:], bv[cut:]
+        return ts + bt, vs + bv
+
+    def _schedule_history(self):
+        """드래그 중이 아니면 HISTORY_FETCH_DELAY_MS 뒤에 이력 조회를 시작합니다. (다시 부르면 타이머가 재시작됨)"""
+        if self._drag_origin is None:
+            self._history_timer.start()
+
+    def _fetch_history(self):
+        """보이는 구간 좌우로 HISTORY_PREFETCH_SPANS 만큼 넓힌 범위를 작업 스레드에서 조회합니다."""
+        if self._history_fetching:
+            return  # 진행 중인 조회가 끝나면 다시 그리면서 필요하면 다시 예약됩니다
+        start, end = self._visible_range()
+        if not self._needs_history(start, end) or self._history_covers(start, end):
+            return
+
+        margin = self.span * HISTORY_PREFETCH_SPANS
+        fetch_start, fetch_end = start - margin, end + margin
+        res = (self.span, self.width())
+        points = int(self.width() * 2 * (fetch_end - fetch_start) / self.span)
+        source = self.history_source
+
+        def run():
+            try:
+                result = source(self.key, fetch_start, fetch_end, points, "minmax")
+                cache = {"start": fetch_start, "end": fetch_end, "res": res, "t": result["t"], "v": result["v"]}
+            except Exception as e:
+                print(f"[UI] 추세 이력 조회 오류 ({self.key}): {e}")
+                cache = None
+            self._history_ready.emit(cache)
+
+        self._history_fetching = True
+        threading.Thread(target=run, name=f"TrendHistory-{self.key}", daemon=True).start()
+
+    def _on_history_ready(self, cache):
+        self._history_fetching = False
+        if cache is not None:
+            self._history = cache
+            self._invalidate()
+
+    # ------------------------------------------------------------
+    # 그리기
+    # ------------------------------------------------------------
+    def _new_layer(self) -> QtGui.QPixmap:
+        dpr = self.devicePixelRatioF()
+        pixmap = QtGui.QPixmap(int(self.width() * dpr), int(self.height() * dpr))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(QtCore.Qt.transparent)
+        return pixmap
+
+    def _build_grid_layer(self):
+        layer = self._new_layer()
+        painter = QtGui.QPainter(layer)
+        painter.fillRect(self.rect(), QtGui.QColor("#fafafa"))
+        painter.setPen(QtGui.QPen(QtGui.QColor("#e0e0e0"), 1, QtCore.Qt.DashLine))
+        for frac in (0.25, 0.5, 0.75):
+            y = self._y_of(self.y_min + (self.y_max - self.y_min) * frac)
+            painter.drawLine(QtCore.QPointF(0, y), QtCore.QPointF(self.width(), y))
+        painter.setPen(QtGui.QColor("#bdbdbd"))
+        painter.drawRect(self.rect().adjusted(0, 0, -1, -1))
+        painter.end()
+        self._grid_layer = layer
+
+    def _build_series_layer(self):
+        """보이는 구간 전체를 열 단위 최소/최대로 줄여 한 번에 그립니다."""
+        self._series_layer = self._new_layer()
+        self._right_col = self._col_of(self._current_end())
+        left_col = self._right_col - self.width() + 1
+        sec_per_px = self._sec_per_px()
+        ts, vs = self._visible_points(*self._visible_range())
+
+        lines = []
+        col, lo, hi, last, prev_last = None, None, None, None, None
+        for t, v in zip(ts, vs):
+            c = math.floor(t / sec_per_px)
+            if c != col:
+                if col is not None:
+                    lines.append(self._column_line(col - left_col, lo, hi, prev_last))
+                    prev_last = last
+                col, lo, hi = c, v, v
+            else:
+                lo, hi = min(lo, v), max(hi, v)
+            last = v
+
+        self._prev_last = None
+        self._col_extent = {}
+        if col is not None:
+            if col == self._right_col:
+                self._col_extent = {"lo": lo, "hi": hi, "last": last}
+                self._prev_last = prev_last
+            else:
+                self._prev_last = last
+            lines.append(self._column_line(col - left_col, lo, hi, prev_last))
+
+        painter = QtGui.QPainter(self._series_layer)
+        painter.setPen(self._pen)
+        painter.drawLines(lines)
+        painter.end()
+
+    def _column_line(self, x: int, lo: float, hi: float, prev_last) -> QtCore.QLineF:
+        if prev_last is not None:
+            lo, hi = min(lo, prev_last), max(hi, prev_last)
+        return QtCore.QLineF(x + 0.5, self._y_of(lo), x + 0.5, self._y_of(hi))
+
+    def _scroll_layer(self, shift: int):
+        """실시간 모드에서 오른쪽 끝 열이 shift만큼 넘어가면 기존 그림을 왼쪽으로 밀고 새 열 자리를 비웁니다."""
+        self._prev_last = self._col_extent.get("last", self._prev_last)
+        self._col_extent = {}
+        self._right_col += shift
+        w, h = self.width(), self.height()
+        if shift >= w:
+            self._series_layer.fill(QtCore.Qt.transparent)
+            return
+        dpr = self._series_layer.devicePixelRatio()
+        self._series_layer.scroll(int(-shift * dpr), 0, self._series_layer.rect())
+        painter = QtGui.QPainter(self._series_layer)
+        painter.setCompositionMode(QtGui.QPainter.CompositionMode_Clear)
+        painter.fillRect(QtCore.QRectF(w - shift, 0, shift, h), QtCore.Qt.transparent)
+        painter.end()
+
+    def _draw_last_column(self, v: float):
+        extent = self._col_extent
+        if extent:
+            extent["lo"], extent["hi"] = min(extent["lo"], v), max(extent["hi"], v)
+        else:
+            extent.update(lo=v, hi=v)
+        extent["last"] = v
+
+        x = self.width() - 1
+        painter = QtGui.QPainter(self._series_layer)
+        painter.setCompositionMode(QtGui.QPainter.CompositionMode_Clear)
+        painter.fillRect(QtCore.QRectF(x, 0, 1, self.height()), QtCore.Qt.transparent)
+        painter.setCompositionMode(QtGui.QPainter.CompositionMode_SourceOver)
+        painter.setPen(self._pen)
+        painter.drawLine(self._column_line(x, extent["lo"], extent["hi"], self._prev_last))
+        painter.end()
+
+    def paintEvent(self, event):
+        if self._grid_layer is None or self._grid_layer.size() != self.size() * self.devicePixelRatioF():
+            self._build_grid_layer()
+            self._series_layer = None
+        if self._series_layer is None:
+            self._build_series_layer()
+
+        painter = QtGui.QPainter(self)
+        painter.drawPixmap(0, 0, self._grid_layer)
+        painter.drawPixmap(0, 0, self._series_layer)
+
+        # 제목/현재값/구간 표시 (매번 그려도 비용이 작음)
+        painter.setPen(QtGui.QColor("#424242"))
+        current = f"{self.buffer.v[-1]:g} {self.unit}" if self.buffer.v else "-"
+        mode = "실시간" if self.view_end is None else "과거 (더블클릭: 실시간)"
+        painter.drawText(self.rect().adjusted(4, 2, -4, -2), QtCore.Qt.AlignLeft | QtCore.Qt.AlignTop,
+                         f"{self.title}  {current}")
+        painter.drawText(self.rect().adjusted(4, 2, -4, -2), QtCore.Qt.AlignRight | QtCore.Qt.AlignTop,
+                         f"{_format_span(self.span)} · {mode}")
+        painter.end()
+
+    def resizeEvent(self, event):
+        self._invalidate(grid=True)
+        super().resizeEvent(event)
+
+    # ------------------------------------------------------------
+    # 확대/이동
+    # ------------------------------------------------------------
+    def wheelEvent(self, event):
+        factor = 1 / ZOOM_STEP if event.angleDelta().y() > 0 else ZOOM_STEP
+        self.set_span(self.span * factor)
+
+    def mousePressEvent(self, event):
+        if event.button() == QtCore.Qt.LeftButton:
+            self._drag_origin = (event.pos().x(), self._current_end())
+
+    def mouseMoveEvent(self, event):
+        if self._drag_origin is None:
+            return
+        x0, end0 = self._drag_origin
+        new_end = end0 - (event.pos().x() - x0) * self._sec_per_px()
+        latest = self.buffer.t[-1] if self.buffer.t else time.time()
+        self.view_end = None if new_end >= latest else new_end
+        self._invalidate()
+
+    def mouseReleaseEvent(self, event):
+        if self._drag_origin is None:
+            return
+        self._drag_origin = None
+        # 드래그 중에는 캐시로만 그렸으므로, 놓은 위치가 캐시 밖이면 이제 조회합니다.
+        start, end = self._visible_range()
+        if self._needs_history(start, end) and not self._history_covers(start, end):
+            self._schedule_history()
+
+    def mouseDoubleClickEvent(self, event):
+        self.view_end = None
+        self._invalidate()
+
+
+# ============================================================
+# Trend Panel Class
+# ============================================================
+class TrendWidget(QtWidgets.QGroupBox):
+    """센서별 추세 그래프 4개와 표시 구간 선택을 묶은 패널입니다."""
+    def __init__(self, history_source=None, parent=None):
+        super().__init__("센서 추세", parent)
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(8, 6, 8, 8)
+        layout.setSpacing(4)
+
+        top = QtWidgets.QHBoxLayout()
+        top.addWidget(QtWidgets.QLabel("표시 구간:"))
+        self.cmb_span = QtWidgets.QComboBox()
+        for label, seconds in TREND_SPANS:
+            self.cmb_span.addItem(label, seconds)
+        self.cmb_span.setCurrentIndex(1)
+        self.cmb_span.currentIndexChanged.connect(
+            lambda _i: self.set_span(self.cmb_span.currentData()))
+        top.addWidget(self.cmb_span)
+        top.addStretch(1)
+        top.addWidget(QtWidgets.QLabel("휠: 확대/축소, 드래그: 이동"))
+        layout.addLayout(top)
+
+        self.charts = {}
+        for key, title, unit, y_max, color in (
+            ("temp", "온도", "℃", MAX_TEMP, "#e53935"),
+            ("hum", "습도", "%", MAX_HUM, "#1e88e5"),
+            ("co2", "CO₂", "ppm", MAX_CO2, "#6d4c41"),
+            ("illum", "조도", "lx", MAX_ILLUM, "#fdd835"),
+        ):
+            chart = TrendChart(key, title, unit, y_max, color)
+            chart.history_source = history_source
+            self.charts[key] = chart
+            layout.addWidget(chart, 1)
+
+    def set_span(self, seconds: float):
+        for chart in self.charts.values():
+            chart.set_span(seconds)
+
+    def append_reading(self, data: dict):
+        """센서 측정값 딕셔너리를 각 그래프에 추가합니다."""
+        t = data.get("timestamp") or time.time()
+        for key, chart in self.charts.items():
+            value = data.get(key)
+            if value is not None:
+                chart.append(t, float(value))
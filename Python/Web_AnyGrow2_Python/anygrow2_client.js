@@ -6,22 +6,25 @@ anygrow2_client.js
 ----------------------------------------------------------------- */
 
 			// 활용 변수 생성
-			var packet ='';									// 수신 패킷데이터 저장
-			var ETX='ff,ff'; 								// 03';  패킷의 끝을 알림
-
 			var arrEnv = new Array(4);						// 환경정보 값 2차원 배열에 저장
 			for(var i=0; i<5; i++)							// [0][ ]:온도	[1][ ]:습도	[2][ ]:CO2	[3][ ]:조도
 				arrEnv[i] = new Array(5);					// [ ][0]:센서값	[ ][1]:최소값	[ ][2]:최대값	[ ][3]:알람플래그
 			
-			var val_max = new Array(35, 90, 4999, 8000);	// 환경정보 최대값 정의 (모니터링 화면 내 차트, 알람 임계값으로 활용)
+			var val_max = new Array(35, 90, 4999, 8000);	// 환경정보 최대값 정의 (모니터링 화면 내 차트 스케일)
+
+			var socket;										// 웹서버와의 소켓
+			var alarmComments = {};							// 채널별 알람 메시지 (서버의 임계값 엔진이 상태 변화 시에만 전송)
+			var ALARM_FACTORS = {temp:"온도", hum:"습도", co2:"이산화탄소", illum:"조도"};
+			var commandSeq = 0;								// 장치 제어 명령 번호 (서버 응답과 짝을 맞춤)
+			var THRESHOLD_SLIDERS = {temp:"temperature", hum:"humidity", co2:"co2", illum:"illumination"};
+			var thresholdShown = {};						// 서버 임계값을 표시한 직후의 슬라이더 값 (저장 시 바뀐 경계만 보냄)
 		
 	
 			
 			// 페이지가 로드 되면 자동으로 실행되는 함수
 			window.onload = function () {
 				
-				// 알림값 초기화
-				chanage_threshold();
+				// 알림값 초기화 (임계값은 서버에서 'thresholds' 이벤트로 받음)
 				alram_init();
 			
 				// 화면 스크린에 따라 모니터링 그래프 사이즈 정의 
@@ -30,137 +33,169 @@ anygrow2_client.js
 				$('#chart_temperature, #chart_humidity, #chart_co2, #chart_illumination').css("width",(bar_width)+"px");
 		
 				// 소켓 생성	
-                var socket = io.connect();	
+                socket = io.connect();	
 				
 				
-				// LED 제어를 위해, 버튼 선택 시 소켓통신을 통해 웹서버로 해당 시그널 전송 
-				document.getElementById('btnOff').onclick = function(){	
-					socket.emit('serial_write', "Off");		// LED OFF
+				// 장치 제어를 위해, 버튼 선택 시 소켓통신을 통해 웹서버로 명령 전송 (서버가 바로 전송하고 결과를 알려줌)
+				document.getElementById('btnOff').onclick = function(){
+					send_command('led', {mode: "Off"});		// LED OFF
+				}
+				document.getElementById('btnMood').onclick = function(){
+					send_command('led', {mode: "Mood"});	// LED 무드등 모드로 ON
+				}
+				document.getElementById('btnOn').onclick = function(){
+					send_command('led', {mode: "On"});		// LED 전체 ON
+				}
+				document.getElementById('btnPumpOn').onclick = function(){
+					send_command('pump', {on: true});		// 양액 펌프 ON
+				}
+				document.getElementById('btnPumpOff').onclick = function(){
+					send_command('pump', {on: false});		// 양액 펌프 OFF
+				}
+				document.getElementById('btnUvOn').onclick = function(){
+					send_command('uv', {on: true});		// UV 필터 ON
 				}
-				document.getElementById('btnMood').onclick = function(){	
-					socket.emit('serial_write', "Mood");	// LED 무드등 모드로 ON	
+				document.getElementById('btnUvOff').onclick = function(){
+					send_command('uv', {on: false});		// UV 필터 OFF
 				}
-				document.getElementById('btnOn').onclick = function(){	
-					socket.emit('serial_write', "On");		// LED 전체 ON
+				document.getElementById('btnTimeSync').onclick = function(){
+					var now = new Date();				// BMS 시간을 이 기기의 현재 시각으로 동기화
+					send_command('bms_time_sync', {hour: now.getHours(), minute: now.getMinutes(), second: now.getSeconds()});
 				}
 
+				// 명령 전송 결과 (sent / failed, 대기 시간 포함)
+				socket.on('command_ack', function (ack) {
+					on_command_ack(ack);
+				});
+
+				// 알람은 서버의 임계값 엔진이 판단하여, 상태가 바뀐 채널만 전달
+				socket.on('alarm', function (ev) {
+					on_alarm(ev);
+				});
+
+				// 서버의 현재 임계값을 설정 탭 슬라이더에 반영
+				socket.on('thresholds', function (rules) {
+					show_thresholds(rules);
+				});
+				socket.on('thresholds_error', function (msg) {
+					alert("임계값 저장 실패: " + msg);
+				});
+
 				
 
-				// 센서 데이터 모니터링을 위해, 소켓통신을 통해 웹서버로 해당 시그널 수신
-                socket.on('serial_recive', function (data) {
-					
-					// 패킷이 끊어서 들어오는 경우가 있어, 패킷의 끝을 알리는 ETX가 들어올때까지 값 계속 더해줌
-					packet += data;
-					console.log(packet);
+				// 센서 데이터 모니터링을 위해, 서버에서 파싱된 센서값 수신 (값이 바뀐 경우에만 전달)
+				// data = {temp: 24.5, hum: 55.0, co2: 420, illum: 1200, ts: 1700000000.123}
+				socket.on('sensor', function (data) {
+					show_sensor(data, bar_height);
+				});
 
-					// ETX가 들어오면 패킷이 완성 / 작업 시작
-					if(packet.match(ETX)){
-					
-						// 정상적으로 패킷 수신했음을 서버쪽에 알림
-						socket.emit('comm_state', "sensor data response");	
-					    
-						// 수신 패킷을 "," 기준으로 잘라서, 배열로 저장
-					    arr_reciveData =packet.toString('utf8').split(',');
-						
-					    //var modePacket = arr_reciveData[1];
-					    
-						// 길이를 통해, 패킷이 정상적으로 도착했는지 확인
-					    if(arr_reciveData.length==30){
+				// 디버그용 원시 패킷 수신 (주소에 ?raw=1 을 붙인 경우에만 구독)
+				if(/[?&]raw=1/.test(window.location.search)){
+					socket.on('connect', function () {
+						socket.emit('raw_subscribe', true);
+					});
+					socket.on('serial_raw', function (data) {
+						console.log(data);
+					});
+				}
+			}
+			
+			
+			// 서버에서 전달된 센서값을 모니터링 탭 화면에 출력하는 함수
+			function show_sensor(data, bar_height){
+				arrEnv[0][0] = data.temp;		// 온도
+				arrEnv[1][0] = data.hum;		// 습도
+				arrEnv[2][0] = data.co2;		// CO2
+				arrEnv[3][0] = data.illum;		// 조도
+
+				// 모니터링 탭 화면에 현재 센서값을 텍스트형태로 출력
+				$('#label_temperature').text(String(arrEnv[0][0]));
+				$('#label_humidity').text(String(arrEnv[1][0]));
+				if(arrEnv[2][0]<6000)
+					$('#label_co2').text(String(arrEnv[2][0]));
+				$('#label_illumination').text(String(arrEnv[3][0]));
 
-							// MODE 패킷을 통해, 센서에서 전달된 데이터인지 확인
-					        if(arr_reciveData[1]=="02"){
-					            // 센서에서 전달된 패킷 데이터를 실제 사용할 수 있도록 가공
-					            arrEnv[0][0] = hex2dec(arr_reciveData,10,12)/10;	// 온도
-								arrEnv[1][0] = hex2dec(arr_reciveData,14,16)/10;	// 습도
-								arrEnv[2][0] = hex2dec(arr_reciveData,18,21);		// CO2
-								arrEnv[3][0] = hex2dec(arr_reciveData,23,26);		// 조도
-    					    }
-      
-    					    // 모니터링 탭 화면에 현재 센서값을 텍스트형태로 출력
-					        $('#label_temperature').text(String(arrEnv[0][0]));	
-						    $('#label_humidity').text(String(arrEnv[1][0]));
-							if(arrEnv[2][0]<6000)	
-							    $('#label_co2').text(String(arrEnv[2][0]));	
-						    $('#label_illumination').text(String(arrEnv[3][0]));
-							
-							
-							// 센서값이 임계값을 벗어난 경우, 알람 메시지창 노출
-							alram(arrEnv[0][0], arrEnv[0][1], arrEnv[0][2], arrEnv[0][3],"온도");
-							alram(arrEnv[1][0], arrEnv[1][1], arrEnv[1][2], arrEnv[1][3], "습도");
-							if(arrEnv[2][0]<6000)	
-								alram(arrEnv[2][0], arrEnv[2][1], arrEnv[2][2], arrEnv[2][3], "이산화탄소");
-							alram(arrEnv[3][0], arrEnv[3][1], arrEnv[3][2], arrEnv[3][3],"조도");
-							
-					    
-						    // 윈도우 사이즈에 따라 차트 사이즈 조절
-						    $('#chart_temperature').css("height",(arrEnv[0][0]/val_max[0]*bar_height)+"px");
-						    $('#chart_humidity').css("height",(arrEnv[1][0]/val_max[1]*bar_height)+"px");
-							if(arrEnv[2][0]<6000)
-							    $('#chart_co2').css("height",(arrEnv[2][0]/val_max[2]*bar_height)+"px");
-						    $('#chart_illumination').css("height",(arrEnv[3][0]/val_max[3]*bar_height)+"px");
-					   	}
-					}
-					packet ='';	
-                });
+				// 윈도우 사이즈에 따라 차트 사이즈 조절
+				$('#chart_temperature').css("height",(arrEnv[0][0]/val_max[0]*bar_height)+"px");
+				$('#chart_humidity').css("height",(arrEnv[1][0]/val_max[1]*bar_height)+"px");
+				if(arrEnv[2][0]<6000)
+					$('#chart_co2').css("height",(arrEnv[2][0]/val_max[2]*bar_height)+"px");
+				$('#chart_illumination').css("height",(arrEnv[3][0]/val_max[3]*bar_height)+"px");
 			}
 			
 			
-			// 16진수로 들어온 센서 패킷데이터를 실제 활용할 수 있도록 정수로 변환하는 함수 (AnyGrow 프로토콜.xlsx 참고)
-			function hex2dec(arr, first, last){	
-			  
-			    
-			    var area = last-first;
-			    result = '';
-			    
-			   for(var i=first; i<=last; i++){
-			        result += String(eval(arr[i])-30);
-			    }
-			    
-			    return eval(result);
+			// 장치 제어 명령 전송 함수. 서버는 접수 결과(queued / failed)를 바로 돌려주고,
+			// 실제 전송 결과는 'command_ack' 이벤트로 다시 알려줌
+			function send_command(cmd, args){
+				if(!socket) return;
+				commandSeq += 1;
+				socket.emit('command', {id: commandSeq, cmd: cmd, args: args}, function (ack) {
+					on_command_ack(ack);
+				});
+			}
+
+			function on_command_ack(ack){
+				if(ack.status == "failed")
+					alert("명령 전송 실패 (" + ack.cmd + "): " + ack.error);
+				else
+					console.log("command " + ack.id + " " + ack.cmd + " " + ack.status + (ack.wait_ms != null ? " (" + ack.wait_ms + " ms)" : ""));
 			}
 			
-			// 센서값이 임계값을 벗어난 경우, 알람 메시지창 노출하는 함수
-			function alram(val_data, val_min, val_max, alram_flag, factor){
-				var comment='';
-				if(alram_flag==0){
-					if(val_data<val_min){
-						comment = factor+"가 너무 낮습니다";
-						
-						alert(comment);
-						$('#alram_comment').text(comment);	
-						
-					}
-					else if(val_data>val_max){
-						comment = factor+"가 너무 높습니다";
-						
-						alert(comment);
-						$('#alram_comment').text(comment);	
-					}
-					else{
-						comment='';
-						$('#alram_comment').text(comment);	
-					}
+			
+			// 서버에서 알람 상태 변화가 전달된 경우, 알람 메시지창 노출하는 함수
+			function on_alarm(ev){
+				var factor = ALARM_FACTORS[ev.channel] || ev.channel;
+				var comment = '';
+				if(ev.level != "NORMAL"){
+					comment = factor + (ev.side == "low" ? "가 너무 낮습니다" : "가 너무 높습니다");
+					alert(comment);
+				}
+				alarmComments[ev.channel] = comment;
+				show_alarm_comments();
+			}
+
+			function show_alarm_comments(){
+				var comments = [];
+				for(var key in alarmComments){
+					if(alarmComments[key]) comments.push(alarmComments[key]);
 				}
-				alram_flag=1;
+				$('#alram_comment').text(comments.join(' / '));
+			}
 
+			// 서버 임계값(warning_low / warning_high)을 설정 탭 슬라이더에 표시하는 함수
+			// 규칙에 없는 경계는 HTML 기본값이 그대로 보이므로, 표시 직후 값을 기억해 두고 저장할 때 바뀐 경계만 보냄
+			function show_thresholds(rules){
+				for(var key in THRESHOLD_SLIDERS){
+					var rule = rules[key] || {};
+					var name = THRESHOLD_SLIDERS[key];
+					if(rule.warning_low != null) $('#tf_' + name + '_min').val(rule.warning_low);
+					if(rule.warning_high != null) $('#tf_' + name + '_max').val(rule.warning_high);
+					try { $('#tf_' + name + '_min').closest(':jqmData(role=rangeslider)').rangeslider('refresh'); } catch(e) {}
+					thresholdShown[key] = {
+						min: Number(document.getElementById('tf_' + name + '_min').value),
+						max: Number(document.getElementById('tf_' + name + '_max').value)
+					};
+				}
 			}
 			
-			// 임계값 설정 함수 (초기화, setting탭에서 게이지 변경 시 활용)
+			// 임계값 저장 함수 (setting탭에서 save 버튼 선택 시 사용자가 움직인 경계만 서버의 임계값 엔진에 반영)
 			function chanage_threshold(){
-				arrEnv[0][1] = document.getElementById('tf_temperature_min').value;
-				arrEnv[0][2] = document.getElementById('tf_temperature_max').value;
-				arrEnv[1][1] = document.getElementById('tf_humidity_min').value;
-				arrEnv[1][2] = document.getElementById('tf_humidity_max').value;
-				arrEnv[2][1] = document.getElementById('tf_co2_min').value;
-				arrEnv[2][2] = document.getElementById('tf_co2_max').value;
-				arrEnv[3][1] = document.getElementById('tf_illumination_min').value;
-				arrEnv[3][2] = document.getElementById('tf_illumination_max').value;
+				var data = {};
+				for(var key in THRESHOLD_SLIDERS){
+					var name = THRESHOLD_SLIDERS[key];
+					var shown = thresholdShown[key] || {};
+					var bounds = {};
+					var min = Number(document.getElementById('tf_' + name + '_min').value);
+					var max = Number(document.getElementById('tf_' + name + '_max').value);
+					if(min !== shown.min) bounds.min = min;
+					if(max !== shown.max) bounds.max = max;
+					if(bounds.min != null || bounds.max != null) data[key] = bounds;
+				}
+				if(socket && !$.isEmptyObject(data)) socket.emit('set_thresholds', data);
 			}
 		
-			// 알람 플래그 초기화 함수
+			// 알람 메시지 초기화 함수
 			function alram_init(){
-				arrEnv[0][3] = 0;
-				arrEnv[1][3] = 0;
-				arrEnv[2][3] = 0;
-				arrEnv[3][3] = 0;
-			}
\ No newline at end of file
+				alarmComments = {};
+				show_alarm_comments();
+			}
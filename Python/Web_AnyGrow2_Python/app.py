@@ -1,26 +1,52 @@
 # app.py
 # AnyGrow2 Python 서버 (Flask + Socket.IO + 시리얼)
+# 스레드 모드 서버입니다. 접속 클라이언트가 많으면 asyncio 모드(async_app.py)를 사용하세요.
 
-from flask import Flask, send_from_directory
-from flask_socketio import SocketIO
+from flask import Flask, send_file, request, jsonify, make_response
+from flask_socketio import SocketIO, emit, join_room, leave_room
 import serial
 import threading
 import time
+import os
+import sys
+import hashlib
+
+# GUI 프로젝트의 core 모듈(센서 이력 등)을 함께 사용합니다.
+GUI_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "GUI_AnyGrow2_Python"))
+sys.path.insert(0, GUI_DIR)
+from core.constants import HISTORY_DB_FILE, SENSOR_KEYS
+from core.history import SensorHistory, pack_series
+from core.command_queue import STATUS_QUEUED, STATUS_FAILED, build_packet
+from core.device_link import DeviceLink
+from core.broker_client import BrokerClient
+from core.broker_protocol import TOPIC_SENSOR, TOPIC_RAW, TOPIC_STATUS, parse_address
+from core.alarm import CHANNEL_LABELS, AlarmEngine, DEFAULT_THRESHOLD_PATH, load_threshold_rules, save_threshold_rules
+from assets import AssetStore, IMMUTABLE_MAX_AGE
+from metrics import ServerMetrics
 
 # -----------------------------
 # 1. Flask & SocketIO 설정
 # -----------------------------
-# static_folder='.' : 현재 폴더에서 index.html, js, css, image 를 그대로 서빙
-app = Flask(__name__, static_folder='.', static_url_path='')
+# 정적 파일은 Flask 기본 static 대신 assets.py 의 빌드 결과(dist/)만 서빙합니다.
+# (현재 폴더를 그대로 서빙하면 zip, py 파일까지 노출됩니다)
+app = Flask(__name__, static_folder=None)
 socketio = SocketIO(app, cors_allowed_origins="*", async_mode="threading")
 
 # -----------------------------
 # 2. 시리얼 포트 설정
 # -----------------------------
-SERIAL_PORT = 'COM5'   # 👉 실제 연결된 포트로 수정
+SERIAL_PORT = os.getenv("ANYGROW_SERIAL_PORT", 'COM5')   # 👉 실제 연결된 포트로 수정
 BAUD_RATE = 38400
+SENSOR_POLL_INTERVAL = float(os.getenv("ANYGROW_POLL_INTERVAL", "1.0"))   # 센서 요청 주기 (초)
+WEB_PORT = int(os.getenv("ANYGROW_WEB_PORT", "52273"))
+
+# 설정하면 포트를 직접 열지 않고 로컬 브로커(GUI_AnyGrow2_Python/broker.py)를 통해 GUI 등과 함께 사용합니다.
+# 예: ANYGROW_BROKER=1 (기본 주소), unix:/tmp/anygrow2_broker.sock, tcp:127.0.0.1:52280
+BROKER_ADDRESS = os.getenv("ANYGROW_BROKER")
 
 ser = None
+broker = None
+broker_serial_open = False  # 브로커 모드에서 브로커가 알려준 포트 상태
 
 
 def init_serial():
@@ -43,201 +69,558 @@ def init_serial():
         ser = None
 
 
+def init_broker():
+    """
+    로컬 브로커 접속. 포트와 센서 요청 주기, 명령 순서는 브로커가 관리하고
+    이 서버는 파싱된 센서값과 명령 결과를 받아 클라이언트에 전달합니다.
+    """
+    global broker
+    broker = BrokerClient(broker_topics(), parse_address(BROKER_ADDRESS),
+                          on_message=on_broker_message, on_ack=on_broker_ack)
+    broker.start()
+
+
+def broker_topics():
+    """원시 바이트는 디버그 구독자가 있을 때만 브로커에서 받습니다."""
+    return (TOPIC_SENSOR, TOPIC_STATUS, TOPIC_RAW) if raw_debug_sids else (TOPIC_SENSOR, TOPIC_STATUS)
+
+
 # -----------------------------
-# 3. 전역 상태값 (Node 서버와 동일 구조)
+# 2-1. 센서 이력 DB (GUI와 같은 파일을 공유)
 # -----------------------------
-packetLED = b""
-reciving_data = b""
+HISTORY_DB_PATH = os.getenv("ANYGROW_HISTORY_DB", os.path.join(GUI_DIR, HISTORY_DB_FILE))
+HISTORY_LIVE_MAX_AGE = 5        # 현재 시각을 포함하는 조회의 캐시 유지 시간 (초)
+HISTORY_PAST_MAX_AGE = 3600     # 과거 구간 조회의 캐시 유지 시간 (초)
 
-rq_state = ""    # "Off" / "Mood" / "On"
-rc_state = "ok"  # "ok" / "wait"
-receive_count = 0
-data_state = ""
+history = None
 
-lock = threading.Lock()
+
+def init_history():
+    """
+    센서 이력 DB 오픈
+    """
+    global history
+    try:
+        history = SensorHistory(HISTORY_DB_PATH)
+        print(f"[History] Opened {HISTORY_DB_PATH}")
+    except Exception as e:
+        print("[History] Error opening database:", e)
+        history = None
 
 
 # -----------------------------
-# 4. 패킷 생성 함수
+# 2-2. 센서 임계값(알람) 엔진 (GUI, 음성 비서와 같은 규칙 파일을 공유)
 # -----------------------------
-def make_led_packet(mode: str):
-    if mode == "Off":
-        hex_str = "0201FF4CFF00FF00FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF03"
-    elif mode == "Mood":
-        hex_str = "0201FF4CFF00FF02FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF03"
-    elif mode == "On":
-        hex_str = "0201FF4CFF00FF01FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF03"
-    else:
-        return None
-    return bytes.fromhex(hex_str)
+THRESHOLD_PATH = os.getenv("ANYGROW_THRESHOLDS", DEFAULT_THRESHOLD_PATH)
 
+alarm_engine = AlarmEngine(load_threshold_rules(THRESHOLD_PATH))
 
-# 센서 데이터 요청 패킷 (Node 코드의 0202FF53... 동일)
-SENSOR_REQUEST_PACKET = bytes.fromhex(
-    "0202FF53FF00FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF03"
-)
+# 설정 탭의 슬라이더 id 접두어 ↔ 센서 키
+THRESHOLD_SLIDER_KEYS = {
+    "temp": "temperature",
+    "hum": "humidity",
+    "co2": "co2",
+    "illum": "illumination",
+}
 
 
 # -----------------------------
-# 5. 웹 라우팅
+# 2-3. 정적 파일 (해시 이름 + 미리 압축, 소스가 바뀌면 시작할 때 다시 빌드)
+# -----------------------------
+ENTRY_PATH = ""     # "/" 요청 → index.html
+assets = None
+
+
+def get_assets():
+    global assets
+    if assets is None:
+        assets = AssetStore()
+    return assets
+
+
+# -----------------------------
+# 3. 전역 상태값
+# -----------------------------
+def write_serial(packet: bytes):
+    if ser is None:
+        raise IOError("serial port is not open")
+    ser.write(packet)
+
+
+# 장치로 보내는 모든 명령(센서 요청 포함)은 device.commands 큐를 거쳐 최소 간격(COMMAND_INTERVAL)을 지키며
+# 바로 전송됩니다. 센서 요청/응답 상태도 device 가 관리하며, 브라우저의 응답과 관계없이 프레임 완성을 직접 판단합니다.
+device = DeviceLink(write_serial, SENSOR_POLL_INTERVAL)
+
+# 마지막 센서값 캐시. 새 클라이언트는 접속 즉시 이 값을 받고,
+# 값이 바뀐 경우에만 'sensor' 이벤트를 보냅니다.
+last_reading = None
+
+# 원시 패킷(hex)은 디버그용 방에 들어온 클라이언트에게만 보냅니다.
+RAW_DEBUG_ROOM = "raw_debug"
+raw_debug_sids = set()
+
+lock = threading.Lock()
+
+# 운영 지표 (/metrics, /health). 카운터는 lock 없이 갱신/조회합니다. (metrics.py 참고)
+metrics = ServerMetrics(device)
+connected_sids = set()      # 접속 중인 Socket.IO 클라이언트
+HEALTH_READING_MAX_AGE = max(10.0, 5 * SENSOR_POLL_INTERVAL)   # 이보다 오래 센서값이 없으면 /health 503 (초)
+
+
+def serial_is_open():
+    """포트 열림 여부 (lock 없이 조회). 브로커 모드에서는 브로커가 알려준 포트 상태입니다."""
+    if broker is not None:
+        return broker.connected and broker_serial_open
+    return ser is not None and ser.is_open
+
+
+metrics.register("gauge", "serial_open", "1 if the serial port is open.", lambda: int(bool(serial_is_open())))
+metrics.register("gauge", "socketio_clients", "Connected Socket.IO clients.", lambda: len(connected_sids))
+metrics.register("gauge", "raw_debug_clients", "Clients subscribed to raw serial bytes.", lambda: len(raw_debug_sids))
+metrics.register("gauge", "command_queue_depth", "Commands waiting to be written to the device.",
+                 lambda: len(device.commands))
+metrics.register("counter", "commands_sent_total", "Commands written to the device.", lambda: device.commands.sent)
+metrics.register("counter", "commands_failed_total", "Commands rejected or failed.", lambda: device.commands.failed)
+metrics.register("counter", "sensor_response_timeouts_total", "Sensor requests without a response before the next poll.",
+                 lambda: device.response_timeouts)
+metrics.register("gauge", "broker_connected", "1 if connected to the local broker (broker mode only).",
+                 lambda: None if broker is None else int(broker.connected))
+
+
+# -----------------------------
+# 4. 웹 라우팅
 # -----------------------------
 @app.route("/")
 def index():
-    # ./index.html 그대로 반환
-    return send_from_directory(".", "index.html")
+    return serve_asset(ENTRY_PATH)
+
+
+@app.route("/api/history")
+def api_history():
+    """
+    센서 이력 조회 API.
+    /api/history?sensor=temp&start=<epoch초>&end=<epoch초>&points=600&method=lttb|minmax&format=json|bin
+    start/end 를 생략하면 최근 24시간을 반환합니다.
+    format=bin 은 core.history.pack_series 형식(헤더 + float64 시간 + float32 값)입니다.
+    """
+    if history is None:
+        return jsonify({"error": "history database is not available"}), 503
+
+    try:
+        # 기본 end 는 캐시가 재사용되도록 조회 주기 단위로 맞춥니다.
+        now = int(time.time()) // HISTORY_LIVE_MAX_AGE * HISTORY_LIVE_MAX_AGE
+        end = float(request.args.get("end", now))
+        start = float(request.args.get("start", end - 24 * 3600))
+        points = int(request.args.get("points", 600))
+        sensor = request.args.get("sensor", "temp")
+        method = request.args.get("method", "lttb")
+        fmt = request.args.get("format", "json")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # 범위가 마지막 샘플 이전에 끝나면 결과가 바뀌지 않으므로 오래 캐시합니다.
+    # 샘플은 GUI 프로세스가 기록하므로 마지막 샘플 시간은 요청마다 DB에서 읽습니다.
+    last_ts = history.last_timestamp()
+    is_live = end >= last_ts
+    stamp = last_ts if is_live else 0
+    etag = hashlib.sha1(f"{sensor}|{start}|{end}|{points}|{method}|{fmt}|{stamp}".encode()).hexdigest()[:16]
+    max_age = HISTORY_LIVE_MAX_AGE if is_live else HISTORY_PAST_MAX_AGE
+
+    if request.if_none_match.contains(etag):
+        resp = make_response("", 304)
+    else:
+        try:
+            result = history.query(sensor, start, end, points, method)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        if fmt == "bin":
+            resp = make_response(pack_series(result))
+            resp.headers["Content-Type"] = "application/octet-stream"
+            resp.headers["X-History-Source"] = result["source"]
+        else:
+            resp = jsonify(result)
+
+    resp.set_etag(etag)
+    resp.headers["Cache-Control"] = f"public, max-age={max_age}"
+    return resp
+
+
+@app.route("/api/latest")
+def api_latest():
+    """
+    마지막 센서값 캐시 조회 API. 값이 아직 없으면 204.
+    {"temp": 24.5, "hum": 55.0, "co2": 420, "illum": 1200, "ts": <epoch초>}
+    """
+    with lock:
+        reading = last_reading
+    if reading is None:
+        return "", 204
+    resp = jsonify(reading)
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp
+
+
+@app.route("/metrics")
+def api_metrics():
+    """Prometheus 텍스트 형식 운영 지표. 시리얼 lock 을 잡지 않습니다."""
+    resp = make_response(metrics.to_prometheus())
+    resp.headers["Content-Type"] = "text/plain; version=0.0.4; charset=utf-8"
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp
+
+
+@app.route("/health")
+def api_health():
+    """
+    상태 확인 API. 포트가 열려 있고 최근 HEALTH_READING_MAX_AGE 초 안에 정상 센서값이 있으면 200, 아니면 503.
+    {"status": "ok" | "no_reading" | "serial_closed", "serial_open", "last_reading_age_s",
+     "clients", "command_queue", "uptime_s"}
+    """
+    is_open = bool(serial_is_open())
+    age = metrics.reading_age()
+    if not is_open:
+        status = "serial_closed"
+    elif age is None or age > HEALTH_READING_MAX_AGE:
+        status = "no_reading"
+    else:
+        status = "ok"
+    resp = jsonify({
+        "status": status,
+        "serial_open": is_open,
+        "last_reading_age_s": None if age is None else round(age, 3),
+        "clients": len(connected_sids),
+        "command_queue": len(device.commands),
+        "uptime_s": round(metrics.uptime(), 1),
+    })
+    resp.status_code = 200 if status == "ok" else 503
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp
 
 
 @app.route("/<path:path>")
 def static_proxy(path):
-    # ./ 이하의 모든 정적 파일(js, css, image 등) 서빙
-    return send_from_directory(".", path)
+    # dist/manifest.json 에 있는 웹 파일(js, css, image 등)만 서빙
+    return serve_asset(path)
+
+
+def serve_asset(path):
+    """
+    빌드된 정적 파일을 미리 압축된 버전(br/gzip)으로 전송합니다.
+    해시 이름 파일은 1년 immutable 캐시, index.html 등 원래 이름은 매번 ETag 로 재검증(304)합니다.
+    """
+    found = get_assets().select(path, request.headers.get("Accept-Encoding", ""))
+    if found is None:
+        return jsonify({"error": "not found"}), 404
+    file_path, encoding, etag, mimetype, immutable = found
+
+    if request.if_none_match.contains(etag):
+        resp = make_response("", 304)
+    else:
+        resp = send_file(file_path, mimetype=mimetype, conditional=False, etag=False)
+        if encoding:
+            resp.headers["Content-Encoding"] = encoding
+    resp.set_etag(etag)
+    resp.headers["Vary"] = "Accept-Encoding"
+    resp.headers["Cache-Control"] = f"public, max-age={IMMUTABLE_MAX_AGE}, immutable" if immutable else "no-cache"
+    return resp
 
 
 # -----------------------------
-# 6. Socket.IO 이벤트
+# 5. Socket.IO 이벤트
 # -----------------------------
 @socketio.on("connect")
 def on_connect():
     print("[Socket] Client connected")
+    connected_sids.add(request.sid)
+    # 새 클라이언트에 현재 임계값과 알람 상태, 마지막 센서값 전달
+    rules, states, reading = connect_snapshot()
+    emit("thresholds", rules)
+    for event in states:
+        emit("alarm", event.to_dict())
+    if reading is not None:
+        emit("sensor", reading)
+
+
+def connect_snapshot():
+    """새 클라이언트에 보낼 (임계값, 알람 상태, 마지막 센서값)을 반환합니다. (스레드/asyncio 모드 공용)"""
+    with lock:
+        return alarm_engine.rules, alarm_engine.snapshot(), last_reading
 
 
 @socketio.on("disconnect")
 def on_disconnect():
     print("[Socket] Client disconnected")
+    connected_sids.discard(request.sid)
+    # Socket.IO가 방 정리는 하지만, 디버그 구독자 목록은 직접 정리해야 합니다.
+    with lock:
+        raw_debug_sids.discard(request.sid)
+    if broker is not None:
+        broker.subscribe(broker_topics())
+
+
+@socketio.on("raw_subscribe")
+def on_raw_subscribe(enabled=True):
+    """
+    원시 패킷 디버그 채널 구독/해제.
+    anygrow2_client.js 에서 주소에 ?raw=1 을 붙이면 socket.emit('raw_subscribe', true)
+    구독한 클라이언트는 'serial_raw' 이벤트로 "aa,bb,cc,..." 형식의 수신 바이트를 받습니다.
+    """
+    with lock:
+        if enabled:
+            raw_debug_sids.add(request.sid)
+        else:
+            raw_debug_sids.discard(request.sid)
+        count = len(raw_debug_sids)
+    if enabled:
+        join_room(RAW_DEBUG_ROOM)
+    else:
+        leave_room(RAW_DEBUG_ROOM)
+    if broker is not None:
+        broker.subscribe(broker_topics())
+    print(f"[Socket] raw debug subscribers: {count}")
 
 
 @socketio.on("serial_write")
 def on_serial_write(data):
     """
-    클라이언트(anygrow2_client.js)에서
-    socket.emit('serial_write', "On") 이런 식으로 보내는 이벤트.
-    여기서는 rq_state 에 저장만 하고,
-    실제 패킷 전송은 background_loop 에서 1초 주기로 처리.
+    LED 버튼 이벤트. socket.emit('serial_write', "On") ("Off" / "Mood" / "On")
+    예전 클라이언트 호환용이며, 'command' 이벤트의 led 명령과 같이 처리됩니다.
     """
-    global rq_state
     print(f"[Socket] serial_write: {data}")
-    with lock:
-        rq_state = data   # "Off" / "Mood" / "On"
+    return submit_command({"cmd": "led", "args": {"mode": data}}, request.sid)
+
+
+@socketio.on("command")
+def on_command(data):
+    """
+    장치 제어 명령 이벤트.
+    socket.emit('command', {id: 'c1', cmd: 'pump', args: {on: true}}, function (ack) { ... })
+    cmd: led {mode} / pump {on} / uv {on} / channel_led {settings} / bms_time_sync {hour, minute, second}
+    콜백으로 'queued' (또는 'failed') 응답을 바로 받고,
+    전송 결과는 'command_ack' 이벤트({id, cmd, status, queued_at, sent_at, wait_ms, error})로 받습니다.
+    """
+    return submit_command(data, request.sid)
+
+
+def submit_command(data, client):
+    """
+    클라이언트 명령을 큐에 넣고 접수 결과(ack)를 반환합니다. (스레드/asyncio 모드 공용)
+    bms_time_sync 에 시각이 없으면 서버의 현재 시각을 사용합니다.
+    """
+    data = data if isinstance(data, dict) else {}
+    cmd = str(data.get("cmd"))
+    args = data.get("args") if isinstance(data.get("args"), dict) else {}
+    reject = None
+    if cmd == "sensor_req":
+        reject = "sensor_req is sent by the server and cannot be requested by clients"
+    elif cmd == "bms_time_sync" and not args:
+        now = time.localtime()
+        args = {"hour": now.tm_hour, "minute": now.tm_min, "second": now.tm_sec}
+    if broker is not None:
+        return submit_to_broker(cmd, args, data.get("id"), client, reject)
+    # 포트가 없으면 큐에 쌓아두지 않고 바로 실패로 알립니다.
+    if reject is None and ser is None:
+        reject = "serial port is not open"
+    command = device.commands.submit(cmd, args, client=client, command_id=data.get("id"), reject=reject)
+    print(f"[Command] {command.cmd} {command.args} → {command.status}")
+    return command.to_ack()
+
+
+def submit_to_broker(cmd, args, command_id, client, reject=None):
+    """
+    브로커 모드의 명령 접수. 'queued' (또는 'failed') 를 바로 반환하고,
+    전송 결과는 브로커의 응답이 오면 on_broker_ack 에서 'command_ack' 로 보냅니다.
+    reject 를 주면 브로커에 보내지 않고 그 사유로 실패 처리합니다.
+    """
+    ack = {"id": command_id, "cmd": cmd, "status": STATUS_QUEUED, "queued_at": time.time()}
+    if reject:
+        ack.update(status=STATUS_FAILED, error=reject)
+    elif build_packet(cmd, args) is None:
+        ack.update(status=STATUS_FAILED, error=f"unknown command or bad arguments: {cmd}")
+    elif not broker.submit(cmd, args, command_id=command_id, context=client):
+        ack.update(status=STATUS_FAILED, error="broker is not connected")
+    print(f"[Command] {cmd} {args} → {ack['status']} (broker)")
+    return ack
+
+
+def on_broker_ack(ack, client):
+    if client is not None:
+        socketio.emit("command_ack", ack, to=client)
 
 
 @socketio.on("comm_state")
 def on_comm_state(data):
     """
-    클라이언트가 센서 데이터 처리를 끝냈다고 알려주는 이벤트.
-    타임아웃(통신 끊김) 체크에 사용.
-    anygrow2_client.js 에서 socket.emit('comm_state', 'sensor data response')
+    예전 클라이언트가 센서 데이터 처리를 끝냈다고 알려주던 이벤트.
+    서버가 머리말(02 02)과 끝 표시(ff ff)로 프레임 완성을 직접 판단하므로 폴링에는 영향을 주지 않습니다.
+    """
+
+
+@socketio.on("set_thresholds")
+def on_set_thresholds(data):
+    """
+    설정 탭에서 임계값을 저장할 때 호출되는 이벤트.
+    data = {"temp": {"min": 20, "max": 40}, ...}
+    클라이언트는 사용자가 움직인 경계만 보내며, min/max 는 각 채널의 warning_low / warning_high 로 반영되고
+    모든 클라이언트에 전파됩니다. 새 범위가 CRITICAL 경계를 넘으면 thresholds_error 로 거부합니다.
+    """
+    print(f"[Socket] set_thresholds: {data}")
+    try:
+        rules, events = apply_thresholds(data)
+    except ValueError as e:
+        emit("thresholds_error", str(e))
+        emit("thresholds", alarm_engine.rules)
+        return
+
+    socketio.emit("thresholds", rules)
+    for event in events:
+        socketio.emit("alarm", event.to_dict())
+
+
+def apply_thresholds(data):
+    """
+    설정 탭의 min/max 를 임계값 엔진에 반영하고 파일에 저장합니다. (스레드/asyncio 모드 공용)
+    현재 규칙과 같은 경계는 무시하고, 바뀐 경계가 없으면 파일을 다시 쓰지 않습니다.
+    반환값: (새 규칙 딕셔너리, 상태가 바뀐 알람 이벤트 목록). 잘못된 값이면 ValueError.
     """
-    global rc_state, data_state, receive_count
-    print(f"[Socket] comm_state: {data}")
     with lock:
-        data_state = data
-        rc_state = "ok"
-        receive_count = 0
+        changes = {}
+        for key, bounds in (data or {}).items():
+            if key not in THRESHOLD_SLIDER_KEYS or not isinstance(bounds, dict):
+                continue
+            current = alarm_engine.rules.get(key, {})
+            rule = {}
+            for side, field in (("min", "warning_low"), ("max", "warning_high")):
+                if bounds.get(side) is None:
+                    continue
+                value = float(bounds[side])
+                if current.get(field) is None or float(current[field]) != value:
+                    rule[field] = value
+            if rule:
+                check_warning_range(key, {**current, **rule})
+                changes[key] = rule
+
+        if not changes:
+            return alarm_engine.rules, []
+        events = alarm_engine.update_rules(changes)
+        rules = alarm_engine.rules
+        save_threshold_rules(rules, THRESHOLD_PATH)
+    return rules, events
+
+
+def check_warning_range(key, rule):
+    """
+    WARNING 범위가 CRITICAL 경계 안쪽에 있는지 확인합니다. 경계를 조용히 옮기지 않고 ValueError 로 거부합니다.
+    """
+    label = CHANNEL_LABELS.get(key, key)
+    low, high = rule.get("warning_low"), rule.get("warning_high")
+    if low is not None and high is not None and low > high:
+        raise ValueError(f"{label}: 주의 하한({low:g})이 주의 상한({high:g})보다 큽니다.")
+    if low is not None and rule.get("critical_low") is not None and rule["critical_low"] > low:
+        raise ValueError(f"{label}: 주의 하한({low:g})이 위험 하한({rule['critical_low']:g})보다 낮습니다.")
+    if high is not None and rule.get("critical_high") is not None and rule["critical_high"] < high:
+        raise ValueError(f"{label}: 주의 상한({high:g})이 위험 상한({rule['critical_high']:g})보다 높습니다.")
 
 
 # -----------------------------
-# 7. 1초 주기 루프 (LED 제어 + 센서 요청)
+# 6. 장치 루프 (센서 요청 주기 + 명령 전송, core/device_link.py)
 # -----------------------------
-def background_loop():
-    global rq_state, rc_state, receive_count
+def on_command_done(command):
+    if command.client is not None:
+        socketio.emit("command_ack", command.to_ack(), to=command.client)
 
-    while True:
-        try:
-            with lock:
-                local_rq_state = rq_state
-                local_rc_state = rc_state
-                local_receive_count = receive_count
-
-            if ser is not None and local_rc_state == "ok":
-                # 1) LED 제어 요청이 있으면 먼저 처리
-                if local_rq_state != "":
-                    led_packet = make_led_packet(local_rq_state)
-                    if led_packet is not None:
-                        print("@@@@@@@@@@ LED 제어 패킷 전송 @@@@@@@@@@")
-                        print(led_packet)
-                        try:
-                            ser.write(led_packet)
-                        except Exception as e:
-                            print("[Loop] LED write error:", e)
-                    # 한번 처리한 뒤에는 rq_state 비우기
-                    with lock:
-                        rq_state = ""
-
-                # 2) 그 다음 센서 데이터 요청
-                try:
-                    print("////////// 모니터링 센서데이터 요청 //////////")
-                    ser.write(SENSOR_REQUEST_PACKET)
-                except Exception as e:
-                    print("[Loop] Sensor request write error:", e)
-
-                with lock:
-                    rc_state = "wait"
-                    receive_count = 0
-
-            else:
-                # 응답 대기 중이면 타임아웃 카운트
-                local_receive_count += 1
-                if local_receive_count > 5:
-                    print("[Loop] Timeout, rc_state 복구 → ok")
-                    with lock:
-                        rc_state = "ok"
-                        receive_count = 0
-                else:
-                    with lock:
-                        receive_count = local_receive_count
 
-        except Exception as e:
-            print("[Loop] Error:", e)
+# -----------------------------
+# 7. 시리얼 수신 루프
+# -----------------------------
+def process_reading(reading):
+    """
+    파싱된 센서값(직접 수신한 프레임 또는 브로커 메시지)으로 임계값 엔진 평가와 값 변경 확인을 합니다.
+    (스레드/asyncio 모드 공용)
+    반환값: (값이 바뀐 경우 {temp, hum, co2, illum, ts}, 아니면 None, 알람 이벤트 목록)
+    """
+    global last_reading
+    metrics.last_reading_at = time.monotonic()
+    now = reading.get("timestamp") or time.time()
+    values = {key: reading[key] for key in SENSOR_KEYS}
+    with lock:
+        events = alarm_engine.evaluate(dict(values, timestamp=now))
+        changed = last_reading is None or any(last_reading[k] != values[k] for k in values)
+        if changed:
+            last_reading = dict(values, ts=round(now, 3))
+    return (last_reading if changed else None), events
 
-        time.sleep(1)
 
+def emit_reading(payload, events):
+    """
+    상태가 바뀐 채널만 'alarm' 이벤트로, 값이 바뀐 경우에만 'sensor' 이벤트로 전송합니다.
+    """
+    for event in events:
+        socketio.emit("alarm", event.to_dict())
+    if payload is not None:
+        socketio.emit("sensor", payload)
 
-# -----------------------------
-# 8. 시리얼 수신 루프
-# -----------------------------
-def serial_read_loop():
-    global reciving_data
 
+def serial_read_loop():
     if ser is None:
         print("[Serial] Port is not opened, skip read loop.")
         return
 
     while True:
         try:
-            data = ser.read(1024)
+            # 수신 대기(timeout=0.1)는 read 가 하므로 별도의 sleep 없이 도착 즉시 처리합니다.
+            data = ser.read(ser.in_waiting or 1)
             if data:
-                reciving_data = data
-                print(" - 센서데이터 수신")
-                print(reciving_data)
-
-                # Node 서버처럼: 수신된 바이트를 hex string -> "aa,bb,cc,..." 형식으로 변환
-                hex_string = data.hex()
-                arr_reciveData = ""
-                for i, ch in enumerate(hex_string):
-                    if i != 0 and i % 2 == 0:
-                        arr_reciveData += ","
-                    arr_reciveData += ch
-
-                # 소켓으로 클라이언트에 전달
-                socketio.emit("serial_recive", arr_reciveData)
+                # 원시 바이트는 디버그 구독자가 있을 때만 "aa,bb,cc,..." 형식으로 변환해 보냅니다.
+                if raw_debug_sids:
+                    socketio.emit("serial_raw", data.hex(","), to=RAW_DEBUG_ROOM)
+                for reading in device.feed(data):
+                    emit_reading(*process_reading(reading))
         except Exception as e:
+            metrics.read_errors += 1
             print("[Serial] Read error:", e)
+            time.sleep(0.5)
+
 
-        time.sleep(0.05)
+def on_broker_message(topic, body):
+    """
+    브로커 모드의 수신 처리. 프레임 파싱은 브로커가 이미 한 번 했으므로 값만 받아 처리합니다.
+    """
+    global broker_serial_open
+    if topic == TOPIC_SENSOR:
+        # 프레임 수신/파싱은 브로커에서 했으므로 받은 센서값 수를 파싱된 프레임 수로 셉니다.
+        device.observe_reading(body.get("response_ms"))
+        emit_reading(*process_reading(body))
+    elif topic == TOPIC_RAW:
+        if raw_debug_sids:
+            socketio.emit("serial_raw", body["hex"], to=RAW_DEBUG_ROOM)
+    elif topic == TOPIC_STATUS:
+        broker_serial_open = bool(body.get("open"))
+        print(f"[Broker] {body.get('message')}")
 
 
 # -----------------------------
-# 9. 메인 실행
+# 8. 메인 실행
 # -----------------------------
 if __name__ == "__main__":
-    init_serial()
+    init_history()
+    get_assets()
+
+    if BROKER_ADDRESS:
+        # 포트, 센서 요청, 명령 큐는 브로커가 관리합니다.
+        init_broker()
+    else:
+        init_serial()
+
+        # 백그라운드 쓰레드 시작
+        loop_thread = threading.Thread(target=device.run_poll_loop, args=(lambda: ser is not None,), daemon=True)
+        loop_thread.start()
 
-    # 백그라운드 쓰레드 시작
-    loop_thread = threading.Thread(target=background_loop, daemon=True)
-    loop_thread.start()
+        serial_thread = threading.Thread(target=serial_read_loop, daemon=True)
+        serial_thread.start()
 
-    serial_thread = threading.Thread(target=serial_read_loop, daemon=True)
-    serial_thread.start()
+        command_thread = threading.Thread(target=device.run_command_loop, args=(on_command_done,), daemon=True)
+        command_thread.start()
 
     # Flask + Socket.IO 서버 실행
-    socketio.run(app, host="0.0.0.0", port=52273)
+    socketio.run(app, host="0.0.0.0", port=WEB_PORT)
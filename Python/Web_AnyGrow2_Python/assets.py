@@ -0,0 +1,252 @@
+# assets.py
+# 웹 UI 정적 파일 빌드/서빙 도우미
+#
+#   python assets.py          → dist/ 에 빌드하고 첫 로드/재방문 전송량을 출력
+#
+# - 웹 파일(html, js, css, 이미지)만 dist/ 로 복사합니다. zip, py 등은 서빙되지 않습니다.
+# - index.html 을 제외한 파일은 내용 해시를 붙인 이름(app.3f2a9c1b2d.js)으로 저장하고,
+#   index.html / css 안의 참조를 해시 이름으로 바꿉니다. → 영구 캐시(immutable) 가능
+# - 압축 가능한 파일은 gzip(.gz), brotli(.br, brotli 모듈이 있을 때) 버전을 미리 만들어 둡니다.
+# - dist/manifest.json 에 원래 경로 → 해시 경로, 크기, 압축본 크기를 기록합니다.
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import posixpath
+import re
+import shutil
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# -----------------------------
+# 1. 설정
+# -----------------------------
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DIST_DIR = os.path.join(BASE_DIR, "dist")
+MANIFEST_FILE = "manifest.json"
+ENTRY_FILE = "index.html"
+
+# 서빙 대상: 최상위 파일 + 아래 폴더의 웹 파일
+SOURCE_FILES = ("index.html", "anygrow2.css", "anygrow2_client.js")
+SOURCE_DIRS = ("image", "jquery")
+WEB_EXTENSIONS = (".html", ".js", ".css", ".png", ".gif", ".jpg", ".jpeg", ".svg", ".ico",
+                  ".woff", ".woff2", ".ttf")
+COMPRESSIBLE_EXTENSIONS = (".html", ".js", ".css", ".svg", ".ttf")
+REWRITE_EXTENSIONS = (".html", ".css")  # 다른 파일을 참조하므로 참조를 해시 이름으로 바꿀 파일
+
+HASH_LEN = 10
+IMMUTABLE_MAX_AGE = 31536000    # 해시 이름 파일의 캐시 유지 시간 (1년)
+
+_HTML_REF = re.compile(r"""(["'])((?:\./)?[\w./-]+\.(?:js|css|png|gif|jpe?g|svg|ico))\1""")
+_CSS_REF = re.compile(r"""url\((["']?)([^"')]+)\1\)""")
+
+
+# -----------------------------
+# 2. 빌드
+# -----------------------------
+def _source_paths(src_dir):
+    """서빙할 웹 파일의 상대 경로(posix) 목록"""
+    paths = [name for name in SOURCE_FILES if os.path.isfile(os.path.join(src_dir, name))]
+    for folder in SOURCE_DIRS:
+        for root, _, files in os.walk(os.path.join(src_dir, folder)):
+            for name in sorted(files):
+                if name.lower().endswith(WEB_EXTENSIONS):
+                    rel = os.path.relpath(os.path.join(root, name), src_dir)
+                    paths.append(rel.replace(os.sep, "/"))
+    return paths
+
+
+def _hashed_name(rel, data):
+    digest = hashlib.sha1(data).hexdigest()[:HASH_LEN]
+    stem, ext = posixpath.splitext(rel)
+    return f"{stem}.{digest}{ext}", digest
+
+
+def _rewrite(rel, text, hashed):
+    """html/css 안의 상대 참조를 해시된 절대 경로로 바꿉니다. 없는 파일 참조는 그대로 둡니다."""
+    base = posixpath.dirname(rel)
+
+    def resolve(ref):
+        if ref.startswith(("data:", "http:", "https:", "//", "#")):
+            return None
+        if ref.startswith("/"):
+            target = posixpath.normpath(ref.lstrip("/"))
+        else:
+            target = posixpath.normpath(posixpath.join(base, ref))
+        return hashed.get(target)
+
+    def html_sub(m):
+        target = resolve(m.group(2))
+        return f"{m.group(1)}/{target}{m.group(1)}" if target else m.group(0)
+
+    def css_sub(m):
+        target = resolve(m.group(2).strip())
+        return f"url({m.group(1)}/{target}{m.group(1)})" if target else m.group(0)
+
+    return (_CSS_REF if rel.endswith(".css") else _HTML_REF).sub(
+        css_sub if rel.endswith(".css") else html_sub, text)
+
+
+def _write_variants(path, data, rel):
+    """원본과 압축본을 쓰고, 원본보다 작은 압축본 크기를 반환합니다."""
+    with open(path, "wb") as f:
+        f.write(data)
+    sizes = {"gzip": None, "br": None}
+    if not rel.endswith(COMPRESSIBLE_EXTENSIONS):
+        return sizes
+    variants = {"gzip": (".gz", lambda d: gzip.compress(d, 9, mtime=0))}
+    if brotli is not None:
+        variants["br"] = (".br", lambda d: brotli.compress(d, quality=11))
+    for encoding, (suffix, compress) in variants.items():
+        packed = compress(data)
+        if len(packed) < len(data):
+            with open(path + suffix, "wb") as f:
+                f.write(packed)
+            sizes[encoding] = len(packed)
+    return sizes
+
+
+def build(src_dir=BASE_DIR, dist_dir=DIST_DIR):
+    """
+    웹 파일을 dist_dir 로 빌드하고 manifest 딕셔너리를 반환합니다.
+    참조하는 쪽(html, css)이 참조되는 파일의 해시 이름을 알아야 하므로
+    이미지/js 를 먼저, css 를 다음, index.html 을 마지막에 처리합니다.
+    """
+    paths = _source_paths(src_dir)
+    order = {".css": 1, ".html": 2}
+    paths.sort(key=lambda p: order.get(posixpath.splitext(p)[1], 0))
+
+    if os.path.isdir(dist_dir):
+        shutil.rmtree(dist_dir)
+    hashed, files = {}, {}
+    for rel in paths:
+        with open(os.path.join(src_dir, rel), "rb") as f:
+            data = f.read()
+        if rel.endswith(REWRITE_EXTENSIONS):
+            data = _rewrite(rel, data.decode("utf-8"), hashed).encode("utf-8")
+
+        if rel == ENTRY_FILE:
+            out_rel, digest = rel, hashlib.sha1(data).hexdigest()[:HASH_LEN]
+        else:
+            out_rel, digest = _hashed_name(rel, data)
+            hashed[rel] = out_rel
+
+        out_path = os.path.join(dist_dir, *out_rel.split("/"))
+        os.makedirs(os.path.dirname(out_path), exist_ok=True)
+        sizes = _write_variants(out_path, data, rel)
+        files[rel] = {"path": out_rel, "hash": digest, "size": len(data), **sizes}
+
+    manifest = {"entry": ENTRY_FILE, "files": files}
+    with open(os.path.join(dist_dir, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    return manifest
+
+
+def _is_stale(src_dir, dist_dir):
+    manifest_path = os.path.join(dist_dir, MANIFEST_FILE)
+    if not os.path.isfile(manifest_path):
+        return True
+    built_at = os.path.getmtime(manifest_path)
+    return any(os.path.getmtime(os.path.join(src_dir, rel)) > built_at for rel in _source_paths(src_dir))
+
+
+# -----------------------------
+# 3. 서빙
+# -----------------------------
+class AssetStore:
+    """
+    빌드된 manifest 로 요청 경로를 파일과 캐시 정책으로 바꿉니다.
+    - 해시 이름 경로: 영구 캐시 (immutable)
+    - 원래 이름 경로(index.html 포함): 매번 재검증 (no-cache + ETag)
+    - manifest 에 없는 경로: None (404)
+    """
+    def __init__(self, src_dir=BASE_DIR, dist_dir=DIST_DIR):
+        self.dist_dir = dist_dir
+        if _is_stale(src_dir, dist_dir):
+            print(f"[Assets] Building {dist_dir}")
+            manifest = build(src_dir, dist_dir)
+        else:
+            with open(os.path.join(dist_dir, MANIFEST_FILE), encoding="utf-8") as f:
+                manifest = json.load(f)
+        self.entry = manifest["entry"]
+        self.files = manifest["files"]
+        self._hashed = {info["path"]: info for rel, info in self.files.items() if rel != self.entry}
+        print(f"[Assets] {len(self.files)} files, brotli {'on' if brotli else 'off (pip install brotli)'}")
+
+    def select(self, path, accept_encoding=""):
+        """
+        요청 경로에 맞는 (파일 경로, content-encoding 또는 None, etag, mimetype, immutable) 를 반환합니다.
+        압축본은 브라우저가 받을 수 있는 것 중 가장 작은 것(br > gzip)을 고릅니다.
+        """
+        path = path.lstrip("/") or self.entry
+        info = self._hashed.get(path)
+        immutable = info is not None
+        if info is None:
+            info = self.files.get(path)
+        if info is None:
+            return None
+
+        accepted = {token.split(";")[0].strip() for token in accept_encoding.lower().split(",")}
+        encoding, suffix = None, ""
+        if info.get("br") and "br" in accepted:
+            encoding, suffix = "br", ".br"
+        elif info.get("gzip") and "gzip" in accepted:
+            encoding, suffix = "gzip", ".gz"
+
+        file_path = os.path.join(self.dist_dir, *info["path"].split("/")) + suffix
+        mimetype = mimetypes.guess_type(info["path"])[0] or "application/octet-stream"
+        etag = info["hash"] + (f"-{encoding}" if encoding else "")
+        return file_path, encoding, etag, mimetype, immutable
+
+
+# -----------------------------
+# 4. 전송량 보고
+# -----------------------------
+def first_load_files(manifest, src_dir=BASE_DIR):
+    """index.html 이 직접 참조하는 파일과 그 css 가 참조하는 파일 (원래 경로 목록)"""
+    files = manifest["files"]
+    with open(os.path.join(src_dir, manifest["entry"]), encoding="utf-8-sig") as f:
+        refs = [posixpath.normpath(m.group(2)) for m in _HTML_REF.finditer(f.read())]
+    needed = [manifest["entry"]] + [r for r in dict.fromkeys(refs) if r in files]
+    for rel in list(needed):
+        if rel.endswith(".css"):
+            with open(os.path.join(src_dir, rel), encoding="utf-8") as f:
+                base = posixpath.dirname(rel)
+                for m in _CSS_REF.finditer(f.read()):
+                    ref = m.group(2).strip()
+                    target = posixpath.normpath(posixpath.join(base, ref))
+                    if not ref.startswith("data:") and target in files and target not in needed:
+                        needed.append(target)
+    return needed
+
+
+def report(manifest, src_dir=BASE_DIR):
+    files = manifest["files"]
+    needed = first_load_files(manifest, src_dir)
+
+    def best(info, encoding):
+        sizes = [info["size"]] + [info[e] for e in encoding if info.get(e)]
+        return min(sizes)
+
+    raw = sum(files[r]["size"] for r in needed)
+    gz = sum(best(files[r], ("gzip",)) for r in needed)
+    br = sum(best(files[r], ("br", "gzip")) for r in needed)
+    index = files[manifest["entry"]]
+    print(f"[Assets] served files: {len(files)} (zip, py 등 제외)")
+    print(f"[Assets] first load: {len(needed)} requests, raw {raw / 1024:.1f} KB, "
+          f"gzip {gz / 1024:.1f} KB, brotli {br / 1024:.1f} KB"
+          + ("" if brotli else " (brotli 모듈 없음 → gzip 과 같음)"))
+    print(f"[Assets] repeat load: 1 request (index.html 재검증 → 304, 0 KB), "
+          f"index 변경 시 {best(index, ('br', 'gzip')) / 1024:.1f} KB; "
+          f"나머지 {len(needed) - 1}개 파일은 캐시에서 바로 사용 (요청 없음)")
+    print(f"[Assets] before: repeat load {len(needed)} requests (파일마다 재검증), "
+          f"cold cache {raw / 1024:.1f} KB 비압축")
+
+
+if __name__ == "__main__":
+    report(build())
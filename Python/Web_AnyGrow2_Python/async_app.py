@@ -0,0 +1,241 @@
+# async_app.py
+# AnyGrow2 Python 서버 - asyncio(ASGI) 모드
+# 접속한 대시보드가 많을 때 사용합니다. 실행: python async_app.py [--host 0.0.0.0] [--port 52273]
+#
+# - Socket.IO 는 python-socketio 의 AsyncServer, HTTP 라우트(/api/history, 정적 파일)는
+#   app.py 의 Flask 앱을 그대로 ASGI 로 감싸서 사용합니다.
+# - 시리얼은 이벤트 루프에서 논블로킹으로 읽습니다. (POSIX: add_reader, 그 외: in_waiting 폴링)
+# - 센서값은 'live' 방에 한 번만 방송하고, 송신이 밀린 클라이언트는 최신값 하나만 받도록 합니다.
+
+import argparse
+import asyncio
+import os
+import time
+
+import socketio
+import uvicorn
+from asgiref.wsgi import WsgiToAsgi
+
+import app as web   # 임계값 엔진, 이력 DB, 시리얼 설정과 상태(web.device)를 스레드 모드와 공유
+
+# -----------------------------
+# 1. 설정
+# -----------------------------
+LIVE_ROOM = "live"              # 센서값을 받는 모든 대시보드
+CLIENT_BACKLOG_LIMIT = 4        # engine.io 송신 대기 패킷이 이 이상이면 느린 클라이언트로 봅니다
+FANOUT_DRAIN_INTERVAL = 0.1     # 느린 클라이언트의 최신값 전송을 다시 시도하는 주기 (초)
+SERIAL_POLL_INTERVAL = 0.02     # add_reader 를 쓸 수 없는 플랫폼(Windows)의 수신 확인 주기 (초)
+
+sio = socketio.AsyncServer(async_mode="asgi", cors_allowed_origins="*")
+command_wakeup = asyncio.Event()    # 명령 큐에 새 명령이 들어왔음을 command_loop 에 알림
+asgi_app = socketio.ASGIApp(sio, other_asgi_app=WsgiToAsgi(web.app))
+
+
+# -----------------------------
+# 2. 클라이언트별 송신 대기열 관리
+# -----------------------------
+class Fanout:
+    """
+    센서값을 LIVE_ROOM 에 한 번만 방송합니다. (패킷 인코딩도 한 번)
+    engine.io 송신 대기열이 CLIENT_BACKLOG_LIMIT 이상 밀린 클라이언트는 방송에서 제외하고,
+    최신 센서값 하나만 보관했다가(이전 값은 버림) 대기열이 줄면 보냅니다.
+    느린 태블릿 하나 때문에 다른 클라이언트가 기다리거나 서버 메모리가 늘지 않습니다.
+    """
+    def __init__(self, server, backlog_limit=CLIENT_BACKLOG_LIMIT):
+        self.server = server
+        self.backlog_limit = backlog_limit
+        self.pending = {}       # sid -> (eio_sid, 최신 센서값)
+        self.broadcasts = 0
+        self.dropped = 0
+
+    def backlog(self, eio_sid):
+        """engine.io 소켓의 송신 대기 패킷 수. (내부 구조가 다르면 0으로 봅니다)"""
+        sock = getattr(self.server.eio, "sockets", {}).get(eio_sid)
+        queue = getattr(sock, "queue", None)
+        return queue.qsize() if queue is not None else 0
+
+    async def publish(self, event, data):
+        skip = []
+        for sid, eio_sid in list(self.server.manager.get_participants("/", LIVE_ROOM)):
+            if sid in self.pending or self.backlog(eio_sid) >= self.backlog_limit:
+                if sid in self.pending:
+                    self.dropped += 1
+                self.pending[sid] = (eio_sid, data)
+                skip.append(sid)
+        self.broadcasts += 1
+        await self.server.emit(event, data, room=LIVE_ROOM, skip_sid=skip or None)
+
+    def forget(self, sid):
+        self.pending.pop(sid, None)
+
+    async def drain_loop(self, event):
+        while True:
+            await asyncio.sleep(FANOUT_DRAIN_INTERVAL)
+            for sid, (eio_sid, data) in list(self.pending.items()):
+                if self.backlog(eio_sid) < self.backlog_limit:
+                    del self.pending[sid]
+                    await self.server.emit(event, data, to=sid)
+
+    def stats(self):
+        return {"broadcasts": self.broadcasts, "slow_clients": len(self.pending), "dropped": self.dropped}
+
+
+fanout = Fanout(sio)
+web.metrics.register("gauge", "fanout_slow_clients", "Clients skipped by broadcasts, holding only the latest reading.",
+                     lambda: len(fanout.pending))
+web.metrics.register("counter", "fanout_broadcasts_total", "Sensor broadcasts to the live room.",
+                     lambda: fanout.broadcasts)
+web.metrics.register("counter", "fanout_dropped_total", "Readings replaced before a slow client could receive them.",
+                     lambda: fanout.dropped)
+
+
+# -----------------------------
+# 3. Socket.IO 이벤트 (app.py 와 같은 이벤트 이름/형식)
+# -----------------------------
+@sio.event
+async def connect(sid, environ):
+    print("[Socket] Client connected")
+    web.connected_sids.add(sid)
+    await sio.enter_room(sid, LIVE_ROOM)
+    rules, states, reading = web.connect_snapshot()
+    await sio.emit("thresholds", rules, to=sid)
+    for event in states:
+        await sio.emit("alarm", event.to_dict(), to=sid)
+    if reading is not None:
+        await sio.emit("sensor", reading, to=sid)
+
+
+@sio.event
+async def disconnect(sid):
+    print("[Socket] Client disconnected")
+    web.connected_sids.discard(sid)
+    fanout.forget(sid)
+    web.raw_debug_sids.discard(sid)
+
+
+@sio.event
+async def raw_subscribe(sid, enabled=True):
+    if enabled:
+        web.raw_debug_sids.add(sid)
+        await sio.enter_room(sid, web.RAW_DEBUG_ROOM)
+    else:
+        web.raw_debug_sids.discard(sid)
+        await sio.leave_room(sid, web.RAW_DEBUG_ROOM)
+    print(f"[Socket] raw debug subscribers: {len(web.raw_debug_sids)}")
+
+
+@sio.event
+async def serial_write(sid, data):
+    print(f"[Socket] serial_write: {data}")
+    return _submit({"cmd": "led", "args": {"mode": data}}, sid)
+
+
+@sio.event
+async def command(sid, data):
+    return _submit(data, sid)
+
+
+def _submit(data, sid):
+    ack = web.submit_command(data, sid)
+    command_wakeup.set()
+    return ack
+
+
+@sio.event
+async def set_thresholds(sid, data):
+    print(f"[Socket] set_thresholds: {data}")
+    try:
+        # 규칙 파일 저장이 있으므로 이벤트 루프 밖에서 실행
+        rules, events = await asyncio.get_running_loop().run_in_executor(None, web.apply_thresholds, data)
+    except ValueError as e:
+        await sio.emit("thresholds_error", str(e), to=sid)
+        await sio.emit("thresholds", web.alarm_engine.rules, to=sid)
+        return
+
+    await sio.emit("thresholds", rules)
+    for event in events:
+        await sio.emit("alarm", event.to_dict())
+
+
+# -----------------------------
+# 4. 장치 루프 (센서 요청/명령 전송은 web.device, 수신은 논블로킹)
+# -----------------------------
+async def on_command_done(command):
+    if command.client is not None:
+        await sio.emit("command_ack", command.to_ack(), to=command.client)
+
+
+async def serial_read_loop():
+    ser = web.ser
+    ser.timeout = 0     # 논블로킹 읽기
+    loop = asyncio.get_running_loop()
+    readable = asyncio.Event()
+    use_reader = os.name == "posix"
+    if use_reader:
+        loop.add_reader(ser.fileno(), readable.set)
+
+    try:
+        while True:
+            if use_reader:
+                await readable.wait()
+                readable.clear()
+            else:
+                await asyncio.sleep(SERIAL_POLL_INTERVAL)
+            try:
+                data = ser.read(ser.in_waiting or 1)
+            except Exception as e:
+                web.metrics.read_errors += 1
+                print("[Serial] Read error:", e)
+                await asyncio.sleep(SERIAL_POLL_INTERVAL)
+                continue
+            if not data:
+                continue
+
+            if web.raw_debug_sids:
+                await sio.emit("serial_raw", data.hex(","), room=web.RAW_DEBUG_ROOM)
+
+            for reading in web.device.feed(data):
+                payload, events = web.process_reading(reading)
+                for event in events:
+                    await sio.emit("alarm", event.to_dict())
+                if payload is not None:
+                    await fanout.publish("sensor", payload)
+    finally:
+        if use_reader:
+            loop.remove_reader(ser.fileno())
+
+
+# -----------------------------
+# 5. 메인 실행
+# -----------------------------
+async def serve(host, port):
+    if web.BROKER_ADDRESS:
+        # 브로커 클라이언트는 스레드 모드(app.py)에서만 지원합니다. 포트를 직접 열면 브로커와 충돌합니다.
+        raise SystemExit("[Server] ANYGROW_BROKER is supported by app.py (threading mode) only.")
+    web.init_serial()
+    web.init_history()
+    web.get_assets()
+
+    tasks = [asyncio.create_task(fanout.drain_loop("sensor"))]
+    if web.ser is not None:
+        tasks.append(asyncio.create_task(web.device.poll_loop(lambda: web.ser is not None, command_wakeup)))
+        tasks.append(asyncio.create_task(web.device.command_loop(command_wakeup, on_command_done)))
+        tasks.append(asyncio.create_task(serial_read_loop()))
+    else:
+        print("[Serial] Port is not opened, skip device loops.")
+
+    config = uvicorn.Config(asgi_app, host=host, port=port, log_level="warning")
+    print(f"[Server] asyncio mode on http://{host}:{port} ({time.strftime('%H:%M:%S')})")
+    try:
+        await uvicorn.Server(config).serve()
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AnyGrow2 웹 서버 (asyncio 모드)")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=web.WEB_PORT)
+    args = parser.parse_args()
+    asyncio.run(serve(args.host, args.port))
@@ -0,0 +1,394 @@
+# loadtest.py
+# 웹 서버 동시 접속 부하 시험
+#
+# 1) 실행 중인 서버에 붙이기
+#   python sim_device.py                                     → /dev/pts/N
+#   ANYGROW_SERIAL_PORT=/dev/pts/N python async_app.py
+#   python loadtest.py --clients 300 --duration 30
+#
+# 2) 오프라인 비교 시험 (--sweep, POSIX)
+#   가상 장치와 서버를 이 스크립트가 직접 띄우고, 서버 모드 × 클라이언트 수마다
+#   프로세스 풀에서 Socket.IO 클라이언트를 나눠 실행한 뒤 결과를 표로 비교합니다.
+#   python loadtest.py --sweep --modes threading asyncio --counts 1 10 100 1000 --duration 20 --report report.md
+#
+# 측정 항목
+# - 장치→클라이언트 지연: 가상 장치가 센서 프레임을 다 보낸 시각부터 클라이언트 수신까지 (--sweep)
+# - 서버→클라이언트 지연: 서버가 프레임을 파싱한 시각(payload ts)부터 클라이언트 수신까지
+# - 클라이언트별 처리량: 초당 받은 센서값 수
+# - serial_write 왕복 시간: 접수 응답(콜백)까지, 장치 전송 완료(command_ack)까지
+# - 서버 CPU/메모리 (--sweep, psutil 이 있으면 사용하고 없으면 /proc 에서 읽음)
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+
+import socketio
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SERVER_SCRIPTS = {"threading": "app.py", "asyncio": "async_app.py"}
+SERVER_START_TIMEOUT = 30.0     # 서버가 HTTP 요청에 응답할 때까지 기다리는 최대 시간 (초)
+SAMPLE_INTERVAL = 0.5           # 서버 CPU/메모리 측정 주기 (초)
+PROBE_INTERVAL = 1.0            # serial_write 왕복 시간 측정 명령 간격 (초)
+PROBE_MODES = ("On", "Off")
+
+
+def percentile(values, p):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def reading_key(data):
+    """sim_device.reading_key 와 같은 키 (서버가 보낸 센서값 → 가상 장치의 전송 시각 조회용)"""
+    return (round(data["temp"] * 10), round(data["hum"] * 10), int(data["co2"]), int(data["illum"]))
+
+
+# -----------------------------
+# 1. 클라이언트
+# -----------------------------
+async def run_client(url, duration, result, index, probe=False):
+    """
+    클라이언트 하나를 접속시켜 duration 초 동안 센서값을 받습니다.
+    접속 직후 받는 마지막 센서값 캐시(접속 전에 파싱된 값)는 지연 측정에서 뺍니다.
+    probe 이면 PROBE_INTERVAL 마다 serial_write 를 보내 왕복 시간을 잽니다.
+    """
+    client = socketio.AsyncClient(reconnection=False)
+    received = 0
+    connected_at = None
+    pending = {}    # 명령 id -> 보낸 시각
+
+    @client.on("sensor")
+    async def on_sensor(data):
+        nonlocal received
+        now = time.time()
+        if connected_at is None or data["ts"] < connected_at:
+            return
+        received += 1
+        result["latencies"].append((now - data["ts"]) * 1000)
+        result["arrivals"].append((reading_key(data), now))
+
+    @client.on("command_ack")
+    async def on_command_ack(ack):
+        sent = pending.pop(ack.get("id"), None)
+        if sent is not None and ack.get("status") == "sent":
+            result["command_ms"].append((time.time() - sent) * 1000)
+
+    try:
+        await client.connect(url, transports=["websocket"])
+    except Exception as e:
+        print(f"[LOADTEST] client {index} connect failed: {e}")
+        result["counts"].append(None)
+        return
+    connected_at = time.time()
+
+    deadline = connected_at + duration
+    if probe:
+        i = 0
+        while time.time() + PROBE_INTERVAL < deadline:
+            sent = time.time()
+            try:
+                ack = await client.call("serial_write", PROBE_MODES[i % 2], timeout=10)
+            except Exception as e:
+                print(f"[LOADTEST] serial_write failed: {e}")
+                ack = None
+            if ack is not None:
+                result["ack_ms"].append((time.time() - sent) * 1000)
+                if ack.get("status") == "queued":
+                    pending[ack.get("id")] = sent
+                else:
+                    result["command_failed"] += 1
+            i += 1
+            await asyncio.sleep(PROBE_INTERVAL)
+    await asyncio.sleep(max(0.0, deadline - time.time()))
+    await client.disconnect()
+    result["counts"].append(received / duration)
+
+
+async def run_clients(url, clients, duration, ramp, probe):
+    result = {"latencies": [], "arrivals": [], "counts": [], "ack_ms": [], "command_ms": [], "command_failed": 0}
+    tasks = []
+    for i in range(clients):
+        tasks.append(asyncio.create_task(run_client(url, duration, result, i, probe=probe and i == 0)))
+        if ramp:
+            await asyncio.sleep(ramp)
+    await asyncio.gather(*tasks)
+    return result
+
+
+def worker_main(url, clients, duration, ramp, probe):
+    """프로세스 풀 작업 하나: 클라이언트 여러 개를 한 이벤트 루프에서 실행하고 측정값을 반환합니다."""
+    return asyncio.run(run_clients(url, clients, duration, ramp, probe))
+
+
+def merge_results(results):
+    merged = {"latencies": [], "arrivals": [], "counts": [], "ack_ms": [], "command_ms": [], "command_failed": 0}
+    for result in results:
+        for key, value in result.items():
+            merged[key] += value
+    return merged
+
+
+def summarize(result, clients, duration, device_ms=None):
+    connected = [c for c in result["counts"] if c is not None]
+    print(f"[LOADTEST] clients: {len(connected)}/{clients} connected, duration {duration}s")
+    if connected:
+        print(f"[LOADTEST] readings/s per client: min {min(connected):.2f}, "
+              f"mean {statistics.mean(connected):.2f}, max {max(connected):.2f}")
+    for label, values in (("device→client", device_ms), ("server→client", result["latencies"]),
+                          ("serial_write ack", result["ack_ms"]), ("serial_write sent", result["command_ms"])):
+        if values:
+            print(f"[LOADTEST] {label} ms: p50 {percentile(values, 50):.1f}, "
+                  f"p95 {percentile(values, 95):.1f}, p99 {percentile(values, 99):.1f}, max {max(values):.1f}")
+    if not result["latencies"]:
+        print("[LOADTEST] no sensor readings received (is the device or sim_device.py connected?)")
+
+
+def run(url, clients, duration, ramp, probe):
+    result = asyncio.run(run_clients(url, clients, duration, ramp, probe))
+    summarize(result, clients, duration)
+
+
+# -----------------------------
+# 2. 서버 자원 측정
+# -----------------------------
+def _proc_sample(pid):
+    """(누적 CPU 초, RSS 바이트). psutil 이 없으면 /proc 에서 읽습니다."""
+    if psutil is not None:
+        proc = psutil.Process(pid)
+        times = proc.cpu_times()
+        return times.user + times.system, proc.memory_info().rss
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    ticks = os.sysconf("SC_CLK_TCK")
+    cpu = (int(fields[11]) + int(fields[12])) / ticks     # utime, stime
+    rss = int(fields[21]) * os.sysconf("SC_PAGE_SIZE")
+    return cpu, rss
+
+
+class ResourceSampler:
+    """서버 프로세스의 CPU 사용률(%)과 RSS 를 SAMPLE_INTERVAL 마다 기록하는 스레드"""
+    def __init__(self, pid):
+        self.pid = pid
+        self.cpu = []
+        self.rss = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread.ident is not None:
+            self._thread.join()
+
+    def _run(self):
+        try:
+            last_cpu, _ = _proc_sample(self.pid)
+        except (OSError, ValueError):
+            return
+        last_at = time.monotonic()
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            try:
+                cpu, rss = _proc_sample(self.pid)
+            except (OSError, ValueError):
+                return
+            now = time.monotonic()
+            self.cpu.append((cpu - last_cpu) / (now - last_at) * 100)
+            self.rss.append(rss)
+            last_cpu, last_at = cpu, now
+
+
+# -----------------------------
+# 3. 오프라인 비교 시험 (--sweep)
+# -----------------------------
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _raise_fd_limit():
+    """클라이언트 1000개면 서버/클라이언트 모두 소켓이 1000개 넘게 필요합니다. (자식 프로세스에 상속)"""
+    try:
+        import resource
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        target = hard if hard != resource.RLIM_INFINITY else 65536
+        if soft < target:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+    except (ImportError, ValueError, OSError):
+        pass
+
+
+def start_server(mode, port, serial_port, poll_interval, workdir):
+    env = dict(os.environ,
+               ANYGROW_SERIAL_PORT=serial_port,
+               ANYGROW_POLL_INTERVAL=str(poll_interval),
+               ANYGROW_WEB_PORT=str(port),
+               ANYGROW_HISTORY_DB=os.path.join(workdir, f"history_{mode}_{port}.db"),
+               ANYGROW_THRESHOLDS=os.path.join(workdir, "thresholds.json"),
+               PYTHONUNBUFFERED="1")
+    env.pop("ANYGROW_BROKER", None)
+    cmd = [sys.executable, SERVER_SCRIPTS[mode]]
+    if mode == "asyncio":
+        cmd += ["--host", "127.0.0.1", "--port", str(port)]
+    log = open(os.path.join(workdir, f"server_{mode}_{port}.log"), "w")
+    return subprocess.Popen(cmd, cwd=BASE_DIR, env=env, stdout=log, stderr=subprocess.STDOUT), log
+
+
+def wait_for_server(url, proc):
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            return False
+        try:
+            urllib.request.urlopen(url + "/api/latest", timeout=1).close()
+            return True
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.2)
+    return False
+
+
+def run_case(mode, clients, args, workdir):
+    """서버 모드 하나, 클라이언트 수 하나에 대한 시험. 표의 한 줄(dict)을 반환합니다."""
+    from sim_device import SimulatedDevice
+
+    row = {"mode": mode, "clients": clients}
+    device = SimulatedDevice(chunk_size=args.chunk, record=True)
+    serial_port = device.start()
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}"
+    proc, log = start_server(mode, port, serial_port, args.interval, workdir)
+    sampler = ResourceSampler(proc.pid)
+    try:
+        if not wait_for_server(url, proc):
+            row["error"] = "server did not start"
+            log.flush()
+            with open(log.name, encoding="utf-8", errors="replace") as f:
+                print(f.read()[-2000:])
+            return row
+        sampler.start()
+
+        workers = max(1, min(args.workers, clients))
+        shares = [clients // workers + (1 if i < clients % workers else 0) for i in range(workers)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(worker_main, url, n, args.duration, args.ramp * workers, i == 0)
+                       for i, n in enumerate(shares)]
+            result = merge_results(f.result() for f in futures)
+    finally:
+        sampler.stop()
+        proc.terminate()
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+        log.close()
+        device.stop()
+
+    device_ms = [(at - device.sent_at[key]) * 1000 for key, at in result["arrivals"] if key in device.sent_at]
+    connected = [c for c in result["counts"] if c is not None]
+    row.update(
+        connected=len(connected),
+        rate_mean=statistics.mean(connected) if connected else None,
+        rate_min=min(connected) if connected else None,
+        device_p50=percentile(device_ms, 50), device_p95=percentile(device_ms, 95),
+        device_p99=percentile(device_ms, 99),
+        server_p50=percentile(result["latencies"], 50), server_p99=percentile(result["latencies"], 99),
+        ack_p50=percentile(result["ack_ms"], 50), ack_p95=percentile(result["ack_ms"], 95),
+        sent_p50=percentile(result["command_ms"], 50), sent_p95=percentile(result["command_ms"], 95),
+        command_failed=result["command_failed"],
+        cpu_mean=statistics.mean(sampler.cpu) if sampler.cpu else None,
+        cpu_max=max(sampler.cpu) if sampler.cpu else None,
+        rss_max=max(sampler.rss) / 2 ** 20 if sampler.rss else None,
+    )
+    summarize(result, clients, args.duration, device_ms)
+    return row
+
+
+REPORT_COLUMNS = (
+    ("mode", "mode", "{}"), ("clients", "clients", "{}"), ("connected", "connected", "{}"),
+    ("readings/s mean", "rate_mean", "{:.2f}"), ("readings/s min", "rate_min", "{:.2f}"),
+    ("dev→client p50", "device_p50", "{:.1f}"), ("p95", "device_p95", "{:.1f}"), ("p99", "device_p99", "{:.1f}"),
+    ("srv→client p50", "server_p50", "{:.1f}"), ("p99", "server_p99", "{:.1f}"),
+    ("write ack p50", "ack_p50", "{:.1f}"), ("p95", "ack_p95", "{:.1f}"),
+    ("write sent p50", "sent_p50", "{:.1f}"), ("p95", "sent_p95", "{:.1f}"),
+    ("cmd failed", "command_failed", "{}"),
+    ("CPU % mean", "cpu_mean", "{:.0f}"), ("CPU % max", "cpu_max", "{:.0f}"), ("RSS MB max", "rss_max", "{:.1f}"),
+)
+
+
+def format_report(rows, args):
+    """결과를 마크다운 표로 만듭니다. 지연은 ms, 처리량은 클라이언트당 초당 센서값 수입니다."""
+    lines = [
+        "# AnyGrow2 web server load test",
+        "",
+        f"- duration {args.duration}s per case, sensor poll {args.interval}s "
+        f"(expected {1 / args.interval:.2f} readings/s per client), {args.workers} client processes",
+        f"- generated {time.strftime('%Y-%m-%d %H:%M:%S')}, python {sys.version.split()[0]}, "
+        f"{os.cpu_count()} CPUs, resource sampling via {'psutil' if psutil else '/proc'}",
+        "",
+        "| " + " | ".join(title for title, _, _ in REPORT_COLUMNS) + " |",
+        "|" + "---|" * len(REPORT_COLUMNS),
+    ]
+    for row in rows:
+        if "error" in row:
+            lines.append(f"| {row['mode']} | {row['clients']} | {row['error']} |")
+            continue
+        cells = [fmt.format(row[key]) if row.get(key) is not None else "-" for _, key, fmt in REPORT_COLUMNS]
+        lines.append("| " + " | ".join(cells) + " |")
+    return "\n".join(lines) + "\n"
+
+
+def sweep(args):
+    if os.name != "posix":
+        raise SystemExit("[LOADTEST] --sweep needs a POSIX pty for the simulated device.")
+    _raise_fd_limit()
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="anygrow2_loadtest_") as workdir:
+        for mode in args.modes:
+            for clients in args.counts:
+                print(f"[LOADTEST] === {mode}, {clients} clients ===")
+                rows.append(run_case(mode, clients, args, workdir))
+    report = format_report(rows, args)
+    print(report)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            f.write(report)
+        print(f"[LOADTEST] report written to {args.report}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AnyGrow2 웹 서버 부하 시험")
+    parser.add_argument("--url", default="http://127.0.0.1:52273")
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--ramp", type=float, default=0.01, help="클라이언트 접속 간격 (초)")
+    parser.add_argument("--probe", action="store_true", help="첫 클라이언트가 serial_write 왕복 시간을 측정")
+    parser.add_argument("--sweep", action="store_true", help="가상 장치와 서버를 직접 띄워 모드 × 클라이언트 수 비교")
+    parser.add_argument("--modes", nargs="+", choices=sorted(SERVER_SCRIPTS), default=["threading", "asyncio"])
+    parser.add_argument("--counts", nargs="+", type=int, default=[1, 10, 100, 1000])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4, help="클라이언트 프로세스 수")
+    parser.add_argument("--interval", type=float, default=1.0, help="서버의 센서 요청 주기 (초)")
+    parser.add_argument("--chunk", type=int, default=0, help="가상 장치 응답을 이 바이트 수로 나눠 보냄")
+    parser.add_argument("--report", help="마크다운 보고서 저장 경로")
+    args = parser.parse_args()
+    if args.sweep:
+        sweep(args)
+    else:
+        run(args.url, args.clients, args.duration, args.ramp, args.probe)
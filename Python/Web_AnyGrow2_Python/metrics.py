@@ -0,0 +1,77 @@
+# metrics.py
+# 웹 서버 운영 지표 (/metrics: Prometheus 텍스트 형식, /health: JSON)
+#
+# - 수신/전송/센서 요청 카운터와 지연 히스토그램은 core.device_link.DeviceLink 가 갱신하고 여기서는 읽기만 합니다.
+#   (각 카운터는 값을 바꾸는 루프가 하나뿐이라 잠금 없이 += 로 갱신됩니다)
+# - 조회는 시리얼 lock 을 잡지 않고 현재 값을 그대로 읽습니다. (스크랩 중에 값이 하나쯤 늦을 수 있음)
+# - 히스토그램은 GUI 워치독과 같은 core.metrics.LatencyHistogram 을 사용합니다.
+
+import time
+
+from core.metrics import histogram_lines
+
+PREFIX = "anygrow2_web"
+
+
+class ServerMetrics:
+    """
+    웹 서버 운영 지표. 장치 통신 지표는 link(core.device_link.DeviceLink)에서 읽고,
+    다른 모듈의 값은 register() 로 조회 함수를 등록해 함께 내보냅니다.
+    """
+    def __init__(self, link):
+        self.started_at = time.monotonic()
+        self.link = link
+        # 시리얼 수신 스레드 (asyncio 모드에서는 이벤트 루프)
+        self.read_errors = 0
+        self.last_reading_at = None                 # 마지막 정상 센서값 시각 (monotonic)
+        self._registered = []                       # (종류, 이름, 설명, 조회 함수)
+
+    def register(self, kind: str, name: str, help_text: str, read):
+        """kind 는 'gauge' 또는 'counter'. read() 가 None 을 반환하면 그 지표는 생략합니다."""
+        self._registered.append((kind, name, help_text, read))
+
+    def reading_age(self):
+        """마지막 정상 센서값 이후 지난 시간 (초). 아직 없으면 None."""
+        at = self.last_reading_at
+        return None if at is None else time.monotonic() - at
+
+    def uptime(self):
+        return time.monotonic() - self.started_at
+
+    def to_prometheus(self, prefix: str = PREFIX) -> str:
+        link = self.link
+        metrics = [
+            ("counter", "serial_bytes_in_total", "Bytes read from the serial port.", link.bytes_in),
+            ("counter", "serial_bytes_out_total", "Bytes written to the serial port.", link.bytes_out),
+            ("counter", "serial_bytes_discarded_total", "Received bytes outside of sensor frames.",
+             link.assembler.discarded),
+            ("counter", "serial_frames_received_total", "Complete 30-byte sensor frames received.",
+             link.frames_parsed + link.frames_failed),
+            ("counter", "serial_frames_parsed_total", "Frames parsed into a sensor reading.", link.frames_parsed),
+            ("counter", "serial_frames_failed_total", "Complete frames that failed to parse.", link.frames_failed),
+            ("counter", "serial_read_errors_total", "Serial read errors.", self.read_errors),
+            ("counter", "serial_write_errors_total", "Serial write errors.", link.write_errors),
+            ("gauge", "uptime_seconds", "Seconds since the server started.", self.uptime()),
+            ("gauge", "last_reading_age_seconds", "Seconds since the last valid sensor reading.",
+             self.reading_age()),
+        ]
+        for kind, name, help_text, read in self._registered:
+            metrics.append((kind, name, help_text, read()))
+
+        lines = []
+        for kind, name, help_text, value in metrics:
+            if value is None:
+                continue
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            lines.append(f"{prefix}_{name} {round(value, 3) if isinstance(value, float) else value}")
+
+        for name, help_text, histogram in (
+            ("sensor_response_ms", "Sensor request to complete response frame.", link.response_ms),
+            ("command_wait_ms", "Command queued to written to the serial port.", link.command_wait_ms),
+            ("event_loop_lag_ms", "Sensor poll loop wake-up lateness.", link.loop_lag_ms),
+        ):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} histogram")
+            lines += histogram_lines(f"{prefix}_{name}", histogram.snapshot())
+        return "\n".join(lines) + "\n"
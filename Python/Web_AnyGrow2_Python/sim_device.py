@@ -0,0 +1,140 @@
+# sim_device.py
+# 가상 AnyGrow2 장치 (POSIX 의사 터미널)
+# 실제 장치 없이 웹 서버를 시험할 때 사용합니다.
+#
+#   python sim_device.py            → 연결할 포트 경로(/dev/pts/N)를 출력
+#   ANYGROW_SERIAL_PORT=/dev/pts/N python async_app.py
+#
+# 센서 요청 패킷(0202FF53...)을 받으면 조금씩 변하는 센서값 프레임으로 응답합니다.
+# 그 외 명령(LED 등)은 기록만 하고 응답하지 않습니다.
+
+import argparse
+import os
+import random
+import select
+import threading
+import time
+import tty
+
+FRAME_LEN = 30
+FRAME_TRAILER = b"\xff\xff"   # 실제 장치의 센서 응답 끝 표시 (명령 패킷의 ETX 0x03 과 다름)
+MIN_REQUEST_LEN = 26    # PacketBuilder 명령 길이는 26~32바이트로 제각각이라 STX~ETX 로 구분합니다
+STX = 0x02
+ETX = 0x03
+CMD_SENSOR = 0x53   # 'S'
+
+
+def _digits(value, width):
+    """센서값을 ASCII 숫자 바이트(0x30~0x39)로 변환합니다."""
+    return bytes(0x30 + int(c) for c in f"{int(value):0{width}d}"[-width:])
+
+
+def build_sensor_frame(temp, hum, co2, illum):
+    """PacketParser.parse_sensor_packet 이 해석하는 형식의 30바이트 센서 프레임을 만듭니다."""
+    frame = bytearray(b"\xff" * FRAME_LEN)
+    frame[0], frame[1], frame[3] = STX, 0x02, CMD_SENSOR
+    frame[10:13] = _digits(round(temp * 10), 3)
+    frame[14:17] = _digits(round(hum * 10), 3)
+    frame[18:22] = _digits(co2, 4)
+    frame[23:27] = _digits(illum, 4)
+    frame[-len(FRAME_TRAILER):] = FRAME_TRAILER
+    return bytes(frame)
+
+
+def reading_key(values):
+    """프레임에 실리는 정밀도(온도/습도 0.1, CO2/조도 1)로 센서값을 식별하는 키. 서버가 보낸 값과 맞춰볼 때 사용합니다."""
+    return (round(values["temp"] * 10), round(values["hum"] * 10), int(values["co2"]), int(values["illum"]))
+
+
+class SimulatedDevice:
+    """
+    의사 터미널 한쪽을 장치로 동작시키는 스레드.
+    port 를 pyserial 로 열면 실제 장치처럼 요청/응답을 주고받을 수 있습니다.
+    """
+    def __init__(self, chunk_size=0, seed=None, record=False):
+        self.chunk_size = chunk_size    # 0보다 크면 응답을 이 크기로 나눠 보냄 (분할 수신 재현)
+        self.record = record            # True 면 보낸 센서값별 전송 완료 시각을 sent_at 에 기록 (부하 시험용)
+        self.sent_at = {}               # reading_key(값) -> time.time()
+        self.random = random.Random(seed)
+        self.values = {"temp": 24.0, "hum": 55.0, "co2": 450, "illum": 1200}
+        self.requests = 0
+        self.commands = 0
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._slave)
+        self.port = os.ttyname(self._slave)
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self.port
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        os.close(self._master)
+        os.close(self._slave)
+
+    def _next_reading(self):
+        v, r = self.values, self.random
+        v["temp"] = min(34.9, max(15.0, v["temp"] + r.uniform(-0.3, 0.3)))
+        v["hum"] = min(89.9, max(30.0, v["hum"] + r.uniform(-0.5, 0.5)))
+        v["co2"] = min(4999, max(350, v["co2"] + r.randint(-10, 10)))
+        v["illum"] = min(7999, max(0, v["illum"] + r.randint(-20, 20)))
+        frame = build_sensor_frame(v["temp"], v["hum"], v["co2"], v["illum"])
+        return frame, reading_key(v)
+
+    def _reply(self, frame):
+        step = self.chunk_size or len(frame)
+        for i in range(0, len(frame), step):
+            os.write(self._master, frame[i:i + step])
+
+    def _run(self):
+        buffer = bytearray()
+        while self._running:
+            ready, _, _ = select.select([self._master], [], [], 0.1)
+            if not ready:
+                continue
+            try:
+                buffer += os.read(self._master, 1024)
+            except OSError:
+                break
+            # STX 로 시작하고 ETX 로 끝나는 요청 프레임 단위로 처리
+            # (시간 동기화의 BCD 값에 0x03 이 있을 수 있어 최소 길이 이후의 ETX 만 인정)
+            while True:
+                start = buffer.find(bytes([STX]))
+                if start < 0:
+                    buffer.clear()
+                    break
+                del buffer[:start]
+                end = buffer.find(bytes([ETX]), MIN_REQUEST_LEN - 1)
+                if end < 0:
+                    break
+                frame = bytes(buffer[:end + 1])
+                del buffer[:end + 1]
+                if frame[3] == CMD_SENSOR:
+                    self.requests += 1
+                    frame, key = self._next_reading()
+                    self._reply(frame)
+                    if self.record:
+                        self.sent_at[key] = time.time()
+                else:
+                    self.commands += 1
+                    print(f"[SIM] command {frame.hex()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="가상 AnyGrow2 장치")
+    parser.add_argument("--chunk", type=int, default=0, help="응답을 이 바이트 수로 나눠 보냄")
+    args = parser.parse_args()
+
+    device = SimulatedDevice(chunk_size=args.chunk)
+    print(device.start(), flush=True)
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        device.stop()